@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""Compare the native DAG extraction of the tracker with the former jq one.
+
+Usage, with the package installed:
+``python benchmarks/benchmark_dag_extraction.py [NODES ...]``
+"""
+
+import json
+import sys
+import time
+
+import jq
+from adage.graph import AdageDAG
+from adage.node import Node
+from adage.serialize import node_to_json, obj_to_json
+from packtivity.asyncbackends import ExternalAsyncProxy
+from yadage.utils import WithJsonRefEncoder
+
+from reana_workflow_engine_yadage.tracker import REANATracker
+
+JQ_PROGRAM = (
+    "{dag: {edges: .dag.edges, nodes: [.dag.nodes[]|"
+    "{metadata: {name: .task.metadata.name}, id: .id, "
+    "jobid: .proxy.proxydetails.jobproxy}]}}"
+)
+
+
+class Task:
+    """Task with a yadage-like metadata and parameters payload."""
+
+    def __init__(self, name):
+        self.metadata = {"name": name, "wflow_hints": {"is_purepub": False}}
+        self.parameters = {f"parameter_{i}": f"value_{i}" * 10 for i in range(20)}
+
+    def json(self):
+        return {"metadata": self.metadata, "parameters": self.parameters}
+
+
+class Workflow:
+    """Scatter workflow with ``size`` submitted nodes below a single root."""
+
+    def __init__(self, size):
+        self.dag = AdageDAG()
+        self.rules = []
+        self.applied_rules = []
+        root = Node("root", Task("root"))
+        self.dag.addNode(root)
+        for i in range(size - 1):
+            node = Node(f"scatter_{i}", Task(f"scatter_{i}"))
+            node.resultproxy = ExternalAsyncProxy(
+                jobproxy={"job_id": f"job-{i}"}, spec={}, statedata={}, pardata={}
+            )
+            self.dag.addNode(node, depends_on=[root])
+
+    def json(self):
+        def json_or_nil(obj):
+            return None if obj is None else obj.json()
+
+        return obj_to_json(
+            self, json_or_nil, lambda n: node_to_json(n, json_or_nil, json_or_nil)
+        )
+
+
+def dump_with_jq(adageobj):
+    serialized = json.dumps(adageobj.json(), cls=WithJsonRefEncoder, sort_keys=True)
+    return jq.jq(JQ_PROGRAM).transform(json.loads(serialized))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'nodes':>8} {'jq (s)':>10} {'native (s)':>11} {'speedup':>8}")
+    for size in sizes:
+        workflow = Workflow(size)
+        expected, jq_time = timed(dump_with_jq, workflow)
+        actual, native_time = timed(REANATracker._dump_workflow_dag, workflow)
+        assert actual == expected
+        print(
+            f"{size:>8} {jq_time:>10.4f} {native_time:>11.4f} "
+            f"{jq_time / native_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [100, 1000, 10000, 20000])
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""Measure the overhead of the engine on synthetic workflows.
+
+Each case runs a synthetic adage DAG of the given shape and size through the
+yadage packtivity backend, ``ExternalBackend`` and ``REANATracker``. It runs
+against an in-process fake job controller, whose jobs finish after one tick,
+and a fake status publisher. The packtivity job building and publishing are
+faked too, so that only the engine overhead is measured. Shapes are:
+
+- ``scatter``: one root node followed by all the others,
+- ``chain``: each node depends on the previous one,
+- ``grid``: as many chains as nodes per chain, fanning out of one root.
+
+Each case runs in its own process, so that its peak RSS can be measured.
+Results are stored as JSON. When they are compared with earlier results,
+the metrics which got worse by more than the tolerance are reported, and the
+exit code is non-zero.
+
+Usage, with the package installed:
+``python benchmarks/benchmark_engine.py [--output FILE] [--compare FILE]
+[SHAPE:NODES ...]``
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+import adage.controllerutils as ctrlutils
+from adage.graph import AdageDAG
+from adage.node import Node
+from packtivity.statecontexts.posixfs_context import LocalFSState
+from packtivity.typedleafs import TypedLeafs
+from yadage.backends.packtivitybackend import PacktivityBackend
+
+from fakes import (
+    SPEC,
+    FakeJobController,
+    FakeWorkflowStatusPublisher,
+    fake_prepare_job,
+    fake_publish,
+)
+from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+from reana_workflow_engine_yadage.tracker import REANATracker
+from reana_workflow_engine_yadage.version import __version__
+
+DEFAULT_CASES = [
+    "scatter:100",
+    "scatter:1000",
+    "scatter:10000",
+    "grid:100",
+    "grid:1000",
+    "grid:10000",
+    "chain:100",
+    "chain:1000",
+]
+
+METRICS = {
+    "submit_jobs_per_second": "higher",
+    "sync_seconds_per_tick": "lower",
+    "track_seconds_per_tick": "lower",
+    "track_seconds_max": "lower",
+    "mean_message_bytes": "lower",
+    "max_message_bytes": "lower",
+    "peak_rss_mib": "lower",
+}
+"""Metrics compared between runs, and whether higher or lower is better."""
+
+
+class Task:
+    """Yadage-like task of a benchmark workflow node."""
+
+    def __init__(self, name):
+        self.spec = SPEC
+        self.parameters = TypedLeafs(
+            {
+                "input": f"/workspace/{name}/input.root",
+                "output": f"/workspace/{name}/output.root",
+                "options": {f"option_{i}": f"value_{i}" for i in range(10)},
+            }
+        )
+        self.state = LocalFSState(
+            readwrite=[f"/workspace/{name}"], readonly=["/workspace"]
+        )
+        self.metadata = {"name": name, "wflow_hints": {"is_purepub": False}}
+
+
+class Workflow:
+    """Adage workflow with a fixed DAG."""
+
+    def __init__(self):
+        self.dag = AdageDAG()
+        self.rules = []
+        self.applied_rules = []
+
+    def add_node(self, name, depends_on=()):
+        node = Node(name, Task(name))
+        self.dag.addNode(node, depends_on=list(depends_on))
+        return node
+
+
+def build_workflow(shape, size):
+    """Build a workflow of ``size`` nodes with the given shape."""
+    workflow = Workflow()
+    root = workflow.add_node("root")
+    if shape == "scatter":
+        for i in range(size - 1):
+            workflow.add_node(f"scatter_{i}", [root])
+    elif shape == "chain":
+        previous = root
+        for i in range(size - 1):
+            previous = workflow.add_node(f"step_{i}", [previous])
+    elif shape == "grid":
+        width = max(1, int(math.sqrt(size - 1)))
+        nodes = []
+        for i in range(size - 1):
+            depends_on = [root] if i < width else [nodes[i - width]]
+            nodes.append(
+                workflow.add_node(f"step_{i % width}_{i // width}", depends_on)
+            )
+    else:
+        raise ValueError(f"Unknown workflow shape {shape}.")
+    return workflow
+
+
+def run_case(shape, size):
+    """Run a workflow to completion and measure the engine overhead."""
+    controller = FakeJobController()
+    with patch("reana_workflow_engine_yadage.externalbackend.RJC_API_Client"):
+        external_backend = ExternalBackend()
+    external_backend.rjc_api_client = controller
+    external_backend._jobs_statuses_refresh_interval = 0
+    backend = PacktivityBackend(packtivity_backend=external_backend, backendopts={})
+    publisher = FakeWorkflowStatusPublisher()
+    tracker = REANATracker("benchmark", publisher, background_publishing=False)
+    workflow = build_workflow(shape, size)
+
+    submit_seconds, sync_seconds, track_seconds = 0.0, [], []
+    with patch.object(
+        external_backend, "_prepare_job", side_effect=fake_prepare_job
+    ), patch(
+        "reana_workflow_engine_yadage.externalbackend.finalize_inputs",
+        side_effect=lambda parameters, state: (parameters, state),
+    ), patch(
+        "reana_workflow_engine_yadage.externalbackend.publish",
+        side_effect=fake_publish,
+    ):
+        tracker.initialize(workflow)
+        while tracker.progress_state["finished"]["total"] < size:
+            start = time.perf_counter()
+            ctrlutils.submit_nodes(ctrlutils.submittable_nodes(workflow), backend)
+            submit_seconds += time.perf_counter() - start
+
+            controller.tick()
+            start = time.perf_counter()
+            ctrlutils.sync_state(workflow, backend)
+            sync_seconds.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            tracker.track(workflow)
+            track_seconds.append(time.perf_counter() - start)
+
+    return {
+        "shape": shape,
+        "nodes": size,
+        "ticks": len(track_seconds),
+        "controller_requests": controller.requests,
+        "submit_jobs_per_second": size / submit_seconds,
+        "sync_seconds_per_tick": statistics.mean(sync_seconds),
+        "track_seconds_per_tick": statistics.mean(track_seconds),
+        "track_seconds_max": max(track_seconds),
+        "messages": publisher.messages,
+        "mean_message_bytes": statistics.mean(publisher.message_bytes),
+        "max_message_bytes": max(publisher.message_bytes),
+        # kibibytes on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_isolated_case(case):
+    """Run a case in a new process."""
+    shape, size = case.split(":")
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_case, (shape, int(size)))
+
+
+def compare(results, baseline, tolerance):
+    """Report the metrics which got worse than in the baseline results.
+
+    :return: The number of regressions.
+    """
+    baseline_cases = {
+        (case["shape"], case["nodes"]): case for case in baseline["cases"]
+    }
+    regressions = 0
+    for case in results["cases"]:
+        baseline_case = baseline_cases.get((case["shape"], case["nodes"]))
+        if baseline_case is None:
+            continue
+        for metric, better in METRICS.items():
+            ratio = case[metric] / baseline_case[metric]
+            if (better == "lower" and ratio > 1 + tolerance) or (
+                better == "higher" and ratio < 1 - tolerance
+            ):
+                regressions += 1
+                print(
+                    f"REGRESSION {case['shape']}:{case['nodes']} {metric}: "
+                    f"{baseline_case[metric]:.6g} -> {case[metric]:.6g} "
+                    f"(version {baseline['version']})"
+                )
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", default=DEFAULT_CASES)
+    parser.add_argument("--output", default=f"benchmark-engine-{__version__}.json")
+    parser.add_argument("--compare", help="Results to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'case':>14} {'ticks':>6} {'submit/s':>9} {'sync (ms)':>10} "
+        f"{'track (ms)':>11} {'max msg (kB)':>13} {'RSS (MiB)':>10}"
+    )
+    cases = []
+    for case in args.cases:
+        result = run_isolated_case(case)
+        cases.append(result)
+        print(
+            f"{case:>14} {result['ticks']:>6} "
+            f"{result['submit_jobs_per_second']:>9.0f} "
+            f"{result['sync_seconds_per_tick'] * 1000:>10.2f} "
+            f"{result['track_seconds_per_tick'] * 1000:>11.2f} "
+            f"{result['max_message_bytes'] / 1000:>13.1f} "
+            f"{result['peak_rss_mib']:>10.1f}"
+        )
+
+    results = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": cases,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results stored in {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""Measure the memory of the job bookkeeping of the backend.
+
+A scattered step of ``NODES`` jobs is submitted to a fake job controller and
+run to completion. The memory held by the proxies, the job status table and
+the results is compared with the former representation, which kept the whole
+submission response, one spec per node and the statuses of all the jobs.
+
+Usage, with the package installed:
+``python benchmarks/benchmark_memory.py [NODES ...]``
+"""
+
+import copy
+import gc
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+from packtivity.asyncbackends import ExternalAsyncProxy
+
+from fakes import SPEC, FakeJobController, fake_prepare_job, fake_publish
+from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+
+
+def run_baseline(nodes):
+    """Keep the bookkeeping of the jobs the former way."""
+    controller = FakeJobController()
+    proxies, responses = [], []
+    for i in range(nodes):
+        response = controller.submit(job_name=f"scatter_{i}")
+        responses.append(response)
+        proxies.append(
+            ExternalAsyncProxy(
+                jobproxy=response,
+                spec=copy.deepcopy(SPEC),
+                pardata=None,
+                statedata=None,
+            )
+        )
+    controller.tick()
+    statuses = {
+        response["job_id"]: controller.check_status(response["job_id"])["status"]
+        for response in responses
+    }
+    # adage nodes keep the results
+    results = [fake_publish(SPEC["publisher"], None, None, None) for _ in proxies]
+    return proxies, statuses, results
+
+
+def run_backend(nodes):
+    """Submit and run the jobs with the backend."""
+    with patch("reana_workflow_engine_yadage.externalbackend.RJC_API_Client"):
+        backend = ExternalBackend()
+    backend.rjc_api_client = FakeJobController()
+    backend._bulk_status_supported = False
+    backend._jobs_statuses_refresh_interval = 0
+
+    proxies = []
+    with patch.object(backend, "_prepare_job", side_effect=fake_prepare_job), patch(
+        "reana_workflow_engine_yadage.externalbackend.finalize_inputs",
+        side_effect=lambda pars, state: (pars, state),
+    ), patch(
+        "reana_workflow_engine_yadage.externalbackend.publish",
+        side_effect=fake_publish,
+    ):
+        for i in range(nodes):
+            proxy = backend.submit(
+                copy.deepcopy(SPEC), None, None, {"name": f"scatter_{i}"}
+            )
+            proxies.append(proxy)
+        backend.rjc_api_client.tick()
+        for proxy in proxies:
+            if backend.ready(proxy) and backend.successful(proxy):
+                backend.result(proxy)
+    return proxies, backend.jobs_statuses, backend._specs
+
+
+def measure(function, nodes):
+    """Measure the memory still allocated by the result of ``function``."""
+    gc.collect()
+    tracemalloc.start()
+    result = function(nodes)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main(sizes):
+    print(f"{'nodes':>8} {'former (MiB)':>13} {'backend (MiB)':>14} {'ratio':>6}")
+    for size in sizes:
+        baseline = measure(run_baseline, size) / 2**20
+        compact = measure(run_backend, size) / 2**20
+        print(
+            f"{size:>8} {baseline:>13.2f} {compact:>14.2f} {baseline / compact:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
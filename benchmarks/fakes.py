@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""In-process fakes of the services the engine talks to, for the benchmarks."""
+
+import json
+from types import SimpleNamespace
+
+SPEC = {
+    "process": {
+        "process_type": "string-interpolated-cmd",
+        "cmd": "python analysis.py --input {input} --output {output}",
+    },
+    "environment": {
+        "environment_type": "docker-encapsulated",
+        "image": "docker.io/reanahub/reana-env-root6",
+        "imagetag": "6.18.04",
+        "resources": [{"compute_backend": "kubernetes"}],
+    },
+    "publisher": {
+        "publisher_type": "interpolated-pub",
+        "publish": {"output": "{output}"},
+    },
+}
+"""Spec of the steps of the benchmark workflows."""
+
+
+def from_json(data):
+    """Copy data through JSON, like responses decoded from the network."""
+    return json.loads(json.dumps(data))
+
+
+class FakeJobController:
+    """In-process ``JobControllerAPIClient`` whose jobs finish after some ticks.
+
+    Responses are decoded from JSON, so that they are made of new objects like
+    the responses of the real job controller.
+    """
+
+    def __init__(self, job_ticks=1):
+        """Initialize the controller, whose jobs run for ``job_ticks`` ticks."""
+        self.job_ticks = job_ticks
+        self.ticks = 0
+        self.jobs = {}
+        self.requests = 0
+        self._client = SimpleNamespace(jobs=SimpleNamespace(get_jobs=self._get_jobs))
+
+    def tick(self):
+        """Move time forward, finishing the jobs which ran long enough."""
+        self.ticks += 1
+        for job in self.jobs.values():
+            if job["status"] != "finished" and job["finish_tick"] <= self.ticks:
+                job["status"] = "finished"
+
+    def submit(self, **job_request_body):
+        self.requests += 1
+        job_id = f"{len(self.jobs):08d}-1f2e-4c5d-9a8b-7c6d5e4f3a2b"
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "status": "running",
+            "finish_tick": self.ticks + self.job_ticks,
+        }
+        return from_json(
+            {
+                "job_id": job_id,
+                "message": "Job submitted.",
+                "job_name": job_request_body["job_name"],
+            }
+        )
+
+    def check_status(self, job_id):
+        self.requests += 1
+        return from_json({"status": self.jobs[job_id]["status"]})
+
+    def _get_jobs(self):
+        self.requests += 1
+        jobs = from_json(
+            [
+                {"job_id": job["job_id"], "status": job["status"]}
+                for job in self.jobs.values()
+            ]
+        )
+        return SimpleNamespace(result=lambda: (jobs, None))
+
+
+class FakeWorkflowStatusPublisher:
+    """``WorkflowStatusPublisher`` recording the size of the published messages."""
+
+    def __init__(self):
+        """Initialize the publisher."""
+        self.messages = 0
+        self.message_bytes = []
+
+    def publish_workflow_status(self, workflow_id, status, logs="", message=None):
+        self.messages += 1
+        self.message_bytes.append(len(json.dumps(message)))
+
+
+def fake_publish(publisher, parameters, state, config):
+    """Packtivity ``publish`` returning the same result for every job."""
+    return {"output": "/workspace/output.root"}
+
+
+def fake_prepare_job(spec, parameters, state, metadata):
+    """``ExternalBackend._prepare_job`` skipping the packtivity job building."""
+    job_request_body = {
+        "workflow_uuid": "benchmark",
+        "image": f"{spec['environment']['image']}:{spec['environment']['imagetag']}",
+        "cmd": spec["process"]["cmd"],
+        "prettified_cmd": spec["process"]["cmd"],
+        "workflow_workspace": "/workspace",
+        "job_name": metadata["name"],
+        "cvmfs_mounts": "false",
+    }
+    return job_request_body, parameters, state
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage job admission control."""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of an operation, allowing short bursts."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket.
+
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens in the bucket.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._refilled_at = clock()
+
+    def try_acquire(self) -> bool:
+        """Take a token from the bucket, if there is one."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class AdmissionController:
+    """Queue of job submissions admitted within an in-flight limit and a rate.
+
+    Items are admitted by decreasing priority, then in order, as long as fewer
+    than ``max_in_flight`` items were admitted and not released yet, and the
+    token bucket allows it.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 0,
+        rate: float = 0,
+        burst: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the admission controller.
+
+        :param max_in_flight: Maximum number of admitted items, ``0`` means no limit.
+        :param rate: Maximum number of items admitted per second, ``0`` means
+            no limit.
+        :param burst: Number of items which can be admitted at once within the rate.
+        """
+        self.max_in_flight = max_in_flight
+        self._token_bucket = TokenBucket(rate, max(1, burst), clock) if rate else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, Any, float]] = []
+        self._sequence = itertools.count()
+        self.in_flight = 0
+        self.admitted = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def enqueue(self, item: Any, priority: float = 0.0) -> None:
+        """Add an item to the queue of items waiting for admission.
+
+        :param priority: Priority of the item, higher ones are admitted first.
+        """
+        with self._lock:
+            heapq.heappush(
+                self._queue, (-priority, next(self._sequence), item, self._clock())
+            )
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+
+    def release(self) -> None:
+        """Release the slot of an admitted item which is done."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def _can_admit(self) -> bool:
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return False
+        return self._token_bucket is None or self._token_bucket.try_acquire()
+
+    def admit(self) -> List[Any]:
+        """Take the items which can be admitted now out of the queue."""
+        admitted = []
+        with self._lock:
+            while self._queue and self._can_admit():
+                _, _, item, enqueued_at = heapq.heappop(self._queue)
+                wait_seconds = self._clock() - enqueued_at
+                self.total_wait_seconds += wait_seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+                self.in_flight += 1
+                self.admitted += 1
+                admitted.append(item)
+        return admitted
+
+    def stats(self) -> Dict[str, float]:
+        """Return the queue depth and wait time statistics."""
+        with self._lock:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "mean_wait_seconds": (
+                    self.total_wait_seconds / self.admitted if self.admitted else 0.0
+                ),
+                "max_wait_seconds": self.max_wait_seconds,
+            }
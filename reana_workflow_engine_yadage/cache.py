@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage content-addressed job result cache."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+JOB_REQUEST_VOLATILE_KEYS = ("workflow_uuid",)
+"""Job request fields that change between runs without changing the job."""
+
+
+class ResultCache:
+    """Index of the successful jobs of a workspace, keyed on their content.
+
+    The index is a JSON file mapping cache keys to the job which produced the
+    result, evicting the least recently used entries past ``max_entries``.
+    A work directory holds the results of a single entry: entries are dropped
+    when another job writes to their work directories, or when the files in
+    them changed since the job succeeded.
+    """
+
+    def __init__(
+        self, index_path: str, max_entries: int, workspace: Optional[str] = None
+    ):
+        """Initialize the cache, loading its index if it exists.
+
+        :param workspace: Workspace of the jobs, by default the directory of
+            the index. Only the inputs inside it are part of the cache keys.
+        """
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self.workspace = os.path.realpath(
+            workspace or os.path.dirname(os.path.abspath(index_path))
+        )
+        self._lock = threading.Lock()
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
+        self._entries: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable result cache {self.index_path}: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        """Atomically write the index to disk."""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as index_file:
+            json.dump(self._entries, index_file)
+        os.replace(tmp_path, self.index_path)
+
+    def _get_file_digest(self, path: str) -> str:
+        stat = os.stat(path)
+        file_id = (path, stat.st_size, stat.st_mtime_ns)
+        if file_id not in self._file_digests:
+            digest = hashlib.sha256()
+            with open(path, "rb") as input_file:
+                for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._file_digests[file_id] = digest.hexdigest()
+        return self._file_digests[file_id]
+
+    @staticmethod
+    def _get_tree_fingerprint(paths: Iterable[str]) -> str:
+        """Get a fingerprint of the files in directories, from their metadata only."""
+        fingerprint = hashlib.sha256()
+        for path in sorted(paths):
+            fingerprint.update(path.encode())
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(file_path)
+                    except OSError:
+                        continue
+                    fingerprint.update(
+                        f"{os.path.relpath(file_path, path)}:{stat.st_size}:"
+                        f"{stat.st_mtime_ns}".encode()
+                    )
+        return fingerprint.hexdigest()
+
+    def _is_in_workspace(self, path: str) -> bool:
+        path = os.path.realpath(path)
+        return path.startswith(self.workspace + os.sep)
+
+    def _get_input_digests(self, parameters: Any) -> Dict[str, str]:
+        """Get the digests of the workspace files and directories in parameters.
+
+        Files are hashed, directories are only fingerprinted from the metadata
+        of their files. Paths outside of the workspace, e.g. on shared file
+        systems, are left out.
+        """
+        digests = {}
+        leaves = [parameters]
+        while leaves:
+            leaf = leaves.pop()
+            if isinstance(leaf, dict):
+                leaves.extend(leaf.values())
+            elif isinstance(leaf, list):
+                leaves.extend(leaf)
+            elif (
+                isinstance(leaf, str)
+                and os.path.isabs(leaf)
+                and self._is_in_workspace(leaf)
+            ):
+                if os.path.isfile(leaf):
+                    digests[leaf] = self._get_file_digest(leaf)
+                elif os.path.isdir(leaf):
+                    digests[leaf] = self._get_tree_fingerprint([leaf])
+        return digests
+
+    def get_key(
+        self, job_request_body: Dict, parameters: Any, workdirs: Iterable[str]
+    ) -> str:
+        """Compute the cache key of a job from its request and its inputs.
+
+        :param job_request_body: Job request sent to the job controller,
+            including the image and the command.
+        :param parameters: JSON parameters of the packtivity.
+        :param workdirs: Directories the job writes its results to.
+        """
+        job = {
+            key: value
+            for key, value in job_request_body.items()
+            if key not in JOB_REQUEST_VOLATILE_KEYS
+        }
+        content = {
+            "job": job,
+            "inputs": self._get_input_digests(parameters),
+            "workdirs": sorted(workdirs),
+        }
+        serialized = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def _has_results(self, entry: Dict[str, Any]) -> bool:
+        """Check whether the results of an entry are still in its work directories."""
+        workdirs = entry["workdirs"]
+        return all(os.path.isdir(workdir) for workdir in workdirs) and entry.get(
+            "outputs"
+        ) == self._get_tree_fingerprint(workdirs)
+
+    def _drop_entries_of(self, workdirs: Iterable[str]) -> bool:
+        """Drop the entries whose results are in any of the given work directories."""
+        workdirs = set(workdirs)
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if workdirs.intersection(entry["workdirs"])
+        ]
+        for key in keys:
+            del self._entries[key]
+        return bool(keys)
+
+    def invalidate(self, workdirs: Iterable[str]) -> None:
+        """Drop the entries of the work directories a job is about to write to."""
+        with self._lock:
+            if self._drop_entries_of(workdirs):
+                self._save_index()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the cached job with the given key, if its results are still there."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._has_results(entry):
+                del self._entries[key]
+                self._save_index()
+                return None
+            # entries are kept from the least to the most recently used
+            self._entries[key] = self._entries.pop(key)
+            entry["last_used_at"] = time.time()
+            self._save_index()
+            return entry
+
+    def put(self, key: str, job_id: str, workdirs: Iterable[str]) -> None:
+        """Record the successful job with the given key."""
+        with self._lock:
+            now = time.time()
+            workdirs = list(workdirs)
+            self._drop_entries_of(workdirs)
+            self._entries.pop(key, None)
+            self._entries[key] = {
+                "job_id": job_id,
+                "workdirs": workdirs,
+                "outputs": self._get_tree_fingerprint(workdirs),
+                "created_at": now,
+                "last_used_at": now,
+            }
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._save_index()
@@ -13,6 +13,7 @@ import logging
 import os
 import yaml
 
+from adage.trackers import SimpleReportTracker, TextSnapShotTracker
 from reana_commons.config import (
     REANA_LOG_FORMAT,
     REANA_LOG_LEVEL,
@@ -23,11 +24,19 @@ from yadage.steering_api import steering_ctx
 from yadage.utils import setupbackend_fromstring
 
 from .config import (
+    JOB_SUBMISSION_PRIORITY,
     LOGGING_MODULE,
     WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS,
     LOG_INTERVAL_SECONDS,
+    WORKFLOW_TIMELINE,
+    WORKFLOW_TIMELINE_FILENAME,
+    WORKFLOW_VISUALIZATION,
 )
-from .tracker import REANATracker
+from .metrics import MetricsExporter
+from .profiling import ProfiledBackend, ProfiledTracker, get_workflow_profiler
+from .recording import get_workflow_recorder
+from .tracker import AdaptiveIntervalTracker, REANATracker
+from .visualization import visualize_workflow
 
 logging.basicConfig(level=REANA_LOG_LEVEL, format=REANA_LOG_FORMAT)
 log = logging.getLogger(LOGGING_MODULE)
@@ -48,36 +57,90 @@ def run_yadage_workflow_engine_adapter(
     os.environ["workflow_workspace"] = workflow_workspace
     os.umask(REANA_WORKFLOW_UMASK)
 
-    tracker = REANATracker(identifier=workflow_uuid, publisher=publisher)
-    tracker.publish_workflow_running_status()
-
-    cap_backend = setupbackend_fromstring("fromenv")
-    workflow_kwargs = dict(workflow_json=workflow_json)
-    dataopts = {"initdir": operational_options["initdir"]}
-
-    initdata = {}
-    for initfile in operational_options["initfiles"]:
-        with open(initfile) as stream:
-            initdata.update(**yaml.safe_load(stream))
-    initdata.update(workflow_parameters)
-
-    with steering_ctx(
-        dataarg=workflow_workspace,
-        dataopts=dataopts,
-        initdata=initdata,
-        visualize=True,
-        updateinterval=WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS,
-        loginterval=LOG_INTERVAL_SECONDS,
-        backend=cap_backend,
-        accept_metadir="accept_metadir" in operational_options,
-        **workflow_kwargs,
-    ) as ys:
-        log.debug(f"running workflow on context: {locals()}")
-
-        ys.adage_argument(additional_trackers=[tracker])
-
-    # hack to publish finished workflow status AFTER Yadage visualization is done.
-    tracker.publish_workflow_final_status()
+    metrics_exporter = MetricsExporter()
+    profiler = get_workflow_profiler()
+    try:
+        recorder = get_workflow_recorder()
+        timeline_path = None
+        if WORKFLOW_TIMELINE:
+            timeline_path = os.path.join(workflow_workspace, WORKFLOW_TIMELINE_FILENAME)
+        tracker = REANATracker(
+            identifier=workflow_uuid,
+            publisher=publisher,
+            recorder=recorder,
+            timeline_path=timeline_path,
+        )
+        tracker.publish_workflow_running_status()
+
+        cap_backend = setupbackend_fromstring("fromenv")
+        job_backend = cap_backend.backends["packtivity"]
+        job_backend.export_metrics()
+        if profiler is not None:
+            profiler.start("setup")
+            cap_backend = ProfiledBackend(cap_backend, profiler)
+        workflow_kwargs = dict(workflow_json=workflow_json)
+        dataopts = {"initdir": operational_options["initdir"]}
+
+        initdata = {}
+        for initfile in operational_options["initfiles"]:
+            with open(initfile) as stream:
+                initdata.update(**yaml.safe_load(stream))
+        initdata.update(workflow_parameters)
+
+        controller_kwargs = {}
+        if JOB_SUBMISSION_PRIORITY:
+            controller_kwargs = dict(
+                controller="py:reana_workflow_engine_yadage.scheduling:"
+                "PrioritizingController",
+                ctrlopts={"pass_model": True},
+            )
+
+        with steering_ctx(
+            dataarg=workflow_workspace,
+            dataopts=dataopts,
+            initdata=initdata,
+            visualize=False,
+            updateinterval=WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS,
+            loginterval=LOG_INTERVAL_SECONDS,
+            backend=cap_backend,
+            accept_metadir="accept_metadir" in operational_options,
+            **controller_kwargs,
+            **workflow_kwargs,
+        ) as ys:
+            log.debug(f"running workflow on context: {locals()}")
+
+            # adage's default trackers without the GIF one, which renders the
+            # whole DAG many times at the end of the workflow
+            adage_workdir = os.path.join(ys.metadir, "adage")
+            trackers = [
+                SimpleReportTracker("adage", LOG_INTERVAL_SECONDS),
+                TextSnapShotTracker(
+                    os.path.join(adage_workdir, "adagesnap.txt"),
+                    LOG_INTERVAL_SECONDS,
+                ),
+                tracker,
+                AdaptiveIntervalTracker(
+                    tracker, job_backend.set_jobs_statuses_refresh_interval
+                ),
+            ]
+            if profiler is not None:
+                trackers = [ProfiledTracker(t, profiler) for t in trackers]
+                # the adage loop runs when exiting the steering context
+                profiler.switch_phase("adage")
+            ys.adage_argument(additional_trackers=trackers)
+
+        tracker.publish_workflow_final_status()
+        if recorder is not None:
+            recorder.close()
+
+        if WORKFLOW_VISUALIZATION:
+            log.info("Visualizing workflow.")
+            visualize_workflow(ys.workflow, ys.metadir)
+
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        metrics_exporter.close()
 
 
 run_yadage_workflow = create_workflow_engine_command(
@@ -16,9 +16,219 @@ MOUNT_CVMFS = os.getenv("REANA_MOUNT_CVMFS", "false")
 
 LOGGING_MODULE = "reana-workflow-engine-yadage"
 
-WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS = 15
+WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS", "2")
+)
+"""Interval between two ticks of the adage loop.
 
-LOG_INTERVAL_SECONDS = 15
+Ticks are cheap, nodes read the job statuses last fetched from the job
+controller, which are only refreshed every job status refresh interval.
+"""
+
+LOG_INTERVAL_SECONDS = float(os.getenv("REANA_WORKFLOW_LOG_INTERVAL_SECONDS", "15"))
+
+JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS = max(
+    WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS,
+    float(os.getenv("REANA_JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS", "2")),
+)
+"""Shortest time during which job statuses fetched from the job controller are
+reused, while the workflow makes progress."""
+
+JOB_STATUS_REFRESH_MAX_INTERVAL_SECONDS = max(
+    JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS,
+    float(os.getenv("REANA_JOB_STATUS_REFRESH_MAX_INTERVAL_SECONDS", "30")),
+)
+"""Longest time during which job statuses fetched from the job controller are
+reused, reached when the workflow makes no progress."""
+
+JOB_STATUS_REFRESH_BACKOFF_FACTOR = 1.5
+"""Factor by which the refresh interval grows when the workflow made no progress."""
+
+JOB_STATUS_CONSUMER = os.getenv("REANA_JOB_STATUS_CONSUMER", "")
+"""Consumer of pushed job status events, as a ``module:Class`` string.
+
+The class must implement ``reana_workflow_engine_yadage.consumer.JobStatusConsumer``,
+no REANA component publishes job status events yet. When empty, job statuses are
+only polled from the job controller.
+"""
+
+JOB_STATUS_SAFETY_NET_REFRESH_INTERVAL_SECONDS = float(
+    os.getenv("REANA_JOB_STATUS_SAFETY_NET_REFRESH_INTERVAL_SECONDS", "120")
+)
+"""Job status polling interval used when job status events are consumed."""
+
+JOB_STATUS_EVENTS_MAX_PENDING = int(
+    os.getenv("REANA_JOB_STATUS_EVENTS_MAX_PENDING", "1000")
+)
+"""Maximum number of jobs whose pushed status is kept until they are registered,
+and of evicted jobs whose late pushed statuses are ignored."""
+
+JOB_SUBMISSION_THREADS = int(os.getenv("REANA_JOB_SUBMISSION_THREADS", "0"))
+"""Number of threads submitting jobs in the background, ``0`` submits inline."""
+
+JOB_CONTROLLER_RETRY_MAX_ATTEMPTS = int(
+    os.getenv("REANA_JOB_CONTROLLER_RETRY_MAX_ATTEMPTS", "5")
+)
+"""Maximum number of attempts of a job submission failing with transient errors."""
+
+JOB_CONTROLLER_RETRY_BASE_DELAY_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_RETRY_BASE_DELAY_SECONDS", "1")
+)
+"""Maximum delay before retrying a failed request the first time."""
+
+JOB_CONTROLLER_RETRY_MAX_DELAY_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_RETRY_MAX_DELAY_SECONDS", "30")
+)
+"""Maximum delay before retrying a failed request, the delay doubling each time."""
+
+JOB_CONTROLLER_CIRCUIT_FAILURE_THRESHOLD = int(
+    os.getenv("REANA_JOB_CONTROLLER_CIRCUIT_FAILURE_THRESHOLD", "5")
+)
+"""Number of consecutive failed requests after which requests are paused."""
+
+JOB_CONTROLLER_CIRCUIT_RESET_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_CIRCUIT_RESET_SECONDS", "30")
+)
+"""Time during which requests are paused before probing the job controller again."""
+
+JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS", "1800")
+)
+"""Time after which an unavailable job controller fails the workflow."""
+
+JOB_MAX_IN_FLIGHT = int(os.getenv("REANA_JOB_MAX_IN_FLIGHT", "0"))
+"""Maximum number of submitted and unfinished jobs, ``0`` means no limit."""
+
+JOB_SUBMISSION_RATE = float(os.getenv("REANA_JOB_SUBMISSION_RATE", "0"))
+"""Maximum number of jobs submitted per second, ``0`` means no limit."""
+
+JOB_SUBMISSION_BURST = int(os.getenv("REANA_JOB_SUBMISSION_BURST", "10"))
+"""Number of jobs which can be submitted at once within the submission rate."""
+
+JOB_SUBMISSION_PRIORITY = bool(
+    strtobool(os.getenv("REANA_JOB_SUBMISSION_PRIORITY", "false"))
+)
+"""Whether to submit the ready jobs on the critical path of the workflow first."""
+
+JOB_SCRIPT_SPILL_THRESHOLD_BYTES = int(
+    os.getenv("REANA_JOB_SCRIPT_SPILL_THRESHOLD_BYTES", "0")
+)
+"""Scripts bigger than this are run from a workspace file, ``0`` always inlines them."""
+
+JOB_SCRIPTS_DIRNAME = ".reana_job_scripts"
+"""Name of the workspace directory where big scripts are written."""
+
+JOB_RESULT_CACHE = bool(strtobool(os.getenv("REANA_JOB_RESULT_CACHE", "false")))
+"""Whether to reuse the results of identical jobs run earlier in the workspace."""
+
+JOB_RESULT_CACHE_MAX_ENTRIES = int(
+    os.getenv("REANA_JOB_RESULT_CACHE_MAX_ENTRIES", "1000")
+)
+"""Maximum number of jobs kept in the result cache index."""
+
+JOB_RESULT_CACHE_INDEX_FILENAME = ".reana_job_result_cache.json"
+"""Name of the result cache index, stored at the root of the workspace."""
+
+JOB_FAILURE_RECORDS_MAX_ENTRIES = int(
+    os.getenv("REANA_JOB_FAILURE_RECORDS_MAX_ENTRIES", "1000")
+)
+"""Maximum number of failed jobs whose failure is kept for reporting."""
+
+JOB_FAILURE_LOG_TAIL_LINES = int(os.getenv("REANA_JOB_FAILURE_LOG_TAIL_LINES", "20"))
+"""Number of log lines of a failed job included in its failure report."""
+
+JOB_CONTROLLER_POOL_SIZE = int(
+    os.getenv(
+        "REANA_JOB_CONTROLLER_POOL_SIZE", str(max(10, JOB_SUBMISSION_THREADS + 2))
+    )
+)
+"""Maximum number of connections kept open to the job controller."""
+
+JOB_CONTROLLER_KEEP_ALIVE = bool(
+    strtobool(os.getenv("REANA_JOB_CONTROLLER_KEEP_ALIVE", "true"))
+)
+"""Whether connections to the job controller are reused between requests."""
+
+JOB_CONTROLLER_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_CONNECT_TIMEOUT_SECONDS", "10")
+)
+"""Timeout for establishing a connection to the job controller."""
+
+JOB_CONTROLLER_TIMEOUT_SECONDS = float(
+    os.getenv("REANA_JOB_CONTROLLER_TIMEOUT_SECONDS", "60")
+)
+"""Timeout for receiving a response from the job controller."""
+
+PROGRESS_DELTA_MESSAGES = bool(
+    strtobool(os.getenv("REANA_WORKFLOW_PROGRESS_DELTA_MESSAGES", "false"))
+)
+"""Whether progress messages only carry the changes since the previous one."""
+
+PROGRESS_SNAPSHOT_INTERVAL_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_PROGRESS_SNAPSHOT_INTERVAL_SECONDS", "300")
+)
+"""Interval between full progress snapshots when publishing delta messages."""
+
+PROGRESS_BACKGROUND_PUBLISHING = bool(
+    strtobool(os.getenv("REANA_WORKFLOW_PROGRESS_BACKGROUND_PUBLISHING", "false"))
+)
+"""Whether progress messages are published from a background thread."""
+
+PROGRESS_MIN_PUBLISH_INTERVAL_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_PROGRESS_MIN_PUBLISH_INTERVAL_SECONDS", "5")
+)
+"""Minimum time between two progress messages published in the background."""
+
+WORKFLOW_VISUALIZATION = bool(
+    strtobool(os.getenv("REANA_WORKFLOW_VISUALIZATION", "true"))
+)
+"""Whether to render the workflow graph once the workflow is done."""
+
+WORKFLOW_VISUALIZATION_MAX_NODES = int(
+    os.getenv("REANA_WORKFLOW_VISUALIZATION_MAX_NODES", "1000")
+)
+"""Workflows with more nodes than this are not rendered, ``0`` means no limit."""
+
+WORKFLOW_VISUALIZATION_TIMEOUT_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_VISUALIZATION_TIMEOUT_SECONDS", "120")
+)
+"""Time budget for rendering the workflow graph."""
+
+WORKFLOW_RECORDING = bool(strtobool(os.getenv("REANA_WORKFLOW_RECORDING", "false")))
+"""Whether to record the job controller and publisher traffic of the workflow."""
+
+WORKFLOW_RECORDING_FILENAME = ".reana_workflow_recording.jsonl.gz"
+"""Name of the traffic recording, stored at the root of the workspace."""
+
+WORKFLOW_METRICS_PORT = int(os.getenv("REANA_WORKFLOW_METRICS_PORT", "0"))
+"""Port serving the engine metrics in the Prometheus text format, ``0`` to disable."""
+
+WORKFLOW_METRICS_FILE = os.getenv("REANA_WORKFLOW_METRICS_FILE", "")
+"""File the engine metrics are periodically written to, relative to the
+workspace, empty to disable."""
+
+WORKFLOW_METRICS_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_METRICS_FLUSH_INTERVAL_SECONDS", "30")
+)
+"""Interval between two writes of the metrics file."""
+
+WORKFLOW_PROFILING = os.getenv("REANA_WORKFLOW_PROFILING", "")
+"""Comma-separated profilers to run the workflow engine with, among ``cprofile``,
+``stacks`` and ``tracemalloc``, empty to disable profiling."""
+
+WORKFLOW_PROFILING_SAMPLE_INTERVAL_SECONDS = float(
+    os.getenv("REANA_WORKFLOW_PROFILING_SAMPLE_INTERVAL_SECONDS", "0.01")
+)
+"""Interval between two stack samples of the ``stacks`` profiler."""
+
+WORKFLOW_PROFILING_DIRNAME = ".reana_workflow_profiling"
+"""Name of the directory of the profiling artifacts, at the root of the workspace."""
+
+WORKFLOW_TIMELINE = bool(strtobool(os.getenv("REANA_WORKFLOW_TIMELINE", "false")))
+"""Whether to export the timeline of the workflow jobs at the end of the run."""
+
+WORKFLOW_TIMELINE_FILENAME = ".reana_workflow_timeline.csv"
+"""Name of the timeline of the workflow jobs, stored at the root of the workspace."""
 
 WORKFLOW_KERBEROS = bool(strtobool(os.getenv("REANA_WORKFLOW_KERBEROS", "false")))
 """Whether Kerberos is needed for the whole workflow."""
@@ -49,6 +259,11 @@ class JobStatus(str, Enum):
     # FIXME: this state is not defined in reana-db but returned by r-job-controller
     started = "started"
 
+    # engine-side states of jobs waiting for admission, and whose submission to
+    # r-job-controller is ongoing
+    waiting = "waiting"
+    submitting = "submitting"
+
     created = "created"
     running = "running"
     finished = "finished"
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage job status event consumers."""
+
+import abc
+import importlib
+import json
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+JobStatusCallback = Callable[[str, str], None]
+"""Callback receiving the ``job_id`` and the new ``status`` of a job."""
+
+
+class JobStatusConsumer(abc.ABC):
+    """Base class of the consumers pushing job status events to the backend."""
+
+    @abc.abstractmethod
+    def start(self, on_job_status: JobStatusCallback) -> None:
+        """Start consuming events in the background, calling ``on_job_status``."""
+
+    @abc.abstractmethod
+    def stop(self) -> None:
+        """Stop consuming events."""
+
+    @staticmethod
+    def _dispatch(on_job_status: JobStatusCallback, event) -> None:
+        """Parse a job status event and forward it to the callback."""
+        if isinstance(event, (str, bytes)):
+            event = json.loads(event)
+        try:
+            job_id, status = event["job_id"], event["status"]
+        except (KeyError, TypeError):
+            log.warning(f"Ignoring malformed job status event: {event}")
+            return
+        on_job_status(job_id, status)
+
+
+class QueueJobStatusConsumer(JobStatusConsumer):
+    """Consume job status events from an in-process queue.
+
+    Mostly useful for testing, events are dictionaries with ``job_id`` and
+    ``status`` keys put on ``events``.
+    """
+
+    _stop_sentinel = object()
+
+    def __init__(self, events: Optional[queue.Queue] = None):
+        """Initialize the consumer."""
+        self.events = events or queue.Queue()
+        self._thread = None
+
+    def start(self, on_job_status: JobStatusCallback) -> None:
+        """Start consuming events from the queue in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._consume, args=(on_job_status,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop consuming once the already queued events are processed."""
+        self.events.put(self._stop_sentinel)
+        if self._thread:
+            self._thread.join()
+
+    def _consume(self, on_job_status: JobStatusCallback) -> None:
+        while True:
+            event = self.events.get()
+            if event is self._stop_sentinel:
+                return
+            try:
+                self._dispatch(on_job_status, event)
+            except Exception as e:
+                log.error(f"Could not process job status event {event}: {e}")
+
+
+def load_job_status_consumer(import_string: str) -> JobStatusConsumer:
+    """Instantiate a job status consumer from a ``module:Class`` string."""
+    module_name, _, class_name = import_string.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
@@ -5,22 +5,89 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """REANA-Workflow-Engine-yadage REANA packtivity backend."""
 
+import atexit
 import base64
+import hashlib
+import heapq
+import itertools
+import json
 import logging
 import os
-from typing import Any, Dict, List, Union
-
+import shlex
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from bravado_core.exception import SwaggerMappingError
+from jsonschema.exceptions import ValidationError
 from packtivity.asyncbackends import ExternalAsyncProxy
 from packtivity.syncbackends import build_job, finalize_inputs, packconfig, publish
 from reana_commons.api_client import JobControllerAPIClient as RJC_API_Client
+from reana_commons.job_utils import serialise_job_command
 
 from .config import (
+    JOB_CONTROLLER_CIRCUIT_FAILURE_THRESHOLD,
+    JOB_CONTROLLER_CIRCUIT_RESET_SECONDS,
+    JOB_CONTROLLER_CONNECT_TIMEOUT_SECONDS,
+    JOB_MAX_IN_FLIGHT,
+    JOB_CONTROLLER_KEEP_ALIVE,
+    JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS,
+    JOB_CONTROLLER_POOL_SIZE,
+    JOB_CONTROLLER_RETRY_BASE_DELAY_SECONDS,
+    JOB_CONTROLLER_RETRY_MAX_ATTEMPTS,
+    JOB_CONTROLLER_RETRY_MAX_DELAY_SECONDS,
+    JOB_CONTROLLER_TIMEOUT_SECONDS,
+    JOB_FAILURE_LOG_TAIL_LINES,
+    JOB_FAILURE_RECORDS_MAX_ENTRIES,
+    JOB_RESULT_CACHE,
+    JOB_RESULT_CACHE_INDEX_FILENAME,
+    JOB_RESULT_CACHE_MAX_ENTRIES,
+    JOB_SCRIPT_SPILL_THRESHOLD_BYTES,
+    JOB_SCRIPTS_DIRNAME,
+    JOB_STATUS_CONSUMER,
+    JOB_STATUS_EVENTS_MAX_PENDING,
+    JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS,
+    JOB_STATUS_SAFETY_NET_REFRESH_INTERVAL_SECONDS,
+    JOB_SUBMISSION_BURST,
+    JOB_SUBMISSION_RATE,
+    JOB_SUBMISSION_THREADS,
     JOB_TERMINAL_STATUSES,
     LOGGING_MODULE,
     MOUNT_CVMFS,
     JobStatus,
     WORKFLOW_KERBEROS,
 )
+from .admission import AdmissionController
+from .cache import ResultCache
+from .consumer import JobStatusConsumer, load_job_status_consumer
+from .failures import FailureRecord, FailureStore
+from .httpclient import PooledRequestsClient
+from .metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_MAX_WAIT_SECONDS,
+    ADMISSION_MEAN_WAIT_SECONDS,
+    ADMISSION_QUEUE_DEPTH,
+    JOB_STATUS_CHECK_SECONDS,
+    JOB_STATUSES_FETCH_SECONDS,
+    JOB_SUBMIT_FAILURES,
+    JOB_SUBMIT_SECONDS,
+    JOBS_IN_FLIGHT,
+)
+from .recording import (
+    RecordingJobControllerClient,
+    TrafficRecorder,
+    get_workflow_recorder,
+)
+from .statuses import JobStatusTable
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    is_transient_error,
+)
 
 log = logging.getLogger(LOGGING_MODULE)
 
@@ -33,18 +100,85 @@ def make_script(job):
     )
 
 
+def spill_script(job, scripts_dir: str) -> str:
+    """Write script type commands to a content-hashed file run by the interpreter.
+
+    Jobs sharing the same script, such as scatter jobs, share the same file.
+    """
+    script = job["script"].encode("utf-8")
+    script_path = os.path.join(scripts_dir, hashlib.sha256(script).hexdigest())
+    if not os.path.exists(script_path):
+        os.makedirs(scripts_dir, exist_ok=True)
+        tmp_path = f"{script_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as script_file:
+            script_file.write(script)
+        os.replace(tmp_path, script_path)
+    return "{interpreter} < {path}".format(
+        interpreter=job["interpreter"], path=shlex.quote(script_path)
+    )
+
+
 class ReanaExternalProxy(ExternalAsyncProxy):
     """REANA yadage external proxy."""
 
+    DETAILS_ATTRIBUTES = ("resultdata", "jobproxy", "spec", "statedata", "pardata")
+    """Attributes whose assignment invalidates the serialized details."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the proxy."""
+        self._details: Optional[Dict] = None
+        self._details_lock = threading.Lock()
+        self.timestamps: Dict[str, float] = {}
+        """When the job was submitted, seen running, seen terminal and published."""
+        super().__init__(*args, **kwargs)
+        self.inputs_finalized = False
+        """Whether ``pardata`` and ``statedata`` went through ``finalize_inputs``."""
+        self.published_result = None
+        """Result published once the job succeeded."""
+        self.submission: Optional[Future] = None
+        """Background submission of the job, if it is submitted asynchronously."""
+        self.cache_key: Optional[str] = None
+        """Key of the job in the result cache, if it is enabled."""
+        self.priority: float = 0.0
+        """Submission priority hint of the job, higher ones are submitted first."""
+        self.queued = False
+        """Whether the job is waiting for admission."""
+        self.admitted = False
+        """Whether the job holds an admission slot, until it is done."""
+        self.final_status: Optional[str] = None
+        """Terminal status of the job, kept once it is evicted from the backend."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, invalidating the details if they depend on it.
+
+        Worker threads assign the job proxy while the details may be read, so
+        the assignment and the invalidation happen together under a lock.
+        """
+        if name == "jobproxy" and value and value.get("job_id"):
+            self.timestamps.setdefault("submitted", time.time())
+        if name in self.DETAILS_ATTRIBUTES:
+            with self._details_lock:
+                super().__setattr__(name, value)
+                self._details = None
+        else:
+            super().__setattr__(name, value)
+
     def details(self):
-        """Parse details to json format."""
-        return {
-            "resultdata": self.resultdata,
-            "jobproxy": self.jobproxy,
-            "spec": self.spec,
-            "statedata": self.statedata.json(),
-            "pardata": self.pardata.json(),
-        }
+        """Parse details to json format.
+
+        The details are serialized once, and again only after one of the
+        ``DETAILS_ATTRIBUTES`` is assigned.
+        """
+        with self._details_lock:
+            if self._details is None:
+                self._details = {
+                    "resultdata": self.resultdata,
+                    "jobproxy": self.jobproxy,
+                    "spec": self.spec,
+                    "statedata": self.statedata.json(),
+                    "pardata": self.pardata.json(),
+                }
+            return self._details
 
 
 class ExternalBackend:
@@ -53,13 +187,108 @@ class ExternalBackend:
     Submits jobs and fetches their statuses from the JobController.
     """
 
-    def __init__(self):
-        """Initialize the REANA packtivity backend."""
+    def __init__(
+        self,
+        job_status_consumer: Optional[JobStatusConsumer] = None,
+        result_cache: Optional[ResultCache] = None,
+        recorder: Optional[TrafficRecorder] = None,
+        rjc_api_client: Optional[RJC_API_Client] = None,
+    ):
+        """Initialize the REANA packtivity backend.
+
+        :param job_status_consumer: Consumer of pushed job status events. When
+            not given, it is loaded from ``REANA_JOB_STATUS_CONSUMER`` if set.
+        :param result_cache: Cache of the results of earlier identical jobs.
+            When not given, it is enabled with ``REANA_JOB_RESULT_CACHE``.
+        :param recorder: Recorder of the traffic with the job controller. When
+            not given, it is enabled with ``REANA_WORKFLOW_RECORDING``.
+        :param rjc_api_client: Job controller client. When not given, a client
+            of ``reana-job-controller`` is created.
+        """
         self.config = packconfig()
-        self.rjc_api_client = RJC_API_Client("reana-job-controller")
+        self.http_client = PooledRequestsClient(
+            pool_size=JOB_CONTROLLER_POOL_SIZE,
+            keep_alive=JOB_CONTROLLER_KEEP_ALIVE,
+            connect_timeout=JOB_CONTROLLER_CONNECT_TIMEOUT_SECONDS,
+            timeout=JOB_CONTROLLER_TIMEOUT_SECONDS,
+        )
+        self.rjc_api_client = rjc_api_client or RJC_API_Client(
+            "reana-job-controller", http_client=self.http_client
+        )
+        if recorder is None:
+            recorder = get_workflow_recorder()
+        if recorder is not None:
+            self.rjc_api_client = RecordingJobControllerClient(
+                self.rjc_api_client, recorder
+            )
+
+        self.retry_policy = RetryPolicy(
+            max_attempts=JOB_CONTROLLER_RETRY_MAX_ATTEMPTS,
+            base_delay=JOB_CONTROLLER_RETRY_BASE_DELAY_SECONDS,
+            max_delay=JOB_CONTROLLER_RETRY_MAX_DELAY_SECONDS,
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=JOB_CONTROLLER_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=JOB_CONTROLLER_CIRCUIT_RESET_SECONDS,
+        )
 
-        self.jobs_statuses = {}
-        self._fail_info = ""
+        self.jobs_statuses = JobStatusTable()
+        """Statuses of the jobs, until their result is published or they failed."""
+        self._specs: Dict[bytes, Dict] = {}
+        self._jobs_statuses_refreshed_at = 0.0
+        self._jobs_statuses_refresh_interval = JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS
+        self._bulk_status_supported = True
+        self._jobs_statuses_lock = threading.Lock()
+        self._early_statuses: "OrderedDict[str, str]" = OrderedDict()
+        self._evicted_job_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._submissions_in_flight: Dict[Tuple, int] = {}
+        self.failures = FailureStore(max_entries=JOB_FAILURE_RECORDS_MAX_ENTRIES)
+
+        self._submission_pool = None
+        if JOB_SUBMISSION_THREADS > 0:
+            self._submission_pool = ThreadPoolExecutor(
+                max_workers=JOB_SUBMISSION_THREADS,
+                thread_name_prefix="reana-job-submission",
+            )
+        # jobs waiting for a submission thread, by decreasing priority
+        self._submission_queue: List[Tuple[float, int, ReanaExternalProxy, Any]] = []
+        self._submission_queue_lock = threading.Lock()
+        self._submission_sequence = itertools.count()
+
+        self._admission_controller = None
+        if JOB_MAX_IN_FLIGHT > 0 or JOB_SUBMISSION_RATE > 0:
+            self._admission_controller = AdmissionController(
+                max_in_flight=JOB_MAX_IN_FLIGHT,
+                rate=JOB_SUBMISSION_RATE,
+                burst=JOB_SUBMISSION_BURST,
+            )
+
+        if result_cache is None and JOB_RESULT_CACHE:
+            result_cache = ResultCache(
+                os.path.join(
+                    os.getenv("workflow_workspace", "default"),
+                    JOB_RESULT_CACHE_INDEX_FILENAME,
+                ),
+                max_entries=JOB_RESULT_CACHE_MAX_ENTRIES,
+            )
+        self.result_cache = result_cache
+
+        if job_status_consumer is None and JOB_STATUS_CONSUMER:
+            job_status_consumer = load_job_status_consumer(JOB_STATUS_CONSUMER)
+        self.job_status_consumer = job_status_consumer
+        if self.job_status_consumer:
+            # statuses are pushed, polling only acts as a safety net
+            self._jobs_statuses_refresh_interval = (
+                JOB_STATUS_SAFETY_NET_REFRESH_INTERVAL_SECONDS
+            )
+            self.job_status_consumer.start(self._on_job_status_event)
+            atexit.register(self.close)
+
+    def close(self) -> None:
+        """Stop consuming job status events, if they are consumed."""
+        if self.job_status_consumer:
+            self.job_status_consumer.stop()
+            self.job_status_consumer = None
 
     @staticmethod
     def _get_resources(resources: List[Union[Dict, Any]]) -> Dict[str, Any]:
@@ -94,10 +323,21 @@ class ExternalBackend:
 
         return parameters
 
-    def submit(  # noqa: C901
-        self, spec, parameters, state, metadata  # noqa: C901
-    ) -> ReanaExternalProxy:  # noqa: C901
-        """Submit a yadage packtivity to RJC."""
+    @staticmethod
+    def _wrap_script(job) -> str:
+        """Build the command running a script, spilling big ones to the workspace."""
+        script_size = len(job["script"].encode("utf-8"))
+        if 0 < JOB_SCRIPT_SPILL_THRESHOLD_BYTES < script_size:
+            return spill_script(
+                job,
+                os.path.join(
+                    os.getenv("workflow_workspace", "default"), JOB_SCRIPTS_DIRNAME
+                ),
+            )
+        return make_script(job)
+
+    def _prepare_job(self, spec, parameters, state, metadata) -> Tuple[Dict, Any, Any]:
+        """Finalize the inputs of a packtivity and build its job request body."""
         parameters, state = finalize_inputs(parameters, state)
         job = build_job(spec["process"], parameters, state, self.config)
 
@@ -108,7 +348,7 @@ class ExternalBackend:
             prettified_cmd = wrapped_cmd = job["command"]
         elif "script" in job:
             prettified_cmd = job["script"]
-            wrapped_cmd = make_script(job)
+            wrapped_cmd = self._wrap_script(job)
 
         image = spec["environment"]["image"]
         imagetag = spec["environment"].get("imagetag", "")
@@ -131,46 +371,482 @@ class ExternalBackend:
             "cvmfs_mounts": MOUNT_CVMFS,
             **resources_parameters,
         }
-
-        job_submit_response = self.rjc_api_client.submit(**job_request_body)
-        job_id = job_submit_response.get("job_id")
+        return job_request_body, parameters, state
+
+    def _submit_job(self, job_request_body: Dict) -> Dict:
+        """Submit a job to RJC and start tracking its status.
+
+        Submissions failing with transient errors are retried, unless the job
+        controller created the job anyway.
+        """
+        submission_key = self._get_submission_key(job_request_body)
+        with self._jobs_statuses_lock:
+            self._submissions_in_flight[submission_key] = (
+                self._submissions_in_flight.get(submission_key, 0) + 1
+            )
+        try:
+            with JOB_SUBMIT_SECONDS.time():
+                job_submit_response = call_with_retries(
+                    lambda: self.rjc_api_client.submit(**job_request_body),
+                    self.retry_policy,
+                    self.circuit_breaker,
+                    before_retry=lambda error: self._find_submitted_job(
+                        job_request_body, error
+                    ),
+                )
+            job_id = job_submit_response.get("job_id")
+            with self._jobs_statuses_lock:
+                # the job may have been registered when retrying
+                self._register_job(job_id)
+        except Exception:
+            JOB_SUBMIT_FAILURES.increment()
+            raise
+        finally:
+            with self._jobs_statuses_lock:
+                self._submissions_in_flight[submission_key] -= 1
+                if not self._submissions_in_flight[submission_key]:
+                    del self._submissions_in_flight[submission_key]
 
         log.info(f"Submitted job with id: {job_id}")
+        return {"job_id": job_id}
+
+    def _register_job(self, job_id: str) -> None:
+        """Start tracking the status of a job, with the lock held.
+
+        The status may have already been pushed while the job was submitted.
+        """
+        status = self._early_statuses.pop(job_id, JobStatus.created)
+        self.jobs_statuses.setdefault(job_id, status)
 
-        return ReanaExternalProxy(
-            jobproxy=job_submit_response, spec=spec, pardata=parameters, statedata=state
+    def _evict_job(self, job_id: str) -> None:
+        """Stop tracking the status of a job, ignoring its late pushed statuses."""
+        with self._jobs_statuses_lock:
+            self.jobs_statuses.pop(job_id, None)
+            self._evicted_job_ids[job_id] = None
+            if len(self._evicted_job_ids) > JOB_STATUS_EVENTS_MAX_PENDING:
+                self._evicted_job_ids.popitem(last=False)
+
+    @staticmethod
+    def _get_submission_key(job_request_body: Dict) -> Tuple:
+        return job_request_body.get("workflow_uuid"), job_request_body.get("job_name")
+
+    def _find_submitted_job(
+        self, job_request_body: Dict, error: BaseException
+    ) -> Optional[Dict]:
+        """Find the job created by a submission which failed on the client side.
+
+        The job controller has no idempotency key, so the active jobs are
+        looked up for an unknown job of the same workflow, with the same name,
+        image and command. The job found is registered right away, so that
+        concurrent submissions cannot claim it too.
+
+        :raises: ``error`` when the active jobs cannot be looked up, or when an
+            identical submission is in flight and the job cannot be told apart
+            from its job, so that the job is not submitted twice.
+        """
+        if not self._bulk_status_supported:
+            raise error
+        try:
+            active_jobs = self._get_active_jobs_from_controller()
+        except Exception as e:
+            log.error(f"Cannot check whether the failed submission created a job: {e}")
+            raise error
+        submission_key = self._get_submission_key(job_request_body)
+        workflow_uuid, job_name = submission_key
+        image = job_request_body["image"].strip()
+        cmd = serialise_job_command(job_request_body["cmd"])
+        with self._jobs_statuses_lock:
+            candidates = [
+                job_id
+                for job_id, job in active_jobs.items()
+                if job_id not in self.jobs_statuses
+                and job.get("status") not in JOB_TERMINAL_STATUSES
+                and job.get("docker_img") == image
+                and job.get("cmd") == cmd
+                and job.get("job_name", job_name) == job_name
+                and job.get("workflow_uuid", workflow_uuid) == workflow_uuid
+            ]
+            if not candidates:
+                return None
+            if self._submissions_in_flight.get(submission_key, 0) > 1:
+                log.error(
+                    f"Cannot tell which of jobs {', '.join(candidates)} was "
+                    "created by the failed submission"
+                )
+                raise error
+            job_id = candidates[0]
+            self._register_job(job_id)
+        log.info(f"Failed submission created job {job_id} anyway")
+        return {"job_id": job_id}
+
+    def _submit_or_reuse_job(
+        self, job_request_body: Dict, parameters, state
+    ) -> Tuple[Dict, Optional[str]]:
+        """Submit a job, unless an identical job already succeeded.
+
+        :return: The job proxy, and the key of the job in the result cache.
+        """
+        jobproxy, cache_key = self._get_cached_job(job_request_body, parameters, state)
+        if jobproxy is None:
+            jobproxy = self._submit_job(job_request_body)
+        return jobproxy, cache_key
+
+    def _get_cached_job(
+        self, job_request_body: Dict, parameters, state
+    ) -> Tuple[Optional[Dict], Optional[str]]:
+        """Look for an identical job which already succeeded.
+
+        :return: The proxy of the cached job if any, and the key of the job in
+            the result cache.
+        """
+        if self.result_cache is None:
+            return None, None
+
+        cache_key = self.result_cache.get_key(
+            job_request_body, parameters.json(), state.readwrite
+        )
+        cached_job = self.result_cache.get(cache_key)
+        if cached_job is None:
+            # the job is about to overwrite the results of other entries
+            self.result_cache.invalidate(state.readwrite)
+            return None, cache_key
+
+        job_id = cached_job["job_id"]
+        log.info(
+            f"Reusing the results of job {job_id} for {job_request_body['job_name']}"
+        )
+        with self._jobs_statuses_lock:
+            self.jobs_statuses[job_id] = JobStatus.finished
+        return {"job_id": job_id, "cached": True}, cache_key
+
+    def _intern_spec(self, spec: Dict) -> Dict:
+        """Get the spec shared by the proxies of jobs with an identical spec.
+
+        The nodes of a scattered step have the same spec, which would otherwise
+        be kept once per node after deserializing the workflow.
+        """
+        key = hashlib.sha256(
+            json.dumps(spec, sort_keys=True, default=str).encode()
+        ).digest()
+        return self._specs.setdefault(key, spec)
+
+    def _submit_proxy(self, proxy: ReanaExternalProxy, metadata) -> None:
+        """Prepare and submit the job of a proxy, setting its job proxy."""
+        job_request_body, proxy.pardata, proxy.statedata = self._prepare_job(
+            proxy.spec, proxy.pardata, proxy.statedata, metadata
+        )
+        proxy.inputs_finalized = True
+        proxy.jobproxy, proxy.cache_key = self._submit_or_reuse_job(
+            job_request_body, proxy.pardata, proxy.statedata
         )
 
-    def result(self, resultproxy: ReanaExternalProxy):
-        """Retrieve the result of a packtivity run by RJC."""
-        resultproxy.pardata, resultproxy.statedata = finalize_inputs(
-            resultproxy.pardata, resultproxy.statedata
+    def submit(self, spec, parameters, state, metadata) -> ReanaExternalProxy:
+        """Submit a yadage packtivity to RJC.
+
+        When admission control or background submission is enabled, the
+        returned proxy is in the ``waiting`` or ``submitting`` state until its
+        job is admitted, and submitted by the submission pool.
+        """
+        proxy = ReanaExternalProxy(
+            jobproxy={"job_id": None},
+            spec=self._intern_spec(spec),
+            pardata=parameters,
+            statedata=state,
         )
+        proxy.priority = self._get_priority(metadata)
+        if self._admission_controller is None:
+            self._start_submission(proxy, metadata)
+            return proxy
+
+        proxy.queued = True
+        proxy.submission = Future()
+        self._admission_controller.enqueue((proxy, metadata), proxy.priority)
+        self._admit_queued_jobs()
+        return proxy
+
+    def _start_submission(self, proxy: ReanaExternalProxy, metadata) -> None:
+        """Submit the job of a proxy with the configured submission mode.
+
+        Jobs waiting for a thread of the submission pool are submitted by
+        decreasing priority.
+        """
+        if self._submission_pool is None:
+            self._submit_proxy(proxy, metadata)
+            return
+
+        proxy.submission = Future()
+        with self._submission_queue_lock:
+            heapq.heappush(
+                self._submission_queue,
+                (-proxy.priority, next(self._submission_sequence), proxy, metadata),
+            )
+        self._submission_pool.submit(self._submit_next_queued_proxy)
+
+    def _submit_next_queued_proxy(self) -> None:
+        """Submit the job with the highest priority waiting for a thread."""
+        with self._submission_queue_lock:
+            _, _, proxy, metadata = heapq.heappop(self._submission_queue)
+        try:
+            self._submit_proxy(proxy, metadata)
+        except Exception as e:
+            proxy.submission.set_exception(e)
+        else:
+            proxy.submission.set_result(None)
+
+    def _admit_queued_jobs(self) -> None:
+        """Submit the queued jobs allowed by the admission controller."""
+        for proxy, metadata in self._admission_controller.admit():
+            queued_submission = proxy.submission
+            proxy.queued = False
+            proxy.admitted = True
+            proxy.submission = None
+            try:
+                self._start_submission(proxy, metadata)
+            except Exception as e:
+                log.error(f"Job submission failed: {e}")
+                proxy.submission = queued_submission
+                proxy.submission.set_exception(e)
+
+    def _release_admitted_job(self, proxy: ReanaExternalProxy) -> None:
+        """Free the admission slot of a finished job, admitting queued ones."""
+        if proxy.admitted:
+            proxy.admitted = False
+            self._admission_controller.release()
+        self._admit_queued_jobs()
+
+    def admission_stats(self) -> Dict[str, float]:
+        """Return the statistics of the admission queue, if admission is controlled."""
+        if self._admission_controller is None:
+            return {}
+        return self._admission_controller.stats()
+
+    def export_metrics(self) -> None:
+        """Export the connection pool and admission queue statistics as metrics.
+
+        The metrics are global to the process, so only the backend running the
+        workflow exports them.
+        """
+        self.http_client.export_pool_stats()
+        for gauge, key in (
+            (ADMISSION_QUEUE_DEPTH, "queue_depth"),
+            (ADMISSION_IN_FLIGHT, "in_flight"),
+            (ADMISSION_MEAN_WAIT_SECONDS, "mean_wait_seconds"),
+            (ADMISSION_MAX_WAIT_SECONDS, "max_wait_seconds"),
+        ):
+            gauge.set_function(lambda key=key: self.admission_stats().get(key, 0))
+
+    @staticmethod
+    def _get_priority(metadata) -> float:
+        """Get the priority hint given by the workflow controller, if any."""
+        return metadata.get("wflow_hints", {}).get("priority", 0.0)
 
-        return publish(
+    def result(self, resultproxy: ReanaExternalProxy):
+        """Retrieve the result of a packtivity run by RJC.
+
+        adage asks for the result of finished jobs at every update, so the
+        result is only published the first time.
+        """
+        if resultproxy.published_result is not None:
+            return resultproxy.published_result
+        if not resultproxy.inputs_finalized:
+            resultproxy.pardata, resultproxy.statedata = finalize_inputs(
+                resultproxy.pardata, resultproxy.statedata
+            )
+            resultproxy.inputs_finalized = True
+
+        result = publish(
             resultproxy.spec["publisher"],
             resultproxy.pardata,
             resultproxy.statedata,
             self.config,
         )
+        if resultproxy.cache_key and not resultproxy.jobproxy.get("cached"):
+            self.result_cache.put(
+                resultproxy.cache_key,
+                resultproxy.jobproxy["job_id"],
+                resultproxy.statedata.readwrite,
+            )
+        # the final status is kept by the proxy from now on
+        self._evict_job(resultproxy.jobproxy["job_id"])
+        resultproxy.published_result = result
+        resultproxy.timestamps["published"] = time.time()
+        return result
 
     def _get_job_status_from_controller(self, job_id: str) -> str:
-        response = self.rjc_api_client.check_status(job_id)
+        with JOB_STATUS_CHECK_SECONDS.time():
+            response = self.rjc_api_client.check_status(job_id)
         return response["status"]
 
-    def _refresh_job_status(self, job_id: str) -> None:
-        self.jobs_statuses[job_id] = self._get_job_status_from_controller(job_id)
+    def _get_active_jobs_from_controller(self) -> Dict[str, Dict]:
+        """Fetch all the active jobs of the job controller in a single request.
+
+        The job controller answers ``{"jobs": {<job id>: <job>}}`` while its
+        specification declares a list of jobs, so the response body is read as
+        it is, whether or not it validates against the specification.
+        """
+        with JOB_STATUSES_FETCH_SECONDS.time():
+            jobs_request = self.rjc_api_client._client.jobs.get_jobs()
+            response = jobs_request.response(
+                fallback_result=None,
+                exceptions_to_catch=(SwaggerMappingError, ValidationError),
+            )
+        return response.incoming_response.json()["jobs"]
+
+    def _get_jobs_statuses_from_controller(
+        self, job_ids: Iterable[str]
+    ) -> Dict[str, str]:
+        """Fetch the statuses of the given jobs.
+
+        Statuses are fetched with one bulk request when the job controller supports
+        it, falling back to one request per job otherwise, or for the jobs missing
+        from the bulk response.
+        """
+        active_jobs = {}
+        if self._bulk_status_supported:
+            try:
+                active_jobs = self._get_active_jobs_from_controller()
+            except Exception as e:
+                if is_transient_error(e):
+                    raise
+                log.warning(
+                    "Cannot fetch job statuses in bulk, falling back to one "
+                    f"request per job for the rest of the workflow: {e!r}"
+                )
+                self._bulk_status_supported = False
+
+        statuses = {}
+        for job_id in job_ids:
+            if job_id in active_jobs:
+                statuses[job_id] = active_jobs[job_id]["status"]
+            else:
+                statuses[job_id] = self._get_job_status_from_controller(job_id)
+        return statuses
+
+    def _on_job_status_event(self, job_id: str, status: str) -> None:
+        """Update the status of a job of this workflow from a pushed event.
+
+        Statuses of jobs which are not registered yet, because their submission
+        did not return yet, are kept until they are. Statuses of evicted jobs,
+        whose result was already published or which failed, are ignored.
+        """
+        with self._jobs_statuses_lock:
+            if job_id in self._evicted_job_ids:
+                return
+            current_status = self.jobs_statuses.get(job_id)
+            if current_status is None:
+                if self._early_statuses.get(job_id) in JOB_TERMINAL_STATUSES:
+                    return
+                self._early_statuses[job_id] = status
+                self._early_statuses.move_to_end(job_id)
+                if len(self._early_statuses) > JOB_STATUS_EVENTS_MAX_PENDING:
+                    self._early_statuses.popitem(last=False)
+                return
+            if current_status in JOB_TERMINAL_STATUSES:
+                return
+            log.debug(f"Job {job_id} status pushed: {status}")
+            self.jobs_statuses[job_id] = status
+
+    def _refresh_jobs_statuses(self, job_id: str) -> None:
+        """Refresh the status of the given job and of all the other pending jobs."""
+        with self._jobs_statuses_lock:
+            pending_job_ids = {
+                pending_job_id
+                for pending_job_id, status in self.jobs_statuses.items()
+                if status not in JOB_TERMINAL_STATUSES
+            }
+        pending_job_ids.add(job_id)
+        JOBS_IN_FLIGHT.set(len(pending_job_ids))
+        self._jobs_statuses_refreshed_at = time.monotonic()
+        if not self.circuit_breaker.allow_request():
+            self._check_job_controller_unavailability()
+            return
+        try:
+            statuses = self._get_jobs_statuses_from_controller(pending_job_ids)
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            self.circuit_breaker.record_failure()
+            self._check_job_controller_unavailability()
+            log.warning(f"Could not refresh job statuses, will retry later: {e!r}")
+            return
+        self.circuit_breaker.record_success()
+        with self._jobs_statuses_lock:
+            for refreshed_job_id, status in statuses.items():
+                # pushed terminal statuses are newer than the polled ones
+                if self.jobs_statuses.get(refreshed_job_id) in JOB_TERMINAL_STATUSES:
+                    continue
+                self.jobs_statuses[refreshed_job_id] = status
+
+    def set_jobs_statuses_refresh_interval(self, interval: float) -> None:
+        """Set the interval between two job status refreshes.
+
+        It is kept when job statuses are pushed, polling is then a safety net.
+        """
+        if not self.job_status_consumer:
+            self._jobs_statuses_refresh_interval = interval
+
+    def _check_job_controller_unavailability(self) -> None:
+        unavailable_for = self.circuit_breaker.unavailable_for()
+        if unavailable_for > JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS:
+            raise CircuitOpenError(
+                f"Job controller has been unavailable for {unavailable_for:.0f}s."
+            )
 
     def _should_refresh_job_status(self, job_id: str) -> bool:
         status = self.jobs_statuses.get(job_id)
-        return status not in JOB_TERMINAL_STATUSES
+        if status is None:
+            return True
+        if status in JOB_TERMINAL_STATUSES:
+            return False
+        elapsed = time.monotonic() - self._jobs_statuses_refreshed_at
+        return elapsed >= self._jobs_statuses_refresh_interval
+
+    @staticmethod
+    def _get_submission_error(
+        resultproxy: ReanaExternalProxy,
+    ) -> Optional[BaseException]:
+        submission = resultproxy.submission
+        if submission is None or not submission.done():
+            return None
+        return submission.exception()
 
     def _get_state(self, resultproxy: ReanaExternalProxy) -> str:
         """Get the packtivity state."""
+        state = self._get_job_state(resultproxy)
+        if self._admission_controller is not None:
+            if state in JOB_TERMINAL_STATUSES:
+                self._release_admitted_job(resultproxy)
+            else:
+                self._admit_queued_jobs()
+        return state
+
+    def _get_job_state(self, resultproxy: ReanaExternalProxy) -> str:
+        if resultproxy.final_status is not None:
+            return resultproxy.final_status
+        if resultproxy.queued:
+            return JobStatus.waiting
+        submission = resultproxy.submission
+        if submission is not None:
+            if not submission.done():
+                return JobStatus.submitting
+            if submission.exception():
+                resultproxy.timestamps.setdefault("terminal", time.time())
+                return JobStatus.failed
+
         job_id = resultproxy.jobproxy["job_id"]
         if self._should_refresh_job_status(job_id):
-            self._refresh_job_status(job_id)
-        return self.jobs_statuses[job_id]
+            self._refresh_jobs_statuses(job_id)
+        # the status is unknown if the job controller is unavailable
+        status = self.jobs_statuses.get(job_id, JobStatus.created)
+        if status == JobStatus.running and "running" not in resultproxy.timestamps:
+            resultproxy.timestamps["running"] = time.time()
+        elif status in JOB_TERMINAL_STATUSES:
+            resultproxy.final_status = status
+            resultproxy.timestamps["terminal"] = time.time()
+            if status != JobStatus.finished:
+                # there is no result to publish
+                self._evict_job(job_id)
+        return status
 
     def ready(self, resultproxy: ReanaExternalProxy) -> bool:
         """Check if a packtivity is finished."""
@@ -180,7 +856,36 @@ class ExternalBackend:
         """Check if the packtivity was successful."""
         return self._get_state(resultproxy) == JobStatus.finished
 
-    def fail_info(self, resultproxy):
-        """Retrieve the fail info."""
-        self._fail_info += f"\nraw info: {resultproxy}"
-        return self._fail_info
+    def _get_job_logs_from_controller(self, job_id: str) -> str:
+        """Get the logs of a job, from the raw response of the job controller."""
+        response = self.rjc_api_client.get_logs(job_id)
+        try:
+            return json.loads(response)["log"]
+        except (ValueError, TypeError, KeyError):
+            return response
+
+    def get_failure_record(self, resultproxy: ReanaExternalProxy) -> FailureRecord:
+        """Get the failure record of a failed packtivity, creating it if needed."""
+        job_id = (resultproxy.jobproxy or {}).get("job_id")
+        key = job_id or f"proxy-{id(resultproxy)}"
+        record = self.failures.get(key)
+        if record is None:
+            submission_error = self._get_submission_error(resultproxy)
+            status = resultproxy.final_status or JobStatus.failed
+            record = FailureRecord(
+                job_id=job_id,
+                status=getattr(status, "value", status),
+                error=(
+                    f"job submission failed: {submission_error!r}"
+                    if submission_error
+                    else None
+                ),
+                fetch_logs=self._get_job_logs_from_controller,
+                log_tail_lines=JOB_FAILURE_LOG_TAIL_LINES,
+            )
+            self.failures.put(key, record)
+        return record
+
+    def fail_info(self, resultproxy: ReanaExternalProxy) -> str:
+        """Retrieve the fail info of a packtivity."""
+        return str(self.get_failure_record(resultproxy))
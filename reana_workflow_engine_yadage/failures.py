@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage job failure records."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+
+class FailureRecord:
+    """Failure of a single job, with the tail of its logs fetched on demand."""
+
+    def __init__(
+        self,
+        job_id: Optional[str],
+        status: str,
+        error: Optional[str] = None,
+        fetch_logs: Optional[Callable[[str], str]] = None,
+        log_tail_lines: int = 0,
+    ):
+        """Initialize the record.
+
+        :param job_id: ID of the job, ``None`` if its submission failed.
+        :param status: Last known status of the job.
+        :param error: Error which made the job fail on the engine side, if any.
+        :param fetch_logs: Function fetching the logs of a job.
+        :param log_tail_lines: Number of log lines to keep, ``0`` to keep none.
+        """
+        self.job_id = job_id
+        self.status = status
+        self.error = error
+        self._fetch_logs = fetch_logs
+        self._log_tail_lines = log_tail_lines
+        self._log_tail: Optional[str] = None
+
+    @property
+    def log_tail(self) -> Optional[str]:
+        """Get the last lines of the logs of the job, fetched the first time."""
+        if self._log_tail is None and self._can_fetch_logs():
+            fetch_logs, self._fetch_logs = self._fetch_logs, None
+            try:
+                logs = fetch_logs(self.job_id) or ""
+            except Exception as e:
+                log.warning(f"Could not fetch the logs of job {self.job_id}: {e!r}")
+                return None
+            self._log_tail = "\n".join(logs.splitlines()[-self._log_tail_lines :])
+        return self._log_tail
+
+    def _can_fetch_logs(self) -> bool:
+        return bool(self.job_id and self._fetch_logs and self._log_tail_lines > 0)
+
+    def __str__(self) -> str:
+        """Format the record for the failure report of the job."""
+        lines = [f"job {self.job_id or '(not submitted)'} {self.status}"]
+        if self.error:
+            lines.append(f"error: {self.error}")
+        log_tail = self.log_tail
+        if log_tail:
+            lines.append(f"last {self._log_tail_lines} log lines:\n{log_tail}")
+        return "\n".join(lines)
+
+
+class FailureStore:
+    """Bounded store of failure records, evicting the oldest ones first."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty store keeping at most ``max_entries`` records."""
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[str, FailureRecord]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of records in the store."""
+        return len(self._records)
+
+    def get(self, key: str) -> Optional[FailureRecord]:
+        """Get the record with the given key, if it was not evicted."""
+        with self._lock:
+            return self._records.get(key)
+
+    def put(self, key: str, record: FailureRecord) -> None:
+        """Add the record with the given key."""
+        with self._lock:
+            self._records.pop(key, None)
+            self._records[key] = record
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
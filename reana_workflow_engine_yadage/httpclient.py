@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage HTTP client for the job controller."""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+from bravado.requests_client import RequestsClient
+from requests.adapters import HTTPAdapter
+
+from .config import LOGGING_MODULE
+from .metrics import (
+    JOB_CONTROLLER_POOL_IN_FLIGHT,
+    JOB_CONTROLLER_POOL_MAX_IN_FLIGHT,
+    JOB_CONTROLLER_POOL_SATURATED_REQUESTS,
+    JOB_CONTROLLER_POOL_SIZE,
+)
+
+log = logging.getLogger(LOGGING_MODULE)
+
+
+class PoolStatsHTTPAdapter(HTTPAdapter):
+    """HTTP adapter keeping track of the usage of its connection pool."""
+
+    def __init__(self, pool_maxsize: int, **kwargs):
+        """Initialize the adapter with a single pool of ``pool_maxsize`` slots."""
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.saturated_requests = 0
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize, **kwargs)
+
+    def send(self, request, **kwargs):
+        """Send the request, accounting for the pool slot it uses."""
+        with self._stats_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            saturated = self.in_flight > self._pool_maxsize
+            if saturated:
+                self.saturated_requests += 1
+        if saturated and self.saturated_requests == 1:
+            log.warning(
+                "Job controller connection pool is saturated "
+                f"({self._pool_maxsize} connections), consider increasing "
+                "REANA_JOB_CONTROLLER_POOL_SIZE."
+            )
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the connection pool usage statistics."""
+        with self._stats_lock:
+            return {
+                "pool_size": self._pool_maxsize,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "saturated_requests": self.saturated_requests,
+            }
+
+
+class PooledRequestsClient(RequestsClient):
+    """Bravado HTTP client reusing pooled keep-alive connections.
+
+    Requests without explicit timeouts get the configured default ones.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        keep_alive: bool = True,
+        connect_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize the client and mount its pooled adapter."""
+        super().__init__(ssl_verify=False)
+        self.adapter = PoolStatsHTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+    def separate_params(self, request_params):
+        """Split the request parameters, adding the default timeouts."""
+        sanitized_params, misc_options = super().separate_params(request_params)
+        if self.connect_timeout is not None:
+            misc_options.setdefault("connect_timeout", self.connect_timeout)
+        if self.timeout is not None:
+            misc_options.setdefault("timeout", self.timeout)
+        return sanitized_params, misc_options
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return the connection pool usage statistics."""
+        return self.adapter.stats()
+
+    def export_pool_stats(self) -> None:
+        """Export the connection pool usage statistics as engine metrics."""
+        for gauge, key in (
+            (JOB_CONTROLLER_POOL_SIZE, "pool_size"),
+            (JOB_CONTROLLER_POOL_IN_FLIGHT, "in_flight"),
+            (JOB_CONTROLLER_POOL_MAX_IN_FLIGHT, "max_in_flight"),
+            (JOB_CONTROLLER_POOL_SATURATED_REQUESTS, "saturated_requests"),
+        ):
+            gauge.set_function(lambda key=key: self.adapter.stats()[key])
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage engine metrics."""
+
+import http.server
+import logging
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from .config import (
+    LOGGING_MODULE,
+    WORKFLOW_METRICS_FILE,
+    WORKFLOW_METRICS_FLUSH_INTERVAL_SECONDS,
+    WORKFLOW_METRICS_PORT,
+)
+
+log = logging.getLogger(LOGGING_MODULE)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+"""Upper bounds of the buckets of duration histograms, in seconds."""
+
+
+class Counter:
+    """Number of events."""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str):
+        """Initialize the counter."""
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def increment(self, amount: int = 1) -> None:
+        """Count events."""
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> List[str]:
+        """Render the counter in the Prometheus text format."""
+        return [f"{self.name} {self.value}"]
+
+    def summarize(self) -> str:
+        """Summarize the counter for the workflow logs."""
+        return str(self.value)
+
+
+class Gauge:
+    """Value which goes up and down, set or computed when exported."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        function: Optional[Callable[[], float]] = None,
+    ):
+        """Initialize the gauge, computed by ``function`` if given."""
+        self.name = name
+        self.description = description
+        self._function = function
+        self._value = 0.0
+
+    @property
+    def value(self) -> float:
+        """Get the value of the gauge."""
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def set(self, value: float) -> None:
+        """Set the value of the gauge."""
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value of the gauge with ``function`` from now on."""
+        self._function = function
+
+    def render(self) -> List[str]:
+        """Render the gauge in the Prometheus text format."""
+        return [f"{self.name} {self.value:.15g}"]
+
+    def summarize(self) -> str:
+        """Summarize the gauge for the workflow logs."""
+        return f"{self.value:.15g}"
+
+
+class Histogram:
+    """Distribution of observed values, counted in buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """Initialize the histogram with the upper bounds of its buckets."""
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record an observed value."""
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of a block of code, in seconds."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at)
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text format."""
+        with self._lock:
+            lines, cumulative_count = [], 0
+            for upper_bound, count in zip(self.buckets, self.bucket_counts):
+                cumulative_count += count
+                lines.append(
+                    f'{self.name}_bucket{{le="{upper_bound:g}"}} {cumulative_count}'
+                )
+            lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+            lines.append(f"{self.name}_sum {self.sum:g}")
+            lines.append(f"{self.name}_count {self.count}")
+            return lines
+
+    def summarize(self) -> str:
+        """Summarize the histogram for the workflow logs."""
+        if not self.count:
+            return "0"
+        return f"{self.count}, mean {self.sum / self.count:.4g}, max {self.max:.4g}"
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Metrics of the engine process."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, description))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        function: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        """Register a gauge."""
+        return self._register(Gauge(name, description, function))
+
+    def histogram(
+        self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(Histogram(name, description, buckets))
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summarize(self) -> str:
+        """Summarize the metrics for the workflow logs."""
+        return "\n".join(
+            f"{metric.description} {metric.summarize()}"
+            for metric in self.metrics.values()
+        )
+
+
+def get_rss_bytes() -> float:
+    """Get the resident memory of the process, its peak if it is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # kibibytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+REGISTRY = MetricsRegistry()
+"""Metrics of the engine process."""
+
+JOB_SUBMIT_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_job_submit_seconds",
+    "Job submissions to the job controller, in seconds:",
+)
+JOB_SUBMIT_FAILURES = REGISTRY.counter(
+    "reana_workflow_engine_job_submit_failures_total", "Failed job submissions:"
+)
+JOB_STATUS_CHECK_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_job_status_check_seconds",
+    "Per-job status checks, in seconds:",
+)
+JOB_STATUSES_FETCH_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_job_statuses_fetch_seconds",
+    "Bulk job status fetches, in seconds:",
+)
+JOBS_IN_FLIGHT = REGISTRY.gauge(
+    "reana_workflow_engine_jobs_in_flight",
+    "Jobs submitted and not finished, at the last status refresh:",
+)
+TRACK_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_track_seconds", "Progress tracking ticks, in seconds:"
+)
+DAG_DUMP_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_dag_dump_seconds", "Full DAG dumps, in seconds:"
+)
+DAG_DUMP_NODES = REGISTRY.gauge(
+    "reana_workflow_engine_dag_dump_nodes", "Nodes in the last full DAG dump:"
+)
+PUBLISH_SECONDS = REGISTRY.histogram(
+    "reana_workflow_engine_publish_seconds",
+    "Workflow status publications, in seconds:",
+)
+PUBLISH_FAILURES = REGISTRY.counter(
+    "reana_workflow_engine_publish_failures_total",
+    "Failed workflow status publications:",
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    "reana_workflow_engine_admission_queue_depth",
+    "Jobs waiting for admission:",
+)
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "reana_workflow_engine_admission_in_flight",
+    "Admitted jobs not finished yet:",
+)
+ADMISSION_MEAN_WAIT_SECONDS = REGISTRY.gauge(
+    "reana_workflow_engine_admission_mean_wait_seconds",
+    "Mean wait for admission, in seconds:",
+)
+ADMISSION_MAX_WAIT_SECONDS = REGISTRY.gauge(
+    "reana_workflow_engine_admission_max_wait_seconds",
+    "Longest wait for admission, in seconds:",
+)
+JOB_CONTROLLER_POOL_SIZE = REGISTRY.gauge(
+    "reana_workflow_engine_job_controller_pool_size",
+    "Connections in the job controller connection pool:",
+)
+JOB_CONTROLLER_POOL_IN_FLIGHT = REGISTRY.gauge(
+    "reana_workflow_engine_job_controller_pool_in_flight",
+    "Job controller requests in flight:",
+)
+JOB_CONTROLLER_POOL_MAX_IN_FLIGHT = REGISTRY.gauge(
+    "reana_workflow_engine_job_controller_pool_max_in_flight",
+    "Maximum job controller requests in flight:",
+)
+JOB_CONTROLLER_POOL_SATURATED_REQUESTS = REGISTRY.gauge(
+    "reana_workflow_engine_job_controller_pool_saturated_requests",
+    "Job controller requests sent while the connection pool was saturated:",
+)
+RSS_BYTES = REGISTRY.gauge(
+    "reana_workflow_engine_resident_memory_bytes",
+    "Resident memory, in bytes:",
+    get_rss_bytes,
+)
+
+
+class MetricsFileWriter:
+    """Write the metrics to a file periodically, from a background thread."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float):
+        """Start writing the metrics to ``path`` every ``interval`` seconds."""
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="reana-metrics-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self) -> None:
+        """Atomically write the metrics to the file."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as metrics_file:
+            metrics_file.write(self.registry.render())
+        os.replace(tmp_path, self.path)
+
+    def _write_or_warn(self) -> None:
+        try:
+            self.write()
+        except OSError as e:
+            log.warning(f"Could not write the metrics to {self.path}: {e}")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write_or_warn()
+
+    def close(self) -> None:
+        """Write the metrics a last time and stop the thread.
+
+        Failing to write is only logged, so that it does not hide how the
+        workflow ended.
+        """
+        self._stopped.set()
+        self._thread.join()
+        self._write_or_warn()
+
+
+def serve_metrics(registry: MetricsRegistry, port: int) -> http.server.HTTPServer:
+    """Serve the metrics in the Prometheus text format from a background thread."""
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            log.debug(f"Metrics request: {format % args}")
+
+    server = http.server.ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(
+        target=server.serve_forever, name="reana-metrics-server", daemon=True
+    ).start()
+    log.info(f"Serving the engine metrics on port {server.server_address[1]}")
+    return server
+
+
+class MetricsExporter:
+    """Export the metrics as configured, until closed."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        """Start the metrics server and file writer, if enabled."""
+        self.registry = registry
+        self._server = None
+        self._file_writer = None
+        if WORKFLOW_METRICS_PORT:
+            self._server = serve_metrics(registry, WORKFLOW_METRICS_PORT)
+        if WORKFLOW_METRICS_FILE:
+            self._file_writer = MetricsFileWriter(
+                registry,
+                os.path.join(
+                    os.getenv("workflow_workspace", "default"), WORKFLOW_METRICS_FILE
+                ),
+                WORKFLOW_METRICS_FLUSH_INTERVAL_SECONDS,
+            )
+
+    def close(self) -> None:
+        """Stop exporting, and log the summary of the metrics."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._file_writer is not None:
+            self._file_writer.close()
+        log.info(f"Engine metrics summary:\n{self.registry.summarize()}")
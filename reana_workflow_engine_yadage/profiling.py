@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage opt-in profiling of the engine."""
+
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import (
+    LOGGING_MODULE,
+    WORKFLOW_PROFILING,
+    WORKFLOW_PROFILING_DIRNAME,
+    WORKFLOW_PROFILING_SAMPLE_INTERVAL_SECONDS,
+)
+
+log = logging.getLogger(LOGGING_MODULE)
+
+PROFILING_MODES = ("cprofile", "stacks", "tracemalloc")
+"""Supported profilers."""
+
+
+class WorkflowProfiler:
+    """Profile the phases of a workflow run, and write the results to a directory.
+
+    The run goes through top-level phases, such as the workflow setup and the
+    adage loop, within which nested phases, such as the tracker callbacks and
+    the backend calls, are entered and exited. Only the thread which started
+    the profiler is profiled. The artifacts are:
+
+    - ``phases.json``: number of calls and inclusive duration of each phase,
+    - ``<phase>.pstats`` (``cprofile``): deterministic profile of each phase,
+      excluding the nested phases,
+    - ``stacks.folded`` (``stacks``): sampled stacks in the folded format of
+      flame graph tools, rooted at the innermost phase,
+    - ``<phase>.tracemalloc`` (``tracemalloc``): memory allocations snapshot
+      at the end of each top-level phase.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        modes: Iterable[str],
+        sample_interval: float = WORKFLOW_PROFILING_SAMPLE_INTERVAL_SECONDS,
+    ):
+        """Initialize the profiler with the given profilers."""
+        self.output_dir = output_dir
+        self.modes = set()
+        for mode in modes:
+            if mode in PROFILING_MODES:
+                self.modes.add(mode)
+            else:
+                log.warning(f"Ignoring unknown profiler {mode!r}.")
+        self.sample_interval = sample_interval
+        self.phase_stats: Dict[str, Dict[str, float]] = {}
+        self.stacks: Counter = Counter()
+        self._phases: List[Tuple[str, float]] = []
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._thread_id: Optional[int] = None
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, phase: str) -> None:
+        """Start profiling the current thread in the given top-level phase."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._thread_id = threading.get_ident()
+        if "tracemalloc" in self.modes:
+            tracemalloc.start()
+        if "stacks" in self.modes:
+            self._sampler = threading.Thread(
+                target=self._sample, name="reana-profiling-sampler", daemon=True
+            )
+            self._sampler.start()
+        self._enter(phase)
+
+    def switch_phase(self, phase: str) -> None:
+        """End the current top-level phase and start the given one."""
+        self._exit()
+        self._enter(phase)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Profile a block of code as a nested phase."""
+        self._enter(phase)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def stop(self) -> None:
+        """Stop profiling and write the results."""
+        if self._thread_id is None:
+            return
+        while self._phases:
+            self._exit()
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            with open(os.path.join(self.output_dir, "stacks.folded"), "w") as f:
+                for stack, count in self.stacks.items():
+                    f.write(f"{stack} {count}\n")
+        for phase, profile in self._profiles.items():
+            profile.dump_stats(os.path.join(self.output_dir, f"{phase}.pstats"))
+        if "tracemalloc" in self.modes:
+            tracemalloc.stop()
+        with open(os.path.join(self.output_dir, "phases.json"), "w") as f:
+            json.dump(self.phase_stats, f, indent=2)
+        log.info(f"Profiling results written to {self.output_dir}")
+
+    def _enter(self, phase: str) -> None:
+        if self._phases:
+            self._disable_profile(self._phases[-1][0])
+        self._phases.append((phase, time.perf_counter()))
+        self._enable_profile(phase)
+
+    def _exit(self) -> None:
+        phase, started_at = self._phases[-1]
+        self._disable_profile(phase)
+        self._phases.pop()
+        stats = self.phase_stats.setdefault(phase, {"calls": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["seconds"] += time.perf_counter() - started_at
+        if self._phases:
+            self._enable_profile(self._phases[-1][0])
+        elif "tracemalloc" in self.modes:
+            tracemalloc.take_snapshot().dump(
+                os.path.join(self.output_dir, f"{phase}.tracemalloc")
+            )
+
+    def _enable_profile(self, phase: str) -> None:
+        if "cprofile" in self.modes:
+            self._profiles.setdefault(phase, cProfile.Profile()).enable()
+
+    def _disable_profile(self, phase: str) -> None:
+        if "cprofile" in self.modes:
+            self._profiles[phase].disable()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._thread_id)
+            try:
+                phase = self._phases[-1][0]
+            except IndexError:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(phase)
+            self.stacks[";".join(reversed(stack))] += 1
+
+
+class ProfiledTracker:
+    """Adage tracker whose callbacks are profiled as the ``tracker`` phase."""
+
+    def __init__(self, tracker, profiler: WorkflowProfiler):
+        """Wrap the given tracker."""
+        self._tracker = tracker
+        self._profiler = profiler
+
+    def initialize(self, adageobj) -> None:
+        """Initialize the wrapped tracker."""
+        with self._profiler.phase("tracker"):
+            self._tracker.initialize(adageobj)
+
+    def track(self, adageobj) -> None:
+        """Call the wrapped tracker."""
+        with self._profiler.phase("tracker"):
+            self._tracker.track(adageobj)
+
+    def finalize(self, adageobj) -> None:
+        """Finalize the wrapped tracker."""
+        with self._profiler.phase("tracker"):
+            self._tracker.finalize(adageobj)
+
+
+class ProfiledBackend:
+    """Yadage backend whose calls are profiled as the ``backend`` phase."""
+
+    def __init__(self, backend, profiler: WorkflowProfiler):
+        """Wrap the given backend."""
+        self._backend = backend
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        """Get the attributes of the wrapped backend, profiling its methods."""
+        attribute = getattr(self._backend, name)
+        if not callable(attribute):
+            return attribute
+
+        def profiled(*args, **kwargs):
+            with self._profiler.phase("backend"):
+                return attribute(*args, **kwargs)
+
+        return profiled
+
+
+def get_workflow_profiler() -> Optional[WorkflowProfiler]:
+    """Get a profiler writing to the workspace, if profiling is enabled."""
+    modes = [mode.strip() for mode in WORKFLOW_PROFILING.split(",") if mode.strip()]
+    if not modes:
+        return None
+    output_dir = os.path.join(
+        os.getenv("workflow_workspace", "default"), WORKFLOW_PROFILING_DIRNAME
+    )
+    log.info(f"Profiling the workflow engine with {', '.join(modes)}")
+    return WorkflowProfiler(output_dir, modes)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage background progress publisher."""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+
+class CoalescingPublisher:
+    """Publish progress from a background thread, coalescing bursts.
+
+    Publication requests fill a single slot: while a request is pending, new
+    ones are merged into it, and the message is built from the latest progress
+    state only when it is sent. Two messages are at least ``min_interval``
+    seconds apart, except when flushing.
+    """
+
+    def __init__(self, publish: Callable[[], None], min_interval: float):
+        """Initialize the publisher and start its thread.
+
+        :param publish: Function building and publishing the latest progress.
+        :param min_interval: Minimum time between two publications, in seconds.
+        """
+        self._publish = publish
+        self.min_interval = min_interval
+        self._condition = threading.Condition()
+        self._pending = False
+        self._closed = False
+        self._last_published_at = float("-inf")
+        self._thread = threading.Thread(
+            target=self._run, name="reana-progress-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def schedule(self) -> None:
+        """Request the publication of the latest progress."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot schedule on a closed publisher.")
+            self._pending = True
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Publish the pending progress, if any, and stop the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _wait_for_next_publication(self) -> bool:
+        """Wait until progress should be published, or the publisher is closed.
+
+        :return: Whether progress should be published.
+        """
+        with self._condition:
+            while True:
+                if self._pending:
+                    wait_for = (
+                        self._last_published_at + self.min_interval - time.monotonic()
+                    )
+                    if self._closed or wait_for <= 0:
+                        self._pending = False
+                        return True
+                    self._condition.wait(wait_for)
+                elif self._closed:
+                    return False
+                else:
+                    self._condition.wait()
+
+    def _run(self) -> None:
+        while self._wait_for_next_publication():
+            try:
+                self._publish()
+            except Exception as e:
+                log.error(f"Background progress publication failed: {e}")
+            self._last_published_at = time.monotonic()
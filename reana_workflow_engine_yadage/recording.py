@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage job controller and publisher traffic recording."""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import LOGGING_MODULE, WORKFLOW_RECORDING, WORKFLOW_RECORDING_FILENAME
+
+log = logging.getLogger(LOGGING_MODULE)
+
+
+class TrafficRecorder:
+    """Writer of timestamped traffic records to a gzipped JSON lines file.
+
+    Records have a ``kind``, their time ``t`` and the duration ``d`` of the
+    call, both in seconds since the start of the recording.
+    """
+
+    def __init__(self, path: str):
+        """Open the recording, overwriting an earlier one."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt")
+        self._started_at = time.monotonic()
+        self._write({"kind": "start", "time": time.time()})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def now(self) -> float:
+        """Get the time since the start of the recording, in seconds."""
+        return time.monotonic() - self._started_at
+
+    def record(self, kind: str, started_at: float, **fields) -> None:
+        """Record a call which started at ``started_at``, as given by ``now``."""
+        self._write(
+            {
+                "kind": kind,
+                "t": round(started_at, 4),
+                "d": round(self.now() - started_at, 4),
+                **fields,
+            }
+        )
+
+    def close(self) -> None:
+        """Flush and close the recording."""
+        with self._lock:
+            self._file.close()
+
+
+def load_recording(path: str) -> Iterator[Dict[str, Any]]:
+    """Read the records of a recording, skipping a truncated last line."""
+    with gzip.open(path, "rt") as recording:
+        try:
+            for line in recording:
+                yield json.loads(line)
+        except (EOFError, ValueError):
+            log.warning(f"Recording {path} is truncated.")
+
+
+class RecordingJobControllerClient:
+    """``JobControllerAPIClient`` recording its submissions and status checks.
+
+    The statuses fetched in bulk are recorded when they changed since the
+    previous time, to keep the recording compact.
+    """
+
+    def __init__(self, client, recorder: TrafficRecorder):
+        """Wrap the given job controller client."""
+        self._wrapped_client = client
+        self._recorder = recorder
+        self._client = _RecordingBravadoClient(self)
+        self._bulk_statuses: Dict[str, str] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        """Get the attributes which are not recorded from the wrapped client."""
+        return getattr(self._wrapped_client, name)
+
+    def submit(self, **job_request_body) -> Dict:
+        """Submit a job, recording its name, image and ID."""
+        started_at = self._recorder.now()
+        fields = {
+            "job_name": job_request_body.get("job_name"),
+            "image": job_request_body.get("image"),
+        }
+        try:
+            response = self._wrapped_client.submit(**job_request_body)
+        except Exception as e:
+            self._recorder.record("submit", started_at, error=repr(e), **fields)
+            raise
+        self._recorder.record(
+            "submit", started_at, job_id=response.get("job_id"), **fields
+        )
+        return response
+
+    def check_status(self, job_id: str) -> Dict:
+        """Check the status of a job, recording it."""
+        started_at = self._recorder.now()
+        try:
+            response = self._wrapped_client.check_status(job_id)
+        except Exception as e:
+            self._recorder.record(
+                "check_status", started_at, job_id=job_id, error=repr(e)
+            )
+            raise
+        self._recorder.record(
+            "check_status", started_at, job_id=job_id, status=response["status"]
+        )
+        return response
+
+    def _record_bulk_statuses(self, started_at: float, jobs: Dict[str, Dict]) -> None:
+        changed = {}
+        for job_id, job in jobs.items():
+            if self._bulk_statuses.get(job_id) != job["status"]:
+                self._bulk_statuses[job_id] = changed[job_id] = job["status"]
+        self._recorder.record("get_jobs", started_at, statuses=changed)
+
+
+class _RecordingBravadoClient:
+    """Bravado client of the job controller, recording the jobs listing."""
+
+    def __init__(self, recording_client: RecordingJobControllerClient):
+        self._recording_client = recording_client
+        self.jobs = _RecordingJobsResource(recording_client)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._recording_client._wrapped_client._client, name)
+
+
+class _RecordingJobsResource:
+    def __init__(self, recording_client: RecordingJobControllerClient):
+        self._recording_client = recording_client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._recording_client._wrapped_client._client.jobs, name)
+
+    def get_jobs(self, **kwargs):
+        return _RecordingFuture(
+            self._recording_client,
+            self._recording_client._wrapped_client._client.jobs.get_jobs(**kwargs),
+        )
+
+
+class _RecordingFuture:
+    def __init__(self, recording_client: RecordingJobControllerClient, future):
+        self._recording_client = recording_client
+        self._future = future
+
+    def response(self, *args, **kwargs):
+        recorder = self._recording_client._recorder
+        started_at = recorder.now()
+        try:
+            response = self._future.response(*args, **kwargs)
+            jobs = response.incoming_response.json()["jobs"]
+        except Exception as e:
+            recorder.record("get_jobs", started_at, error=repr(e))
+            raise
+        self._recording_client._record_bulk_statuses(started_at, jobs)
+        return response
+
+
+class RecordingPublisher:
+    """``WorkflowStatusPublisher`` recording the status and size of messages."""
+
+    def __init__(self, publisher, recorder: TrafficRecorder):
+        """Wrap the given publisher."""
+        self._publisher = publisher
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        """Get the attributes which are not recorded from the wrapped publisher."""
+        return getattr(self._publisher, name)
+
+    def publish_workflow_status(self, workflow_uuid, status, *args, **kwargs):
+        """Publish a workflow status, recording the size of its message."""
+        message = kwargs.get("message")
+        fields = {
+            "status": status,
+            "bytes": len(json.dumps(message, default=str)) if message else 0,
+        }
+        started_at = self._recorder.now()
+        try:
+            result = self._publisher.publish_workflow_status(
+                workflow_uuid, status, *args, **kwargs
+            )
+        except Exception as e:
+            self._recorder.record("publish", started_at, error=repr(e), **fields)
+            raise
+        self._recorder.record("publish", started_at, **fields)
+        return result
+
+
+def record_workflow_dag(recorder: TrafficRecorder, dag_view: Dict) -> None:
+    """Record the shape of the workflow, with the job of each node."""
+    nodes: List[List[Optional[str]]] = [
+        [
+            node["id"],
+            node["metadata"]["name"],
+            (node["jobid"] or {}).get("job_id"),
+        ]
+        for node in dag_view["dag"]["nodes"]
+    ]
+    recorder.record("dag", recorder.now(), nodes=nodes, edges=dag_view["dag"]["edges"])
+
+
+_workflow_recorder: Optional[TrafficRecorder] = None
+
+
+def get_workflow_recorder() -> Optional[TrafficRecorder]:
+    """Get the recorder of the workflow, if recording is enabled.
+
+    The backend and the tracker share the recorder, stored in the workspace.
+    """
+    global _workflow_recorder
+    if WORKFLOW_RECORDING and _workflow_recorder is None:
+        path = os.path.join(
+            os.getenv("workflow_workspace", "default"), WORKFLOW_RECORDING_FILENAME
+        )
+        log.info(f"Recording the job controller and publisher traffic to {path}")
+        _workflow_recorder = TrafficRecorder(path)
+        atexit.register(_workflow_recorder.close)
+    return _workflow_recorder
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage offline replay of recorded workflows."""
+
+import logging
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Collection, Dict, List, Tuple
+
+import adage
+import click
+from adage.graph import AdageDAG
+from adage.node import Node
+from packtivity.statecontexts.posixfs_context import LocalFSState
+from packtivity.typedleafs import TypedLeafs
+from yadage.backends.packtivitybackend import PacktivityBackend
+
+from .config import LOGGING_MODULE, WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS
+from .externalbackend import ExternalBackend
+from .recording import load_recording
+from .tracker import REANATracker
+
+log = logging.getLogger(LOGGING_MODULE)
+
+PUBLISHING_SPEC = {
+    "process": None,
+    "environment": None,
+    "publisher": {"publisher_type": "constant-pub", "publish": {"replayed": True}},
+}
+"""Spec of the nodes which did not run a job, published right away."""
+
+
+def get_mean_duration(records: List[Dict], kind: str) -> float:
+    """Get the mean duration of the recorded calls of the given kind."""
+    durations = [record["d"] for record in records if record["kind"] == kind]
+    return statistics.mean(durations) if durations else 0.0
+
+
+class ReplayJobController:
+    """Job controller client answering like the recorded job controller.
+
+    Jobs go through the recorded statuses, as long after their submission as
+    they were observed, and calls last as long as recorded on average. Both
+    are divided by ``speed``.
+    """
+
+    def __init__(
+        self,
+        records: List[Dict],
+        speed: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the job controller from the records of a recording."""
+        self.speed = speed
+        self.waited_seconds = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._submit_durations: Dict[str, float] = {}
+        self._job_ids: Dict[str, str] = {}
+        self._statuses: Dict[str, List[Tuple[float, str]]] = {}
+        self._submitted_at: Dict[str, float] = {}
+        self._load(records)
+        self.recorded_job_ids = set(self._statuses)
+        """IDs of the jobs whose submission was recorded."""
+        self._check_status_duration = get_mean_duration(records, "check_status")
+        self._get_jobs_duration = get_mean_duration(records, "get_jobs")
+        self._client = SimpleNamespace(jobs=SimpleNamespace(get_jobs=self._get_jobs))
+
+    def _load(self, records: List[Dict]) -> None:
+        submitted_at = {}
+        for record in records:
+            if "error" in record:
+                continue
+            if record["kind"] == "submit":
+                job_id = record["job_id"]
+                self._job_ids[record["job_name"]] = job_id
+                self._submit_durations[job_id] = record["d"]
+                self._statuses[job_id] = []
+                submitted_at[job_id] = record["t"] + record["d"]
+            elif record["kind"] == "check_status":
+                statuses = {record["job_id"]: record["status"]}
+            elif record["kind"] == "get_jobs":
+                statuses = record["statuses"]
+            else:
+                continue
+            if record["kind"] != "submit":
+                for job_id, status in statuses.items():
+                    if job_id in submitted_at:
+                        elapsed = record["t"] - submitted_at[job_id]
+                        self._statuses[job_id].append((elapsed, status))
+
+    def _wait(self, seconds: float) -> None:
+        seconds /= self.speed
+        self.waited_seconds += seconds
+        self._sleep(seconds)
+
+    def _get_status(self, job_id: str) -> str:
+        elapsed = (self._clock() - self._submitted_at[job_id]) * self.speed
+        status = "created"
+        for observed_after, observed_status in self._statuses[job_id]:
+            if observed_after > elapsed:
+                break
+            status = observed_status
+        return status
+
+    def submit(self, job_name: str = "", **kwargs) -> Dict:
+        """Submit the recorded job with the given name."""
+        if job_name not in self._job_ids:
+            raise ValueError(f"Job {job_name} was not recorded.")
+        job_id = self._job_ids[job_name]
+        self._wait(self._submit_durations[job_id])
+        self._submitted_at[job_id] = self._clock()
+        return {"job_id": job_id}
+
+    def check_status(self, job_id: str) -> Dict:
+        """Get the status of a job."""
+        self._wait(self._check_status_duration)
+        return {"status": self._get_status(job_id)}
+
+    def _get_jobs(self):
+        self._wait(self._get_jobs_duration)
+        body = {
+            "jobs": {
+                job_id: {"job_id": job_id, "status": self._get_status(job_id)}
+                for job_id in self._submitted_at
+            }
+        }
+        response = SimpleNamespace(incoming_response=SimpleNamespace(json=lambda: body))
+        return SimpleNamespace(response=lambda **kwargs: response)
+
+
+class ReplayPublisher:
+    """Publisher taking as long as the recorded one to publish, on average."""
+
+    def __init__(
+        self,
+        records: List[Dict],
+        speed: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the publisher from the records of a recording."""
+        self.messages = 0
+        self.waited_seconds = 0.0
+        self._duration = get_mean_duration(records, "publish") / speed
+        self._sleep = sleep
+
+    def publish_workflow_status(self, workflow_uuid, status, *args, **kwargs):
+        """Pretend to publish a workflow status."""
+        self.messages += 1
+        self.waited_seconds += self._duration
+        self._sleep(self._duration)
+
+
+class ReplayBackend(ExternalBackend):
+    """Packtivity backend submitting the recorded jobs without running steps."""
+
+    def _prepare_job(self, spec, parameters, state, metadata) -> Tuple[Dict, Any, Any]:
+        return {"job_name": metadata["name"]}, parameters, state
+
+    def result(self, resultproxy):
+        """Return an empty result, the outputs of the steps were not produced."""
+        return TypedLeafs({"replayed": True})
+
+
+class ReplayTask:
+    """Task of a recorded workflow node."""
+
+    def __init__(self, name: str, has_job: bool):
+        """Initialize the task of the node with the given name."""
+        self.spec = PUBLISHING_SPEC
+        self.parameters = TypedLeafs({})
+        self.state = LocalFSState(readwrite=[], readonly=[])
+        self.metadata = {"name": name, "wflow_hints": {"is_purepub": not has_job}}
+
+
+class ReplayWorkflow:
+    """Adage workflow with the recorded DAG.
+
+    Nodes whose job submission was not recorded, such as nodes whose results
+    were reused from the result cache, did not run a job and are replayed as
+    publishing ones.
+    """
+
+    def __init__(self, dag_record: Dict, recorded_job_ids: Collection[str]):
+        """Build the workflow from the recorded DAG and submitted job IDs."""
+        self.dag = AdageDAG()
+        self.rules = []
+        self.applied_rules = []
+        nodes = {}
+        for node_id, name, job_id in dag_record["nodes"]:
+            has_job = job_id is not None and job_id in recorded_job_ids
+            nodes[node_id] = Node(name, ReplayTask(name, has_job), node_id)
+        predecessors = {node_id: [] for node_id in nodes}
+        for source, target in dag_record["edges"]:
+            predecessors[target].append(nodes[source])
+        for node_id in self._get_insertion_order(predecessors):
+            self.dag.addNode(nodes[node_id], depends_on=predecessors[node_id])
+
+    @staticmethod
+    def _get_insertion_order(predecessors: Dict[str, List[Node]]) -> List[str]:
+        """Order the nodes so that they come after their predecessors."""
+        order, added = [], set()
+        pending = list(predecessors)
+        while pending:
+            remaining = []
+            for node_id in pending:
+                if all(node.identifier in added for node in predecessors[node_id]):
+                    order.append(node_id)
+                    added.add(node_id)
+                else:
+                    remaining.append(node_id)
+            pending = remaining
+        return order
+
+
+class TickCounter:
+    """Adage tracker counting the ticks of the workflow."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.ticks = 0
+
+    def initialize(self, adageobj) -> None:
+        """Start counting."""
+
+    def track(self, adageobj) -> None:
+        """Count a tick."""
+        self.ticks += 1
+
+    def finalize(self, adageobj) -> None:
+        """Stop counting."""
+
+
+def replay_workflow(path: str, speed: float = 1.0) -> Dict[str, Any]:
+    """Run a recorded workflow again, offline.
+
+    :param path: Path of the recording.
+    :param speed: Speed of the replay, relatively to the recording.
+    :return: Whether the workflow succeeded, and where the time of the replay
+        went, in seconds.
+    """
+    records = list(load_recording(path))
+    dag_records = [record for record in records if record["kind"] == "dag"]
+    if not dag_records:
+        raise ValueError(f"Recording {path} has no workflow DAG, it was interrupted.")
+
+    controller = ReplayJobController(records, speed)
+    publisher = ReplayPublisher(records, speed)
+    replay_backend = ReplayBackend(rjc_api_client=controller)
+    replay_backend._jobs_statuses_refresh_interval /= speed
+    backend = PacktivityBackend(packtivity_backend=replay_backend, backendopts={})
+    tracker = REANATracker("replay", publisher)
+    tick_counter = TickCounter()
+    update_interval = WORKFLOW_TRACKING_UPDATE_INTERVAL_SECONDS / speed
+
+    started_at = time.perf_counter()
+    succeeded = True
+    try:
+        adage.rundag(
+            adageobj=ReplayWorkflow(dag_records[-1], controller.recorded_job_ids),
+            backend=backend,
+            update_interval=update_interval,
+            default_trackers=False,
+            additional_trackers=[tracker, tick_counter],
+        )
+    except RuntimeError as e:
+        # recorded job failures make the replay fail too
+        log.info(f"Replayed workflow failed: {e}")
+        succeeded = False
+    tracker.publish_workflow_final_status()
+    wall_seconds = time.perf_counter() - started_at
+
+    idle_seconds = tick_counter.ticks * update_interval
+    return {
+        "succeeded": succeeded,
+        "wall_seconds": wall_seconds,
+        "ticks": tick_counter.ticks,
+        "idle_seconds": idle_seconds,
+        "controller_seconds": controller.waited_seconds,
+        "publisher_seconds": publisher.waited_seconds,
+        "engine_seconds": wall_seconds
+        - idle_seconds
+        - controller.waited_seconds
+        - publisher.waited_seconds,
+    }
+
+
+@click.command()
+@click.argument("recording", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--speed",
+    default=1.0,
+    show_default=True,
+    help="Replay speed, e.g. 10 replays ten times faster than recorded.",
+)
+def replay_workflow_command(recording, speed):
+    """Replay a workflow recorded with REANA_WORKFLOW_RECORDING, offline."""
+    summary = replay_workflow(recording, speed)
+    for key, value in summary.items():
+        click.echo(
+            f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}"
+        )
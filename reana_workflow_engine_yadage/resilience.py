@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage resilience of the job controller calls."""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+import requests
+from bravado.exception import (
+    BravadoConnectionError,
+    BravadoTimeoutError,
+    HTTPServerError,
+    HTTPTooManyRequests,
+)
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+T = TypeVar("T")
+
+TRANSIENT_ERRORS = (
+    BravadoConnectionError,
+    BravadoTimeoutError,
+    HTTPServerError,
+    HTTPTooManyRequests,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+"""Errors after which a request to the job controller may succeed if retried."""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Check whether an error, or the error it was raised from, is transient.
+
+    ``JobControllerAPIClient.submit`` wraps HTTP errors, so the errors which
+    caused the given one are checked too.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class CircuitOpenError(Exception):
+    """The job controller is considered unavailable, requests are paused."""
+
+
+class CircuitBreaker:
+    """Stop calling the job controller for a while after repeated failures.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens, and requests are refused for ``reset_timeout`` seconds. Then the
+    circuit is half-open: the next request probes the job controller and
+    closes the circuit if it succeeds, or opens it again if it fails.
+    """
+
+    closed = "closed"
+    open = "open"
+    half_open = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._failing_since: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Get the state of the circuit."""
+        with self._lock:
+            if (
+                self._state == self.open
+                and self._clock() - self._opened_at >= self.reset_timeout
+            ):
+                self._state = self.half_open
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a request can be sent to the job controller."""
+        return self.state != self.open
+
+    def retry_after(self) -> float:
+        """Get the time left before the circuit lets a request through, in seconds."""
+        with self._lock:
+            if self._state != self.open:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def unavailable_for(self) -> float:
+        """Get for how long requests have been failing, in seconds."""
+        with self._lock:
+            if self._failing_since is None:
+                return 0.0
+            return self._clock() - self._failing_since
+
+    def record_success(self) -> None:
+        """Record a request which reached the job controller."""
+        with self._lock:
+            if self._state != self.closed:
+                log.info("Job controller is available again.")
+            self._state = self.closed
+            self._failures = 0
+            self._failing_since = None
+
+    def record_failure(self) -> None:
+        """Record a request which failed with a transient error."""
+        with self._lock:
+            now = self._clock()
+            self._failures += 1
+            if self._failing_since is None:
+                self._failing_since = now
+            if self._state == self.half_open or (
+                self._state == self.closed and self._failures >= self.failure_threshold
+            ):
+                log.warning(
+                    "Job controller looks unavailable, pausing requests "
+                    f"for {self.reset_timeout}s."
+                )
+                self._state = self.open
+                self._opened_at = now
+
+
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        """Initialize the policy.
+
+        :param max_attempts: Maximum number of attempts of a call, at least one.
+        :param base_delay: Maximum delay before the first retry, in seconds.
+        :param max_delay: Maximum delay before any retry, in seconds.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self._jitter = jitter
+
+    def get_delay(self, attempt: int) -> float:
+        """Get the delay before retrying after the given failed attempt."""
+        return self._jitter() * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+def call_with_retries(
+    function: Callable[[], T],
+    retry_policy: RetryPolicy,
+    circuit_breaker: CircuitBreaker,
+    before_retry: Optional[Callable[[BaseException], Optional[T]]] = None,
+) -> T:
+    """Call the job controller, retrying after transient errors.
+
+    :param function: Function sending the request.
+    :param before_retry: Function called with the last error before retrying.
+        It can return the result of a request which succeeded even though it
+        failed on the client side, to stop retrying, or raise to give up.
+    """
+    for attempt in range(retry_policy.max_attempts):
+        if circuit_breaker.allow_request():
+            try:
+                result = function()
+            except Exception as e:
+                if not is_transient_error(e):
+                    circuit_breaker.record_success()
+                    raise
+                circuit_breaker.record_failure()
+                error, delay = e, retry_policy.get_delay(attempt)
+            else:
+                circuit_breaker.record_success()
+                return result
+        else:
+            error = CircuitOpenError("Job controller is unavailable.")
+            delay = circuit_breaker.retry_after()
+
+        if attempt + 1 == retry_policy.max_attempts:
+            break
+        log.warning(
+            f"Job controller request failed ({error!r}), retrying in {delay:.1f}s."
+        )
+        retry_policy.sleep(delay)
+        if before_retry is not None and not isinstance(error, CircuitOpenError):
+            result = before_retry(error)
+            if result is not None:
+                return result
+    raise error
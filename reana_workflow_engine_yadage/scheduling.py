@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage critical-path-aware node submission."""
+
+import logging
+import re
+from typing import Dict, List
+
+import adage.dagstate as dagstate
+import networkx as nx
+from yadage.controllers import YadageController
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+SCATTER_INDEX_SUFFIX = re.compile(r"_\d+$")
+"""Suffix distinguishing the nodes of the same scattered step."""
+
+DEFAULT_NODE_DURATION = 1.0
+"""Estimated duration of nodes whose step did not run yet, in arbitrary units."""
+
+
+def get_step_name(nodeobj) -> str:
+    """Get the name of the step a node belongs to, shared by scattered nodes."""
+    name = nodeobj.task.metadata.get("name", nodeobj.name)
+    return SCATTER_INDEX_SUFFIX.sub("", name)
+
+
+class PrioritizingController(YadageController):
+    """Workflow controller submitting ready nodes along the critical path first.
+
+    Nodes are ranked by the estimated length of the longest path from them to
+    the end of the workflow. Nodes are estimated to last as long as the nodes
+    of the same step which already ran, and ``DEFAULT_NODE_DURATION``
+    otherwise, in which case the rank is the downstream depth of the node.
+    The rank is also passed to the backend as the ``priority`` workflow hint.
+
+    Path lengths are computed in one pass over the cached topological order
+    of the DAG, and only again once the DAG grew or a node finished.
+    """
+
+    def __init__(self, model, **kwargs):
+        """Initialize the controller of the given workflow."""
+        super().__init__(model, **kwargs)
+        self._step_durations: Dict[str, List[float]] = {}
+        self._step_names: Dict[str, str] = {}
+        self._untimed_nodes: List = []
+        self._topological_order: List[str] = []
+        self._topological_order_size = (0, 0)
+        self._path_lengths: Dict[str, float] = {}
+        self._path_lengths_outdated = True
+
+    def _get_step_name(self, nodeobj) -> str:
+        if nodeobj.identifier not in self._step_names:
+            self._step_names[nodeobj.identifier] = get_step_name(nodeobj)
+        return self._step_names[nodeobj.identifier]
+
+    def _record_durations(self) -> None:
+        """Record the duration of the submitted nodes which succeeded since last time."""
+        untimed_nodes = []
+        for nodeobj in self._untimed_nodes:
+            if not nodeobj.ready_by_time:
+                untimed_nodes.append(nodeobj)
+            elif dagstate.node_status(nodeobj):
+                duration = nodeobj.ready_by_time - nodeobj.submit_time
+                step_durations = self._step_durations.setdefault(
+                    self._get_step_name(nodeobj), []
+                )
+                step_durations.append(duration)
+                self._path_lengths_outdated = True
+        self._untimed_nodes = untimed_nodes
+
+    def _estimate_duration(self, nodeobj) -> float:
+        durations = self._step_durations.get(self._get_step_name(nodeobj))
+        if not durations:
+            return DEFAULT_NODE_DURATION
+        return max(sum(durations) / len(durations), DEFAULT_NODE_DURATION)
+
+    def _refresh_topological_order(self, dag) -> None:
+        size = (dag.number_of_nodes(), dag.number_of_edges())
+        if size != self._topological_order_size:
+            self._topological_order = list(nx.topological_sort(dag))
+            self._topological_order_size = size
+            self._path_lengths_outdated = True
+
+    def get_remaining_path_lengths(self, node_ids) -> Dict[str, float]:
+        """Estimate the longest path from the given nodes to the end of the DAG."""
+        dag = self.adageobj.dag
+        self._refresh_topological_order(dag)
+        if self._path_lengths_outdated or any(
+            node_id not in self._path_lengths for node_id in node_ids
+        ):
+            lengths = {}
+            for node_id in reversed(self._topological_order):
+                successors_length = max(
+                    (lengths[successor] for successor in dag.successors(node_id)),
+                    default=0.0,
+                )
+                nodeobj = dag.getNode(node_id)
+                lengths[node_id] = self._estimate_duration(nodeobj) + successors_length
+            self._path_lengths = lengths
+            self._path_lengths_outdated = False
+        return {node_id: self._path_lengths[node_id] for node_id in node_ids}
+
+    def submit_nodes(self, nodes) -> None:
+        """Submit nodes to the backend, the ones on longer paths first."""
+        if len(nodes) > 1:
+            self._record_durations()
+            lengths = self.get_remaining_path_lengths(
+                [nodeobj.identifier for nodeobj in nodes]
+            )
+            nodes = sorted(
+                nodes, key=lambda nodeobj: lengths[nodeobj.identifier], reverse=True
+            )
+            for nodeobj in nodes:
+                wflow_hints = nodeobj.task.metadata.setdefault("wflow_hints", {})
+                wflow_hints["priority"] = lengths[nodeobj.identifier]
+        super().submit_nodes(nodes)
+        self._untimed_nodes.extend(nodes)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage job status table."""
+
+import sys
+from typing import Union
+
+from .config import JobStatus
+
+
+def get_job_status(status: str) -> Union[JobStatus, str]:
+    """Get the shared member of ``JobStatus`` for a status string.
+
+    Unknown statuses are interned, so that they are shared as well.
+    """
+    try:
+        return JobStatus(status)
+    except ValueError:
+        return sys.intern(status)
+
+
+class JobStatusTable(dict):
+    """Mapping of job IDs to statuses, sharing one object per status.
+
+    Statuses received from the job controller are new strings for every
+    response. They are replaced by the members of ``JobStatus`` so that each
+    entry only costs a reference.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the table with the given statuses."""
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, job_id: str, status: str) -> None:
+        """Set the status of a job."""
+        super().__setitem__(job_id, get_job_status(status))
+
+    def setdefault(self, job_id: str, status: str) -> Union[JobStatus, str]:
+        """Set the status of a job, unless it is already known."""
+        return super().setdefault(job_id, get_job_status(status))
+
+    def update(self, *args, **kwargs) -> None:
+        """Set the statuses of several jobs."""
+        for job_id, status in dict(*args, **kwargs).items():
+            self[job_id] = status
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage timeline of the workflow jobs."""
+
+import csv
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import adage.dagstate as dagstate
+import networkx as nx
+
+from .config import LOGGING_MODULE
+
+log = logging.getLogger(LOGGING_MODULE)
+
+TIMELINE_EVENTS = ("ready", "submitted", "running", "terminal", "published")
+"""Events of the life of a node, in order."""
+
+TIMELINE_COLUMNS = (
+    ("node_id", "name", "job_id", "status")
+    + TIMELINE_EVENTS
+    + (
+        "wait_seconds",
+        "queue_seconds",
+        "run_seconds",
+        "publish_seconds",
+        "slack_seconds",
+        "critical",
+    )
+)
+"""Columns of the exported timeline."""
+
+CRITICAL_SLACK_SECONDS = 1e-6
+"""Slack under which a node is on the critical path, absorbing rounding errors."""
+
+
+def _get_node_status(nodeobj) -> str:
+    if dagstate.node_status(nodeobj):
+        return "finished"
+    if dagstate.node_ran_and_failed(nodeobj):
+        return "failed"
+    return str(nodeobj.state).lower()
+
+
+def _get_node_events(nodeobj) -> Dict[str, float]:
+    """Get the timestamps of the events of a node, except when it became ready.
+
+    Jobs run by the REANA backend record them on their proxy. Other nodes, e.g.
+    the pure publishing ones, only have the timestamps adage records.
+    """
+    timestamps = getattr(nodeobj.resultproxy, "timestamps", None)
+    if timestamps is not None:
+        events = dict(timestamps)
+    else:
+        events = {}
+        if nodeobj.submit_time:
+            events["submitted"] = nodeobj.submit_time
+        if nodeobj.ready_by_time:
+            events["terminal"] = events["published"] = nodeobj.ready_by_time
+    if "submitted" not in events and nodeobj.submit_time:
+        events["submitted"] = nodeobj.submit_time
+    return events
+
+
+def _get_finish_time(events: Dict[str, float]) -> Optional[float]:
+    return events.get("published", events.get("terminal"))
+
+
+def _get_duration(events: Dict[str, float], start: str, end: str) -> Optional[float]:
+    if start in events and end in events:
+        return events[end] - events[start]
+    return None
+
+
+def build_timeline(dag) -> List[Dict[str, Any]]:
+    """Build the timeline of the nodes of a workflow, in topological order.
+
+    A node is ready when it is defined and all its dependencies are published.
+    Its slack is how much later it could have finished without delaying the
+    end of the workflow, given the time the following nodes took from being
+    ready to being published. The nodes without slack form the critical path.
+    Times are in seconds since the first node was defined.
+    """
+    order = list(nx.topological_sort(dag))
+    events = {}
+    for node_id in order:
+        nodeobj = dag.getNode(node_id)
+        node_events = _get_node_events(nodeobj)
+        ready_at = nodeobj.define_time
+        for predecessor in dag.predecessors(node_id):
+            finished_at = _get_finish_time(events[predecessor])
+            if finished_at is None:
+                ready_at = None
+                break
+            ready_at = max(ready_at, finished_at)
+        if ready_at is not None:
+            node_events["ready"] = ready_at
+        events[node_id] = node_events
+
+    finish_times = {
+        node_id: _get_finish_time(node_events)
+        for node_id, node_events in events.items()
+        if "ready" in node_events and _get_finish_time(node_events) is not None
+    }
+    end = max(finish_times.values(), default=0.0)
+    latest_finish_times = {}
+    for node_id in reversed(order):
+        if node_id not in finish_times:
+            continue
+        latest_finish_times[node_id] = min(
+            (
+                latest_finish_times[successor]
+                - (finish_times[successor] - events[successor]["ready"])
+                for successor in dag.successors(node_id)
+                if successor in latest_finish_times
+            ),
+            default=end,
+        )
+
+    start = min((dag.getNode(node_id).define_time for node_id in order), default=0.0)
+    timeline = []
+    for node_id in order:
+        nodeobj = dag.getNode(node_id)
+        node_events = events[node_id]
+        jobproxy = getattr(nodeobj.resultproxy, "jobproxy", None) or {}
+        slack = None
+        if node_id in latest_finish_times:
+            slack = latest_finish_times[node_id] - finish_times[node_id]
+        row = {
+            "node_id": node_id,
+            "name": nodeobj.name,
+            "job_id": jobproxy.get("job_id"),
+            "status": _get_node_status(nodeobj),
+            "wait_seconds": _get_duration(node_events, "ready", "submitted"),
+            "queue_seconds": _get_duration(node_events, "submitted", "running"),
+            "run_seconds": _get_duration(node_events, "running", "terminal"),
+            "publish_seconds": _get_duration(node_events, "terminal", "published"),
+            "slack_seconds": slack,
+            "critical": slack is not None and slack <= CRITICAL_SLACK_SECONDS,
+        }
+        for event in TIMELINE_EVENTS:
+            row[event] = node_events[event] - start if event in node_events else None
+        timeline.append(row)
+    return timeline
+
+
+def summarize_critical_path(timeline: List[Dict[str, Any]]) -> str:
+    """Summarize where the time of the critical path went."""
+    critical_nodes = [row for row in timeline if row["critical"]]
+    totals = {
+        column: sum(row[column] or 0.0 for row in critical_nodes)
+        for column in (
+            "wait_seconds",
+            "queue_seconds",
+            "run_seconds",
+            "publish_seconds",
+        )
+    }
+    makespan = max(
+        (row["published"] or row["terminal"] or 0.0 for row in critical_nodes),
+        default=0.0,
+    )
+    return (
+        f"Critical path of {len(critical_nodes)} nodes over {makespan:.3f}s: "
+        f"{totals['wait_seconds']:.3f}s waiting for submission, "
+        f"{totals['queue_seconds']:.3f}s until seen running, "
+        f"{totals['run_seconds']:.3f}s until seen terminal, "
+        f"{totals['publish_seconds']:.3f}s until published."
+    )
+
+
+def write_timeline(timeline: List[Dict[str, Any]], path: str) -> None:
+    """Atomically write a timeline as CSV."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="") as timeline_file:
+        writer = csv.DictWriter(timeline_file, fieldnames=TIMELINE_COLUMNS)
+        writer.writeheader()
+        for row in timeline:
+            writer.writerow(
+                {
+                    column: round(value, 6) if isinstance(value, float) else value
+                    for column, value in row.items()
+                }
+            )
+    os.replace(tmp_path, path)
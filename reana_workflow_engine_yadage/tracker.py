@@ -7,32 +7,110 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """REANA-Workflow-Engine-yadage workflow state tracker."""
 
-import json
 import logging
-from typing import Dict, Generator
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import adage.dagstate as dagstate
 import adage.nodestate as nodestate
-import jq
 import networkx as nx
-from yadage.utils import WithJsonRefEncoder
 
 from reana_commons.publisher import WorkflowStatusPublisher
 
-from .config import LOGGING_MODULE, RunStatus
+from .config import (
+    JOB_STATUS_REFRESH_BACKOFF_FACTOR,
+    JOB_STATUS_REFRESH_MAX_INTERVAL_SECONDS,
+    JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS,
+    LOGGING_MODULE,
+    PROGRESS_BACKGROUND_PUBLISHING,
+    PROGRESS_DELTA_MESSAGES,
+    PROGRESS_MIN_PUBLISH_INTERVAL_SECONDS,
+    PROGRESS_SNAPSHOT_INTERVAL_SECONDS,
+    RunStatus,
+)
+from .metrics import (
+    DAG_DUMP_NODES,
+    DAG_DUMP_SECONDS,
+    PUBLISH_FAILURES,
+    PUBLISH_SECONDS,
+    TRACK_SECONDS,
+)
+from .publisher import CoalescingPublisher
+from .recording import RecordingPublisher, TrafficRecorder, record_workflow_dag
+from .timeline import build_timeline, summarize_critical_path, write_timeline
 
 log = logging.getLogger(LOGGING_MODULE)
 
+TERMINAL_NODE_STATES = ("finished", "failed")
+"""Progress states in which nodes do not change anymore."""
+
 
 class REANATracker:
     """REANA progress tracker for Yadage workflow."""
 
-    def __init__(self, identifier: str, publisher: WorkflowStatusPublisher):
-        """Init tracker."""
+    def __init__(
+        self,
+        identifier: str,
+        publisher: WorkflowStatusPublisher,
+        delta_messages: bool = PROGRESS_DELTA_MESSAGES,
+        background_publishing: bool = PROGRESS_BACKGROUND_PUBLISHING,
+        recorder: Optional[TrafficRecorder] = None,
+        timeline_path: Optional[str] = None,
+    ):
+        """Init tracker.
+
+        :param delta_messages: Whether to publish only the progress changes since
+            the previous message, with periodic full snapshots.
+        :param background_publishing: Whether to publish progress from a
+            background thread, coalescing the messages of close updates.
+        :param recorder: Recorder of the published messages, and of the shape of
+            the workflow once it is over.
+        :param timeline_path: Path to export the timeline of the workflow jobs
+            to once it is over.
+        """
         self.workflow_id = identifier
         self.publisher = publisher
+        self.recorder = recorder
+        self.timeline_path = timeline_path
+        if recorder is not None:
+            self.publisher = RecordingPublisher(publisher, recorder)
         self.progress_state = self._build_init_progress_state()
 
+        self._dag_view = self._build_init_dag_view()
+        self._dag_view_nodes: Dict[str, Dict] = {}
+        self._dag_view_pending_nodes: Set[str] = set()
+
+        self._topological_order: List[str] = []
+        self._topological_order_size = (0, 0)
+        self._active_nodes: List[str] = []
+        self._nodes_state: Dict[str, Tuple[str, Any]] = {}
+        self._nodes_count_by_state = self._build_init_nodes_count_by_state()
+        self._job_ids_by_state: Dict[str, Dict[str, None]] = {
+            state: {} for state in self._nodes_count_by_state
+        }
+        # job id lists of the progress state, rebuilt when their state changed
+        self._job_ids_lists_by_state: Dict[str, List[str]] = {
+            state: [] for state in self._nodes_count_by_state
+        }
+        self._job_ids_changed_states: Set[str] = set()
+
+        self.delta_messages = delta_messages
+        self._progress_sequence = 0
+        self._snapshot_requested = True
+        self._last_snapshot_at = 0.0
+        self._nodes_changed_since_publish: Set[str] = set()
+        self._dag_view_changed_nodes: Set[str] = set()
+        self._published_edges: Set[Tuple[str, str]] = set()
+
+        # guards the progress state shared with the background publisher
+        self._lock = threading.RLock()
+        self._background_publisher: Optional[CoalescingPublisher] = None
+        if background_publishing:
+            self._background_publisher = CoalescingPublisher(
+                self._publish_progress, PROGRESS_MIN_PUBLISH_INTERVAL_SECONDS
+            )
+
     def initialize(self, adageobj) -> None:
         """Get the progress state when workflow starts.
 
@@ -46,12 +124,13 @@ class REANATracker:
         Method is periodically called by Yadage package during the workflow execution,
         and also used within this tracker.
         """
-        current_progress_state = self._get_progress_state(adageobj)
-        log.debug(f"track, current progress state: {current_progress_state}")
+        with self._lock, TRACK_SECONDS.time():
+            current_progress_state = self._get_progress_state(adageobj)
+            log.debug("track, current progress state: %s", current_progress_state)
 
-        if self._workflow_progressed(current_progress_state):
-            log.debug("track, workflow's progress state changed. Updating...")
-            self._update_progress_state(current_progress_state)
+            if self._workflow_progressed(current_progress_state):
+                log.debug("track, workflow's progress state changed. Updating...")
+                self._update_progress_state(current_progress_state)
 
     def finalize(self, adageobj) -> None:
         """Update the progress state at the end of the execution.
@@ -61,10 +140,27 @@ class REANATracker:
         log.info(f"Finalizing the progress tracking for: {adageobj}")
 
         self.track(adageobj)
+        if self.recorder is not None:
+            record_workflow_dag(self.recorder, self._dag_view)
+        if self.timeline_path is not None:
+            self._export_timeline(adageobj)
 
         # needed to comment it here due to a hack in cli.py
         # self._publish_workflow_final_status()
 
+    def _export_timeline(self, adageobj) -> None:
+        try:
+            timeline = build_timeline(adageobj.dag)
+            write_timeline(timeline, self.timeline_path)
+        except Exception as e:
+            log.warning(f"Could not export the workflow timeline: {e!r}")
+            return
+        log.info(summarize_critical_path(timeline))
+
+    def request_progress_snapshot(self) -> None:
+        """Publish the full progress state in the next progress message."""
+        self._snapshot_requested = True
+
     def publish_workflow_running_status(self) -> None:
         """Send MQ to indicate running status for tracked workflow."""
         try:
@@ -78,6 +174,11 @@ class REANATracker:
 
     def publish_workflow_final_status(self) -> None:
         """Send MQ to indicate finished or failed status for the tracked workflow."""
+        if self._background_publisher:
+            # the final status must come after any pending progress message
+            self._background_publisher.close()
+            self._background_publisher = None
+
         if self._workflow_failed():
             log.info("Workflow failed. Publishing status...")
             self.publisher.publish_workflow_status(
@@ -109,78 +210,363 @@ class REANATracker:
     def _workflow_failed(self) -> bool:
         return self.progress_state.get("failed", {}).get("total", -1) != 0
 
+    def _should_publish_snapshot(self) -> bool:
+        if self._snapshot_requested:
+            return True
+        elapsed = time.monotonic() - self._last_snapshot_at
+        return elapsed >= PROGRESS_SNAPSHOT_INTERVAL_SECONDS
+
+    def _build_progress_delta(self) -> Dict:
+        """Build the progress changes since the previously published message."""
+        delta = {
+            status: {"total": self.progress_state[status]["total"]}
+            for status in ["failed", "total", "running", "finished"]
+        }
+        delta["nodes"] = [
+            {"id": node_id, "state": state, "job_id": job_id}
+            for node_id, (state, job_id) in (
+                (node_id, self._nodes_state[node_id])
+                for node_id in self._nodes_changed_since_publish
+                if node_id in self._nodes_state
+            )
+        ]
+        delta["engine_specific"] = {
+            "dag": {
+                "edges": self._get_unpublished_dag_edges(),
+                "nodes": [
+                    self._dag_view_nodes[node_id]
+                    for node_id in self._dag_view_changed_nodes
+                    if node_id in self._dag_view_nodes
+                ],
+            }
+        }
+        return delta
+
+    def _get_unpublished_dag_edges(self) -> List[List[str]]:
+        edges = self._dag_view["dag"]["edges"]
+        if len(edges) == len(self._published_edges):
+            return []
+        return [edge for edge in edges if tuple(edge) not in self._published_edges]
+
+    def _build_progress_message(self) -> Dict:
+        if not self.delta_messages:
+            # the changes are only needed to build deltas
+            self._nodes_changed_since_publish = set()
+            self._dag_view_changed_nodes = set()
+            return {"progress": self.progress_state}
+
+        self._progress_sequence += 1
+        if self._should_publish_snapshot():
+            progress = {**self.progress_state, "snapshot": True}
+            self._snapshot_requested = False
+            self._last_snapshot_at = time.monotonic()
+        else:
+            progress = {**self._build_progress_delta(), "snapshot": False}
+        progress["sequence"] = self._progress_sequence
+
+        self._nodes_changed_since_publish = set()
+        self._dag_view_changed_nodes = set()
+        if len(self._dag_view["dag"]["edges"]) != len(self._published_edges):
+            self._published_edges = {
+                tuple(edge) for edge in self._dag_view["dag"]["edges"]
+            }
+        return {"progress": progress}
+
+    @staticmethod
+    def _copy_progress_message(message: Dict) -> Dict:
+        """Copy the parts of a progress message updated by further tracking."""
+        progress = dict(message["progress"])
+        dag = progress.get("engine_specific", {}).get("dag")
+        if dag:
+            progress["engine_specific"] = {
+                "dag": {
+                    "edges": list(dag["edges"]),
+                    "nodes": [dict(node) for node in dag["nodes"]],
+                }
+            }
+        return {"progress": progress}
+
     def _publish_progress(self) -> None:
-        message = {"progress": self.progress_state}
+        with self._lock:
+            message = self._build_progress_message()
+            if self._background_publisher:
+                message = self._copy_progress_message(message)
         status_running = int(RunStatus.running)
         try:
             log.debug("Publishing workflow progress state to MQ...")
-            self.publisher.publish_workflow_status(
-                self.workflow_id,
-                status=status_running,
-                logs=None,
-                message=message,
-            )
+            with PUBLISH_SECONDS.time():
+                self.publisher.publish_workflow_status(
+                    self.workflow_id,
+                    status=status_running,
+                    logs=None,
+                    message=message,
+                )
         except Exception as e:
+            PUBLISH_FAILURES.increment()
             log.error(f"Workflow status publish failed: {e}")
+            # consumers may have missed changes, send everything next time
+            self.request_progress_snapshot()
             log.error(
                 f"Status: workflow - {self.workflow_id} "
                 f"status - {status_running} message - {message}"
             )
 
     @staticmethod
-    def _dump_workflow_dag(adageobj) -> Dict:
-        serialized = json.dumps(adageobj.json(), cls=WithJsonRefEncoder, sort_keys=True)
-        purejson = json.loads(serialized)
-        return jq.jq(
-            "{dag: {edges: .dag.edges, nodes: \
-        [.dag.nodes[]|{metadata: {name: .task.metadata.name}, id: .id, \
-        jobid: .proxy.proxydetails.jobproxy}]}}"
-        ).transform(purejson)
+    def _build_init_dag_view() -> Dict:
+        return {"dag": {"edges": [], "nodes": []}}
 
-    def _get_progress_state(self, adageobj) -> Dict:
-        progress = self._build_init_progress_state()
+    @staticmethod
+    def _get_node_jobid(nodeobj) -> Any:
+        return getattr(nodeobj.resultproxy, "jobproxy", None)
 
-        for node in self._get_nodes_state(adageobj):
-            status = node["state"]
-            progress[status]["total"] += 1
+    @classmethod
+    def _build_dag_view_node(cls, nodeobj) -> Dict:
+        return {
+            "metadata": {"name": nodeobj.task.metadata["name"]},
+            "id": nodeobj.identifier,
+            "jobid": cls._get_node_jobid(nodeobj),
+        }
 
-            if status in ["running", "finished", "failed"]:
-                job_id = node["job_id"]
-                progress[status]["job_ids"].append(job_id)
+    @classmethod
+    def _dump_workflow_dag(cls, adageobj) -> Dict:
+        """Extract the engine specific view of the whole workflow DAG."""
+        dag = adageobj.dag
+        with DAG_DUMP_SECONDS.time():
+            dag_view = {
+                "dag": {
+                    "edges": [list(edge) for edge in dag.edges()],
+                    "nodes": [
+                        cls._build_dag_view_node(dag.getNode(node_id))
+                        for node_id in dag.nodes()
+                    ],
+                }
+            }
+        DAG_DUMP_NODES.set(len(dag_view["dag"]["nodes"]))
+        return dag_view
 
-        progress["engine_specific"] = self._dump_workflow_dag(adageobj)
+    @staticmethod
+    def _is_node_jobid_final(nodeobj, jobid: Any) -> bool:
+        if nodeobj.ready():
+            return True
+        return isinstance(jobid, dict) and jobid.get("job_id") is not None
+
+    def _reset_workflow_dag(self, adageobj) -> None:
+        """Rebuild the DAG view from a full dump of the workflow."""
+        self._dag_view = self._dump_workflow_dag(adageobj)
+        self._dag_view_nodes = {
+            node["id"]: node for node in self._dag_view["dag"]["nodes"]
+        }
+        self._dag_view_changed_nodes = set(self._dag_view_nodes)
+        self.request_progress_snapshot()
+        self._dag_view_pending_nodes = {
+            node_id
+            for node_id in self._dag_view_nodes
+            if not self._is_node_jobid_final(
+                adageobj.dag.getNode(node_id), self._dag_view_nodes[node_id]["jobid"]
+            )
+        }
+
+    def _add_dag_view_node(self, nodeobj) -> None:
+        node = self._build_dag_view_node(nodeobj)
+        self._dag_view["dag"]["nodes"].append(node)
+        self._dag_view_nodes[nodeobj.identifier] = node
+        self._dag_view_changed_nodes.add(nodeobj.identifier)
+        if not self._is_node_jobid_final(nodeobj, node["jobid"]):
+            self._dag_view_pending_nodes.add(nodeobj.identifier)
+
+    def _update_workflow_dag(self, adageobj) -> Dict:
+        """Update the engine specific view of the workflow DAG.
+
+        Only the nodes and edges added since the previous update are added to the
+        view, and only the job ids of nodes that were not yet submitted or still
+        being submitted are refreshed.
+        """
+        dag = adageobj.dag
+        if dag.number_of_nodes() != len(self._dag_view_nodes):
+            if any(node_id not in dag for node_id in self._dag_view_nodes):
+                # nodes were removed, e.g. by a reset, start over
+                self._reset_workflow_dag(adageobj)
+                return self._dag_view
+            for node_id in dag.nodes():
+                if node_id not in self._dag_view_nodes:
+                    self._add_dag_view_node(dag.getNode(node_id))
+
+        dag_view = self._dag_view["dag"]
+        if dag.number_of_edges() != len(dag_view["edges"]):
+            dag_view["edges"] = [list(edge) for edge in dag.edges()]
+
+        for node_id in list(self._dag_view_pending_nodes):
+            nodeobj = dag.getNode(node_id)
+            jobid = self._get_node_jobid(nodeobj)
+            if self._dag_view_nodes[node_id]["jobid"] != jobid:
+                self._dag_view_nodes[node_id]["jobid"] = jobid
+                self._dag_view_changed_nodes.add(node_id)
+            if self._is_node_jobid_final(nodeobj, jobid):
+                self._dag_view_pending_nodes.discard(node_id)
+
+        return self._dag_view
+
+    def _get_progress_state(self, adageobj) -> Dict:
+        self._update_nodes_state(adageobj)
+
+        for state in self._job_ids_changed_states:
+            self._job_ids_lists_by_state[state] = list(self._job_ids_by_state[state])
+        self._job_ids_changed_states.clear()
+        progress = {
+            state: {
+                "total": count,
+                "job_ids": self._job_ids_lists_by_state[state],
+            }
+            for state, count in self._nodes_count_by_state.items()
+        }
+        progress["engine_specific"] = self._update_workflow_dag(adageobj)
         return progress
 
     def _update_progress_state(self, progress: Dict) -> None:
         self.progress_state = progress
-        self._publish_progress()
+        if self._background_publisher:
+            self._background_publisher.schedule()
+        else:
+            self._publish_progress()
 
     @staticmethod
-    def _get_nodes_state(adageobj) -> Generator[Dict, None, None]:
+    def _build_init_nodes_count_by_state() -> Dict[str, int]:
+        return {"failed": 0, "total": 0, "running": 0, "finished": 0}
+
+    def _reset_nodes_state(self) -> None:
+        self._nodes_state = {}
+        self._nodes_count_by_state = self._build_init_nodes_count_by_state()
+        self._job_ids_by_state = {state: {} for state in self._nodes_count_by_state}
+        self._job_ids_changed_states = set(self._nodes_count_by_state)
+
+    def _refresh_topological_order(self, dag) -> None:
+        """Recompute the topological order of the DAG if its size changed.
+
+        Nodes which are pure publishing or which reached a terminal state are not
+        tracked anymore.
+        """
+        size = (dag.number_of_nodes(), dag.number_of_edges())
+        if size == self._topological_order_size:
+            return
+
+        if any(node_id not in dag for node_id in self._nodes_state):
+            # nodes were removed, e.g. by a reset, account them all again
+            self._reset_nodes_state()
+            self.request_progress_snapshot()
+        self._topological_order = list(nx.topological_sort(dag))
+        self._topological_order_size = size
+        self._active_nodes = [
+            node_id
+            for node_id in self._topological_order
+            if not self._is_pure_publishing(dag.getNode(node_id))
+            and self._nodes_state.get(node_id, (None,))[0] not in TERMINAL_NODE_STATES
+        ]
+
+    def _set_node_state(self, node_id: str, state: str, job_id: Any) -> None:
+        previous_state, previous_job_id = self._nodes_state.get(node_id, (None, None))
+        if previous_state is not None:
+            self._nodes_count_by_state[previous_state] -= 1
+            self._job_ids_by_state[previous_state].pop(previous_job_id, None)
+            self._job_ids_changed_states.add(previous_state)
+        self._nodes_count_by_state[state] += 1
+        # jobs being submitted in the background have no id yet
+        if state != "total" and job_id:
+            self._job_ids_by_state[state][job_id] = None
+            self._job_ids_changed_states.add(state)
+        self._nodes_state[node_id] = (state, job_id)
+        self._nodes_changed_since_publish.add(node_id)
+
+    def _update_nodes_state(self, adageobj) -> None:
+        """Update the state accounting of the nodes which are not terminal yet."""
         dag = adageobj.dag
-        for node in nx.topological_sort(dag):
-            nodeobj = dag.getNode(node)
-            is_pure_publishing = nodeobj.task.metadata["wflow_hints"].get(
-                "is_purepub", False
-            )
-            if is_pure_publishing:
-                continue
-
-            if nodeobj.state == nodestate.RUNNING:
-                state = "running"
-                job_id = nodeobj.resultproxy.jobproxy["job_id"]
-            elif dagstate.node_status(nodeobj):
-                state = "finished"
-                job_id = nodeobj.resultproxy.jobproxy["job_id"]
-            elif dagstate.node_ran_and_failed(nodeobj):
-                state = "failed"
-                job_id = nodeobj.resultproxy.jobproxy["job_id"]
-            else:
-                state = "total"
-                job_id = None
-
-            node_state = {
-                "state": state,
-                "job_id": job_id,
-            }
-            yield node_state
+        self._refresh_topological_order(dag)
+
+        active_nodes = []
+        for node_id in self._active_nodes:
+            state, job_id = self._get_node_state(dag.getNode(node_id))
+            if self._nodes_state.get(node_id) != (state, job_id):
+                self._set_node_state(node_id, state, job_id)
+            if state not in TERMINAL_NODE_STATES:
+                active_nodes.append(node_id)
+        self._active_nodes = active_nodes
+
+    @staticmethod
+    def _is_pure_publishing(nodeobj) -> bool:
+        return nodeobj.task.metadata["wflow_hints"].get("is_purepub", False)
+
+    @staticmethod
+    def _get_node_state(nodeobj) -> Tuple[str, Any]:
+        if nodeobj.state == nodestate.RUNNING:
+            return "running", nodeobj.resultproxy.jobproxy["job_id"]
+        elif dagstate.node_status(nodeobj):
+            return "finished", nodeobj.resultproxy.jobproxy["job_id"]
+        elif dagstate.node_ran_and_failed(nodeobj):
+            return "failed", nodeobj.resultproxy.jobproxy["job_id"]
+        return "total", None
+
+
+class AdaptiveIntervalTracker:
+    """Adapt the interval between two job status refreshes to the workflow progress.
+
+    This tracker, registered after the ``REANATracker`` it reads progress
+    from, sets the refresh interval of the backend without delaying the adage
+    loop. The interval is halved when the workflow progressed or is close to
+    completion, and backs off up to the maximum interval otherwise. The adage
+    loop ticks more often than the refresh interval, so the ticks in between
+    only read the statuses last fetched.
+    """
+
+    def __init__(
+        self,
+        progress_tracker: REANATracker,
+        set_interval: Callable[[float], None],
+        min_interval: float = JOB_STATUS_REFRESH_MIN_INTERVAL_SECONDS,
+        max_interval: float = JOB_STATUS_REFRESH_MAX_INTERVAL_SECONDS,
+    ):
+        """Init tracker.
+
+        :param set_interval: Function setting the refresh interval of the backend.
+        """
+        self.progress_tracker = progress_tracker
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self._set_interval = set_interval
+        self._last_counts: Optional[Tuple[int, ...]] = None
+
+    def _get_counts(self) -> Tuple[int, ...]:
+        progress = self.progress_tracker.progress_state
+        return tuple(
+            progress[state]["total"]
+            for state in ["total", "running", "finished", "failed"]
+        )
+
+    def _is_near_completion(self, counts: Tuple[int, ...]) -> bool:
+        """Check whether all remaining nodes are a few running jobs."""
+        pending, running, finished, failed = counts
+        nodes = pending + running + finished + failed
+        return pending == 0 and 0 < running <= max(1, nodes // 10)
+
+    def _get_next_interval(self) -> float:
+        counts = self._get_counts()
+        progressed = counts != self._last_counts
+        self._last_counts = counts
+        if progressed or self._is_near_completion(counts):
+            return max(self.min_interval, self.interval / 2)
+        return min(self.max_interval, self.interval * JOB_STATUS_REFRESH_BACKOFF_FACTOR)
+
+    def initialize(self, adageobj) -> None:
+        """Record the initial progress of the workflow."""
+        self._last_counts = self._get_counts()
+        self._set_interval(self.interval)
+
+    def track(self, adageobj) -> None:
+        """Adapt the refresh interval to the progress since the previous tick."""
+        interval = self._get_next_interval()
+        if interval != self.interval:
+            log.debug(f"Refreshing job statuses every {interval}s.")
+            self.interval = interval
+            self._set_interval(interval)
+
+    def finalize(self, adageobj) -> None:
+        """Nothing to do at the end of the workflow execution."""
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+"""REANA-Workflow-Engine-yadage workflow visualization."""
+
+import logging
+import os
+import subprocess
+import time
+
+from .config import (
+    LOGGING_MODULE,
+    WORKFLOW_VISUALIZATION_MAX_NODES,
+    WORKFLOW_VISUALIZATION_TIMEOUT_SECONDS,
+)
+
+log = logging.getLogger(LOGGING_MODULE)
+
+VISUALIZATION_FORMATS = ("png", "pdf")
+"""Formats the workflow graph is rendered to, like ``yadage`` does."""
+
+
+def visualize_workflow(
+    workflow,
+    metadir: str,
+    max_nodes: int = WORKFLOW_VISUALIZATION_MAX_NODES,
+    timeout: float = WORKFLOW_VISUALIZATION_TIMEOUT_SECONDS,
+) -> bool:
+    """Render the provenance graph of a finished workflow in its meta directory.
+
+    This replaces ``YadageSteering.visualize``, skipping workflows with more
+    than ``max_nodes`` nodes and rendering with ``dot`` in subprocesses that
+    are killed once ``timeout`` seconds are spent.
+
+    :return: Whether the workflow graph was rendered in all formats.
+    """
+    nodes = len(workflow.dag.nodes())
+    if max_nodes and nodes > max_nodes:
+        log.info(
+            f"Not visualizing the workflow, it has {nodes} nodes "
+            f"(limit: {max_nodes})."
+        )
+        return False
+
+    deadline = time.monotonic() + timeout
+    try:
+        from yadage.visualize import provdotgraph
+
+        dot_path = os.path.join(metadir, "yadage_workflow_instance.dot")
+        with open(dot_path, "w") as dot_file:
+            dot_file.write(provdotgraph(workflow, subcluster=True).to_string())
+
+        for vizformat in VISUALIZATION_FORMATS:
+            output_path = os.path.join(metadir, f"yadage_workflow_instance.{vizformat}")
+            with open(output_path, "w") as output_file:
+                subprocess.run(
+                    ["dot", f"-T{vizformat}", dot_path],
+                    stdout=output_file,
+                    timeout=max(0, deadline - time.monotonic()),
+                    check=True,
+                )
+    except subprocess.TimeoutExpired:
+        os.remove(output_path)
+        log.warning(
+            f"Workflow visualization took more than {timeout}s, it was aborted."
+        )
+        return False
+    except Exception as e:
+        log.error(f"Workflow visualization failed: {e}")
+        return False
+    return True
@@ -89,6 +89,8 @@ setup(
         "console_scripts": [
             "run-yadage-workflow="
             "reana_workflow_engine_yadage.cli:run_yadage_workflow",
+            "replay-yadage-workflow="
+            "reana_workflow_engine_yadage.replay:replay_workflow_command",
         ]
     },
     extras_require=extras_require,
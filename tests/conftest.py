@@ -10,4 +10,192 @@
 
 from __future__ import absolute_import, print_function
 
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import adage.nodestate as nodestate
 import pytest
+
+
+@pytest.fixture
+def external_backend():
+    """ExternalBackend talking to a mocked job controller client."""
+    from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+
+    with patch(
+        "reana_workflow_engine_yadage.externalbackend.RJC_API_Client",
+        return_value=MagicMock(),
+    ):
+        yield ExternalBackend()
+
+
+class FakeGetJobsFuture:
+    """Bravado future of the job controller jobs listing.
+
+    The job controller answers ``{"jobs": {<job id>: <job>}}``, which does not
+    validate against the list of jobs declared by its specification, so the
+    unmarshalled result cannot be used.
+    """
+
+    def __init__(self, jobs):
+        self._body = {"jobs": jobs}
+
+    def result(self, timeout=None):
+        from jsonschema.exceptions import ValidationError
+
+        raise ValidationError(f"{self._body!r} is not of type 'array'")
+
+    def response(self, timeout=None, fallback_result=None, exceptions_to_catch=()):
+        try:
+            result = self.result(timeout)
+        except exceptions_to_catch:
+            result = fallback_result
+        return SimpleNamespace(
+            result=result,
+            incoming_response=SimpleNamespace(status_code=200, json=lambda: self._body),
+        )
+
+
+@pytest.fixture
+def get_jobs_future():
+    """Build the bravado future of the job controller jobs listing."""
+    return FakeGetJobsFuture
+
+
+class FakeJobController:
+    """In-process job controller client with injectable failures.
+
+    It implements the ``JobControllerAPIClient`` calls used by the backend.
+    ``failures`` holds the errors to raise on the next requests, ``None`` for
+    requests which succeed. Submissions raising ``lost_response_error`` create
+    their job before failing, like a request whose response was lost.
+    """
+
+    def __init__(self):
+        from reana_commons.job_utils import serialise_job_command
+
+        self._serialise_job_command = serialise_job_command
+        self.jobs = {}
+        self.failures = []
+        self.lost_response_error = None
+        self.requests = 0
+        self._client = MagicMock()
+        self._client.jobs.get_jobs.side_effect = self._get_jobs
+
+    def _maybe_fail(self):
+        self.requests += 1
+        if self.failures:
+            error = self.failures.pop(0)
+            if error is not None:
+                raise error
+
+    def submit(self, image="", cmd="", job_name="", **kwargs):
+        if self.lost_response_error is not None:
+            self._create_job(image, cmd, job_name)
+            error, self.lost_response_error = self.lost_response_error, None
+            raise error
+        self._maybe_fail()
+        return {"job_id": self._create_job(image, cmd, job_name)}
+
+    def _create_job(self, image, cmd, job_name):
+        job_id = f"job-{len(self.jobs) + 1}"
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "docker_img": image.strip(),
+            "cmd": self._serialise_job_command(cmd),
+            "job_name": job_name,
+            "status": "running",
+        }
+        return job_id
+
+    def check_status(self, job_id):
+        self._maybe_fail()
+        return {"status": self.jobs[job_id]["status"]}
+
+    def _get_jobs(self):
+        self._maybe_fail()
+        return FakeGetJobsFuture(dict(self.jobs))
+
+
+@pytest.fixture
+def fake_job_controller():
+    """Fake job controller client."""
+    return FakeJobController()
+
+
+@pytest.fixture
+def resilient_backend(external_backend, fake_job_controller):
+    """ExternalBackend talking to a fake job controller, without sleeping."""
+    from reana_workflow_engine_yadage.resilience import CircuitBreaker, RetryPolicy
+
+    external_backend.rjc_api_client = fake_job_controller
+    external_backend.retry_policy = RetryPolicy(
+        max_attempts=3, base_delay=1, max_delay=4, sleep=MagicMock(), jitter=lambda: 1
+    )
+    external_backend.circuit_breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=30
+    )
+    external_backend._jobs_statuses_refresh_interval = 0
+    return external_backend
+
+
+class FakeTask:
+    """Minimal yadage task exposing the metadata used by the tracker."""
+
+    def __init__(self, name, is_purepub=False):
+        self.metadata = {"name": name, "wflow_hints": {"is_purepub": is_purepub}}
+
+    def json(self):
+        return {"metadata": self.metadata, "type": "fake_task"}
+
+
+class FakeWorkflow:
+    """Minimal adage workflow object made of FakeTask nodes."""
+
+    def __init__(self):
+        from adage.graph import AdageDAG
+
+        self.dag = AdageDAG()
+        self.rules = []
+        self.applied_rules = []
+
+    def add_node(self, name, depends_on=None, is_purepub=False):
+        from adage.node import Node
+
+        nodeobj = Node(name, FakeTask(name, is_purepub=is_purepub))
+        self.dag.addNode(nodeobj, depends_on=depends_on)
+        return nodeobj
+
+    @staticmethod
+    def submit_node(nodeobj, job_id):
+        from packtivity.asyncbackends import ExternalAsyncProxy
+
+        nodeobj.resultproxy = ExternalAsyncProxy(
+            jobproxy={"job_id": job_id}, spec={}, statedata={}, pardata={}
+        )
+        nodeobj.submit_time = time.time()
+
+    @staticmethod
+    def set_node_state(nodeobj, state):
+        nodeobj._state = state
+        if state in (nodestate.SUCCESS, nodestate.FAILED):
+            nodeobj.ready_by_time = time.time()
+
+    def json(self):
+        from adage.serialize import node_to_json, obj_to_json
+
+        def json_or_nil(obj):
+            return None if obj is None else obj.json()
+
+        return obj_to_json(
+            self,
+            json_or_nil,
+            lambda nodeobj: node_to_json(nodeobj, json_or_nil, json_or_nil),
+        )
+
+
+@pytest.fixture
+def workflow():
+    """Empty synthetic adage workflow."""
+    return FakeWorkflow()
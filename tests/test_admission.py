@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage admission control tests."""
+
+from reana_workflow_engine_yadage.admission import AdmissionController, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 100
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_admits_within_in_flight_limit():
+    clock = FakeClock()
+    admission = AdmissionController(max_in_flight=2, clock=clock)
+    for item in range(4):
+        admission.enqueue(item)
+    assert admission.admit() == [0, 1]
+    assert admission.admit() == []
+
+    clock.now = 10
+    admission.release()
+    assert admission.admit() == [2]
+    assert admission.stats() == {
+        "queue_depth": 1,
+        "max_queue_depth": 4,
+        "in_flight": 2,
+        "admitted": 3,
+        "mean_wait_seconds": 10 / 3,
+        "max_wait_seconds": 10,
+    }
+
+
+def test_admits_within_rate():
+    clock = FakeClock()
+    admission = AdmissionController(rate=1, burst=2, clock=clock)
+    for item in range(4):
+        admission.enqueue(item)
+    assert admission.admit() == [0, 1]
+    clock.now = 1
+    assert admission.admit() == [2]
+    assert admission.stats()["in_flight"] == 3
+
+
+def test_admits_by_decreasing_priority():
+    admission = AdmissionController(max_in_flight=1, clock=FakeClock())
+    admission.enqueue("running")
+    assert admission.admit() == ["running"]
+    for item, priority in [("leaf", 1), ("other leaf", 1), ("critical", 4)]:
+        admission.enqueue(item, priority)
+
+    admitted = []
+    for _ in range(3):
+        admission.release()
+        admitted += admission.admit()
+    assert admitted == ["critical", "leaf", "other leaf"]
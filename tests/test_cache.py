@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage result cache tests."""
+
+import pytest
+
+from reana_workflow_engine_yadage.cache import ResultCache
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "inputs").mkdir()
+    (tmp_path / "inputs" / "data.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "step").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def cache(workspace):
+    return ResultCache(str(workspace / "index.json"), max_entries=2)
+
+
+def _get_key(cache, workspace, **job):
+    job_request_body = {"workflow_uuid": "1", "image": "alpine", "cmd": "run", **job}
+    parameters = {"data": str(workspace / "inputs" / "data.csv"), "n": 1}
+    return cache.get_key(job_request_body, parameters, [str(workspace / "step")])
+
+
+def test_key_depends_on_job_and_inputs(cache, workspace):
+    key = _get_key(cache, workspace)
+    assert _get_key(cache, workspace, workflow_uuid="2") == key
+    assert _get_key(cache, workspace, image="alpine:3") != key
+
+    (workspace / "inputs" / "data.csv").write_text("a,b\n1,3\n")
+    assert _get_key(cache, workspace) != key
+
+
+def test_key_depends_on_input_directories(cache, workspace):
+    job_request_body = {"image": "alpine", "cmd": "run"}
+    parameters = [str(workspace / "inputs")]
+    key = cache.get_key(job_request_body, parameters, [])
+    (workspace / "inputs" / "more.csv").write_text("c\n")
+    assert cache.get_key(job_request_body, parameters, []) != key
+
+
+def test_get_and_put(cache, workspace):
+    workdirs = [str(workspace / "step")]
+    assert cache.get("key") is None
+    cache.put("key", "job-1", workdirs)
+    assert cache.get("key")["job_id"] == "job-1"
+
+    reloaded = ResultCache(cache.index_path, max_entries=2)
+    assert reloaded.get("key")["job_id"] == "job-1"
+
+
+def test_get_drops_entries_without_results(cache, workspace):
+    cache.put("key", "job-1", [str(workspace / "missing")])
+    assert cache.get("key") is None
+    assert ResultCache(cache.index_path, max_entries=2).get("key") is None
+
+
+def test_put_evicts_least_recently_used(cache, workspace):
+    for name in ("first", "second", "third"):
+        (workspace / name).mkdir()
+    cache.put("first", "job-1", [str(workspace / "first")])
+    cache.put("second", "job-2", [str(workspace / "second")])
+    cache.get("first")
+    cache.put("third", "job-3", [str(workspace / "third")])
+
+    assert cache.get("second") is None
+    assert cache.get("first")["job_id"] == "job-1"
+    assert cache.get("third")["job_id"] == "job-3"
+
+
+def test_work_directory_holds_a_single_entry(cache, workspace):
+    workdirs = [str(workspace / "step")]
+    cache.put("inputs-a", "job-1", workdirs)
+    # a job with other inputs is submitted and writes to the same directory
+    cache.invalidate(workdirs)
+    assert cache.get("inputs-a") is None
+
+    cache.put("inputs-a", "job-1", workdirs)
+    cache.put("inputs-b", "job-2", workdirs)
+    assert cache.get("inputs-a") is None
+    assert cache.get("inputs-b")["job_id"] == "job-2"
+
+
+def test_get_drops_entries_with_changed_results(cache, workspace):
+    workdirs = [str(workspace / "step")]
+    (workspace / "step" / "output.txt").write_text("1")
+    cache.put("key", "job-1", workdirs)
+    assert cache.get("key")["job_id"] == "job-1"
+
+    (workspace / "step" / "output.txt").write_text("12")
+    assert cache.get("key") is None
+
+
+def test_key_ignores_paths_outside_of_workspace(cache, workspace, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("cvmfs")
+    (outside / "data.csv").write_text("1\n")
+    job_request_body = {"image": "alpine", "cmd": "run"}
+    parameters = {"data": str(outside / "data.csv"), "root": str(workspace)}
+    key = cache.get_key(job_request_body, parameters, [])
+    (outside / "data.csv").write_text("2\n")
+    (workspace / "inputs" / "more.csv").write_text("c\n")
+    assert cache.get_key(job_request_body, parameters, []) == key
+
+
+def test_unreadable_index_is_ignored(workspace):
+    (workspace / "index.json").write_text("{not json")
+    cache = ResultCache(str(workspace / "index.json"), max_entries=2)
+    assert cache.get("key") is None
@@ -44,3 +44,496 @@ class TestExternalBackend:
         from reana_workflow_engine_yadage.externalbackend import ExternalBackend
 
         assert ExternalBackend._get_resources(input_parameters) == final_parameters
+
+    @staticmethod
+    def _build_proxy(job_id: str):
+        from reana_workflow_engine_yadage.externalbackend import ReanaExternalProxy
+
+        return ReanaExternalProxy(
+            jobproxy={"job_id": job_id}, spec={}, pardata=None, statedata=None
+        )
+
+    def test_get_state_refreshes_pending_jobs_in_bulk(
+        self, external_backend, get_jobs_future
+    ):
+        rjc_api_client = external_backend.rjc_api_client
+        rjc_api_client._client.jobs.get_jobs.return_value = get_jobs_future(
+            {
+                "1": {"job_id": "1", "status": "running"},
+                "2": {"job_id": "2", "status": "finished"},
+            }
+        )
+        external_backend.jobs_statuses = {"1": "created", "2": "created"}
+
+        assert not external_backend.ready(self._build_proxy("1"))
+        assert external_backend.ready(self._build_proxy("2"))
+        assert external_backend.successful(self._build_proxy("2"))
+
+        rjc_api_client._client.jobs.get_jobs.assert_called_once()
+        rjc_api_client.check_status.assert_not_called()
+
+    def test_get_state_falls_back_to_per_job_requests(self, external_backend, caplog):
+        rjc_api_client = external_backend.rjc_api_client
+        rjc_api_client._client.jobs.get_jobs.side_effect = Exception("Not found")
+        rjc_api_client.check_status.return_value = {"status": "failed"}
+
+        proxy = self._build_proxy("1")
+        assert external_backend.ready(proxy)
+        assert not external_backend.successful(proxy)
+        assert not external_backend._bulk_status_supported
+
+        rjc_api_client.check_status.assert_called_once_with("1")
+        assert "falling back to one request per job" in caplog.text
+
+    def test_get_state_reuses_recently_refreshed_statuses(
+        self, external_backend, get_jobs_future
+    ):
+        rjc_api_client = external_backend.rjc_api_client
+        rjc_api_client._client.jobs.get_jobs.return_value = get_jobs_future(
+            {"1": {"job_id": "1", "status": "running"}}
+        )
+
+        proxy = self._build_proxy("1")
+        assert not external_backend.ready(proxy)
+        assert not external_backend.successful(proxy)
+
+        rjc_api_client._client.jobs.get_jobs.assert_called_once()
+
+    def test_polled_statuses_do_not_override_pushed_terminal_ones(
+        self, external_backend, get_jobs_future
+    ):
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        def get_jobs():
+            # the job finishes while its status is being polled
+            external_backend._on_job_status_event("1", "finished")
+            return get_jobs_future({"1": {"job_id": "1", "status": "running"}})
+
+        external_backend.rjc_api_client._client.jobs.get_jobs.side_effect = get_jobs
+        external_backend.jobs_statuses = {"1": JobStatus.created}
+        external_backend._refresh_jobs_statuses("1")
+        assert external_backend.jobs_statuses["1"] == JobStatus.finished
+
+    def test_job_status_events_update_statuses(self, external_backend):
+        from reana_workflow_engine_yadage.consumer import QueueJobStatusConsumer
+
+        consumer = QueueJobStatusConsumer()
+        external_backend.job_status_consumer = consumer
+        consumer.start(external_backend._on_job_status_event)
+        external_backend.jobs_statuses = {"1": "created", "2": "failed"}
+        external_backend._jobs_statuses_refresh_interval = float("inf")
+
+        consumer.events.put({"job_id": "1", "status": "finished"})
+        consumer.events.put({"job_id": "2", "status": "running"})
+        consumer.events.put({"job_id": "3", "status": "running"})
+        consumer.events.put({"malformed": "event"})
+        consumer.stop()
+
+        assert external_backend.successful(self._build_proxy("1"))
+        assert external_backend.jobs_statuses["2"] == "failed"
+        # late events of jobs which are not tracked anymore are ignored
+        assert "3" not in external_backend.jobs_statuses
+        external_backend.rjc_api_client.check_status.assert_not_called()
+
+    def test_job_status_events_pushed_while_submitting_are_kept(self, external_backend):
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        def submit_fast_job(**job_request_body):
+            external_backend._on_job_status_event("1", "running")
+            external_backend._on_job_status_event("1", "finished")
+            external_backend._on_job_status_event("1", "running")
+            return {"job_id": "1"}
+
+        external_backend.rjc_api_client.submit.side_effect = submit_fast_job
+        external_backend._submit_job({"job_name": "fast"})
+        assert external_backend.jobs_statuses["1"] == JobStatus.finished
+        assert not external_backend._early_statuses
+
+        # late statuses of evicted jobs are ignored
+        external_backend._evict_job("1")
+        external_backend._on_job_status_event("1", "finished")
+        assert "1" not in external_backend.jobs_statuses
+        assert not external_backend._early_statuses
+
+    def test_close_stops_job_status_consumer(self):
+        from unittest.mock import MagicMock
+
+        from reana_workflow_engine_yadage.consumer import QueueJobStatusConsumer
+        from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+
+        consumer = QueueJobStatusConsumer()
+        backend = ExternalBackend(
+            job_status_consumer=consumer, rjc_api_client=MagicMock()
+        )
+        assert consumer._thread.is_alive()
+        backend.close()
+        assert not consumer._thread.is_alive()
+        backend.close()
+
+    def test_submit_in_background(self, external_backend):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import patch
+
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        external_backend._submission_pool = ThreadPoolExecutor(max_workers=2)
+        external_backend.rjc_api_client.submit.side_effect = [
+            {"job_id": "1"},
+            Exception("Controller unavailable"),
+        ]
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            side_effect=lambda spec, parameters, state, metadata: (
+                {"job_name": metadata["name"]},
+                parameters,
+                state,
+            ),
+        ):
+            submitted = external_backend.submit({}, None, None, {"name": "ok"})
+            submitted.submission.result()
+            failed = external_backend.submit({}, None, None, {"name": "ko"})
+            failed.submission.exception()
+
+        assert submitted.jobproxy == {"job_id": "1"}
+        assert external_backend.jobs_statuses["1"] == JobStatus.created
+        assert external_backend.ready(failed)
+        assert not external_backend.successful(failed)
+        assert "Controller unavailable" in external_backend.fail_info(failed)
+
+    def test_fail_info_is_per_job(self, external_backend):
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        get_logs = external_backend.rjc_api_client.get_logs
+        # the job controller answers JSON, raw text is kept as it is
+        get_logs.side_effect = ['{"log": "Error: boom\\n"}', "Error: bang\n"]
+        external_backend.jobs_statuses = {"1": JobStatus.failed, "2": JobStatus.failed}
+        first, second = self._build_proxy("1"), self._build_proxy("2")
+
+        assert external_backend.fail_info(first) == (
+            "job 1 failed\nlast 20 log lines:\nError: boom"
+        )
+        assert external_backend.fail_info(second) == (
+            "job 2 failed\nlast 20 log lines:\nError: bang"
+        )
+        assert external_backend.fail_info(first).startswith("job 1 failed")
+        assert get_logs.call_count == 2
+        assert len(external_backend.failures) == 2
+
+    def test_job_bookkeeping_is_compact(self, external_backend):
+        from unittest.mock import patch
+
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        external_backend.rjc_api_client.submit.side_effect = [
+            {"job_id": "1", "message": "Job submitted."},
+            {"job_id": "2", "message": "Job submitted."},
+        ]
+        external_backend._jobs_statuses_refresh_interval = float("inf")
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            return_value=({"job_name": "step", "cmd": "run"}, None, None),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.finalize_inputs",
+            return_value=(None, None),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.publish"
+        ):
+            first = external_backend.submit({"publisher": {}}, None, None, {})
+            second = external_backend.submit({"publisher": {}}, None, None, {})
+            external_backend.jobs_statuses.update({"1": "finished", "2": "failed"})
+
+            assert first.jobproxy == {"job_id": "1"}
+            assert first.spec is second.spec
+            assert external_backend.successful(first)
+            external_backend.result(first)
+            assert external_backend.ready(second)
+
+        assert external_backend.jobs_statuses == {}
+        assert external_backend.successful(first)
+        assert external_backend._get_state(second) == JobStatus.failed
+
+    def test_proxy_details_are_serialized_once(self):
+        from unittest.mock import MagicMock
+
+        proxy = self._build_proxy("1")
+        proxy.pardata, proxy.statedata = MagicMock(), MagicMock()
+
+        details = proxy.details()
+        assert proxy.details() is details
+        proxy.pardata.json.assert_called_once()
+
+        proxy.jobproxy = {"job_id": "2"}
+        assert proxy.details()["jobproxy"] == {"job_id": "2"}
+        assert proxy.pardata.json.call_count == 2
+
+    def test_proxy_details_are_not_stale_after_concurrent_assignment(self):
+        import threading
+        from unittest.mock import MagicMock
+
+        proxy = self._build_proxy(None)
+        proxy.pardata = MagicMock()
+        submitter = threading.Thread(
+            target=setattr, args=(proxy, "jobproxy", {"job_id": "1"})
+        )
+
+        def submit_while_serializing():
+            if submitter.ident is None:
+                submitter.start()
+                submitter.join(timeout=0.1)
+            return {}
+
+        proxy.statedata = MagicMock(**{"json.side_effect": submit_while_serializing})
+        proxy.details()
+        submitter.join()
+
+        assert proxy.details()["jobproxy"] == {"job_id": "1"}
+
+    def test_result_is_published_once(self, external_backend):
+        from unittest.mock import patch
+
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        external_backend.rjc_api_client.submit.return_value = {"job_id": "1"}
+        with patch(
+            "reana_workflow_engine_yadage.externalbackend.finalize_inputs",
+            return_value=(None, None),
+        ) as finalize_inputs, patch.object(
+            external_backend,
+            "_prepare_job",
+            return_value=({"job_name": "step", "cmd": "run"}, None, None),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.publish",
+            return_value={"output": "value"},
+        ) as publish:
+            proxy = external_backend.submit({"publisher": {}}, None, None, {})
+            external_backend.jobs_statuses["1"] = JobStatus.finished
+            for _ in range(3):
+                assert external_backend.result(proxy) == {"output": "value"}
+
+            restored = self._build_proxy("1")
+            restored.spec = {"publisher": {}}
+            external_backend.result(restored)
+
+        assert publish.call_count == 2
+        finalize_inputs.assert_called_once()
+
+    def test_job_timestamps(self, external_backend):
+        from unittest.mock import patch
+
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        external_backend.rjc_api_client.submit.return_value = {"job_id": "1"}
+        external_backend._jobs_statuses_refresh_interval = float("inf")
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            return_value=({"job_name": "step", "cmd": "run"}, None, None),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.publish",
+            return_value={"output": "value"},
+        ):
+            proxy = external_backend.submit({"publisher": {}}, None, None, {})
+            proxy.inputs_finalized = True
+            assert list(proxy.timestamps) == ["submitted"]
+
+            external_backend.jobs_statuses["1"] = JobStatus.running
+            assert not external_backend.ready(proxy)
+            running_at = proxy.timestamps["running"]
+            assert not external_backend.ready(proxy)
+            assert proxy.timestamps["running"] == running_at
+
+            external_backend.jobs_statuses["1"] = JobStatus.finished
+            assert external_backend.ready(proxy)
+            external_backend.result(proxy)
+
+        assert list(proxy.timestamps) == [
+            "submitted",
+            "running",
+            "terminal",
+            "published",
+        ]
+        assert sorted(proxy.timestamps.values()) == list(proxy.timestamps.values())
+
+    def test_get_state_while_submitting(self, external_backend):
+        from concurrent.futures import Future
+
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        proxy = self._build_proxy(None)
+        proxy.submission = Future()
+
+        assert external_backend._get_state(proxy) == JobStatus.submitting
+        assert not external_backend.ready(proxy)
+        external_backend.rjc_api_client.check_status.assert_not_called()
+
+    def test_result_cache_reuses_successful_jobs(self, external_backend, tmp_path):
+        from unittest.mock import MagicMock, patch
+
+        from reana_workflow_engine_yadage.cache import ResultCache
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        workdir = tmp_path / "step"
+        workdir.mkdir()
+        external_backend.result_cache = ResultCache(
+            str(tmp_path / "index.json"), max_entries=10
+        )
+        external_backend.rjc_api_client.submit.return_value = {"job_id": "1"}
+        parameters = MagicMock(**{"json.return_value": {"input": "value"}})
+        state = MagicMock(readwrite=[str(workdir)])
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            return_value=({"job_name": "step", "cmd": "run"}, parameters, state),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.finalize_inputs",
+            return_value=(parameters, state),
+        ), patch(
+            "reana_workflow_engine_yadage.externalbackend.publish",
+            return_value={"output": "value"},
+        ) as publish:
+            submitted = external_backend.submit({"publisher": {}}, None, None, {})
+            external_backend.jobs_statuses["1"] = JobStatus.finished
+            external_backend.result(submitted)
+
+            cached = external_backend.submit({"publisher": {}}, None, None, {})
+            assert external_backend.ready(cached)
+            assert external_backend.successful(cached)
+            assert external_backend.result(cached) == {"output": "value"}
+
+        assert cached.jobproxy == {"job_id": "1", "cached": True}
+        assert publish.call_count == 2
+        external_backend.rjc_api_client.submit.assert_called_once()
+
+    def test_wrap_script_inlines_small_scripts(self):
+        import base64
+
+        from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+
+        job = {"script": "echo hello", "interpreter": "bash"}
+        encoded = base64.b64encode(b"echo hello").decode()
+        assert ExternalBackend._wrap_script(job) == f"echo {encoded}|base64 -d|bash"
+
+    def test_wrap_script_spills_big_scripts(self, tmp_path, monkeypatch):
+        import subprocess
+
+        from reana_workflow_engine_yadage import externalbackend
+        from reana_workflow_engine_yadage.config import JOB_SCRIPTS_DIRNAME
+
+        monkeypatch.setattr(externalbackend, "JOB_SCRIPT_SPILL_THRESHOLD_BYTES", 10)
+        monkeypatch.setenv("workflow_workspace", str(tmp_path))
+        job = {"script": "echo 'hello world'", "interpreter": "sh"}
+
+        cmd = externalbackend.ExternalBackend._wrap_script(job)
+        assert externalbackend.ExternalBackend._wrap_script(dict(job)) == cmd
+        scripts = list((tmp_path / JOB_SCRIPTS_DIRNAME).iterdir())
+        assert len(scripts) == 1
+        assert cmd == f"sh < {scripts[0]}"
+        assert subprocess.check_output(cmd, shell=True) == b"hello world\n"
+
+    @staticmethod
+    def _build_job_request_body(job_name: str, image: str = "alpine") -> Dict:
+        return {
+            "job_name": job_name,
+            "image": image,
+            "cmd": f"run {job_name}",
+            "prettified_cmd": f"run {job_name}",
+        }
+
+    def test_submit_in_background_by_decreasing_priority(self, external_backend):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import patch
+
+        external_backend._submission_pool = ThreadPoolExecutor(max_workers=1)
+        first_submitting, unblock = threading.Event(), threading.Event()
+
+        def submit(**job_request_body):
+            if job_request_body["job_name"] == "first":
+                first_submitting.set()
+                unblock.wait(timeout=5)
+            return {"job_id": job_request_body["job_name"]}
+
+        external_backend.rjc_api_client.submit.side_effect = submit
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            side_effect=lambda spec, parameters, state, metadata: (
+                self._build_job_request_body(metadata["name"]),
+                parameters,
+                state,
+            ),
+        ):
+            proxies = [external_backend.submit({}, None, None, {"name": "first"})]
+            # the other jobs wait for the only submission thread
+            first_submitting.wait(timeout=5)
+            for name, priority in [("leaf", 1), ("chain", 4), ("other", 2)]:
+                proxies.append(
+                    external_backend.submit(
+                        {},
+                        None,
+                        None,
+                        {"name": name, "wflow_hints": {"priority": priority}},
+                    )
+                )
+            unblock.set()
+            for proxy in proxies:
+                proxy.submission.result(timeout=5)
+
+        assert [
+            call.kwargs["job_name"]
+            for call in external_backend.rjc_api_client.submit.call_args_list
+        ] == ["first", "chain", "other", "leaf"]
+        assert proxies[2].jobproxy == {"job_id": "chain"}
+
+    def test_admission_control_limits_jobs_in_flight(self, external_backend):
+        from unittest.mock import MagicMock, patch
+
+        from reana_workflow_engine_yadage.admission import AdmissionController
+        from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+        from reana_workflow_engine_yadage.metrics import (
+            ADMISSION_IN_FLIGHT,
+            ADMISSION_QUEUE_DEPTH,
+        )
+        from reana_workflow_engine_yadage.config import JobStatus
+
+        external_backend._admission_controller = AdmissionController(max_in_flight=1)
+        external_backend.export_metrics()
+        external_backend._jobs_statuses_refresh_interval = float("inf")
+        external_backend.rjc_api_client.submit.side_effect = lambda **body: {
+            "job_id": body["job_name"]
+        }
+        with patch.object(
+            external_backend,
+            "_prepare_job",
+            side_effect=lambda spec, parameters, state, metadata: (
+                self._build_job_request_body(metadata["name"]),
+                parameters,
+                state,
+            ),
+        ):
+            first = external_backend.submit({}, None, None, {"name": "first"})
+            second = external_backend.submit({}, None, None, {"name": "second"})
+
+            assert first.jobproxy == {"job_id": "first"}
+            assert not external_backend.ready(second)
+            assert external_backend._get_state(second) == JobStatus.waiting
+            assert external_backend.admission_stats()["queue_depth"] == 1
+            assert ADMISSION_QUEUE_DEPTH.value == 1
+
+            external_backend.jobs_statuses["first"] = JobStatus.finished
+            assert external_backend.ready(first)
+            assert external_backend.successful(first)
+
+        assert second.jobproxy == {"job_id": "second"}
+        assert external_backend._get_state(second) == JobStatus.created
+        stats = external_backend.admission_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["in_flight"] == 1
+        assert stats["admitted"] == 2
+        assert ADMISSION_QUEUE_DEPTH.value == 0
+        assert ADMISSION_IN_FLIGHT.value == 1
+        # other backends, e.g. of replays, do not take over the metrics
+        ExternalBackend(rjc_api_client=MagicMock())
+        assert ADMISSION_IN_FLIGHT.value == 1
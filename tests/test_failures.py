@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage job failure records tests."""
+
+from unittest.mock import MagicMock
+
+from reana_workflow_engine_yadage.failures import FailureRecord, FailureStore
+
+
+def test_failure_record_fetches_log_tail_once():
+    fetch_logs = MagicMock(return_value="line 1\nline 2\nline 3\n")
+    record = FailureRecord(
+        job_id="1", status="failed", fetch_logs=fetch_logs, log_tail_lines=2
+    )
+    fetch_logs.assert_not_called()
+
+    assert str(record) == "job 1 failed\nlast 2 log lines:\nline 2\nline 3"
+    assert record.log_tail == "line 2\nline 3"
+    fetch_logs.assert_called_once_with("1")
+
+
+def test_failure_record_without_logs():
+    fetch_logs = MagicMock(side_effect=Exception("Job not found"))
+    record = FailureRecord(
+        job_id="1",
+        status="failed",
+        error="job submission failed",
+        fetch_logs=fetch_logs,
+        log_tail_lines=10,
+    )
+    assert str(record) == "job 1 failed\nerror: job submission failed"
+    assert record.log_tail is None
+    fetch_logs.assert_called_once()
+
+    record = FailureRecord(job_id=None, status="failed", fetch_logs=fetch_logs)
+    assert str(record) == "job (not submitted) failed"
+
+
+def test_failure_store_is_bounded():
+    store = FailureStore(max_entries=2)
+    for job_id in ("1", "2", "3"):
+        store.put(job_id, FailureRecord(job_id=job_id, status="failed"))
+    assert len(store) == 2
+    assert store.get("1") is None
+    assert store.get("3").job_id == "3"
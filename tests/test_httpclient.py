@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage HTTP client tests."""
+
+from unittest.mock import patch
+
+import pytest
+
+
+class TestPooledRequestsClient:
+    @pytest.mark.parametrize(
+        "request_params,expected_timeouts",
+        [
+            ({}, {"connect_timeout": 5, "timeout": 30}),
+            ({"timeout": 1}, {"connect_timeout": 5, "timeout": 1}),
+        ],
+    )
+    def test_separate_params_default_timeouts(self, request_params, expected_timeouts):
+        from reana_workflow_engine_yadage.httpclient import PooledRequestsClient
+
+        client = PooledRequestsClient(pool_size=2, connect_timeout=5, timeout=30)
+        _, misc_options = client.separate_params(request_params)
+
+        for key, value in expected_timeouts.items():
+            assert misc_options[key] == value
+
+    def test_pool_stats_saturation(self):
+        from requests.adapters import HTTPAdapter
+
+        from reana_workflow_engine_yadage.httpclient import PooledRequestsClient
+
+        client = PooledRequestsClient(pool_size=1)
+
+        def send_nested(adapter, request, **kwargs):
+            if send_nested.depth == 0:
+                send_nested.depth += 1
+                client.adapter.send(request, **kwargs)
+
+        send_nested.depth = 0
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=send_nested):
+            client.adapter.send(None)
+
+        stats = client.pool_stats()
+        assert stats["pool_size"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["max_in_flight"] == 2
+        assert stats["saturated_requests"] == 1
+
+        from reana_workflow_engine_yadage.metrics import REGISTRY
+
+        client.export_pool_stats()
+        rendered = REGISTRY.render()
+        assert "reana_workflow_engine_job_controller_pool_max_in_flight 2" in rendered
+        assert (
+            "reana_workflow_engine_job_controller_pool_saturated_requests 1" in rendered
+        )
+
+    def test_keep_alive_disabled(self):
+        from reana_workflow_engine_yadage.httpclient import PooledRequestsClient
+
+        client = PooledRequestsClient(pool_size=1, keep_alive=False)
+        assert client.session.headers["Connection"] == "close"
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage engine metrics tests."""
+
+import urllib.request
+
+import pytest
+
+from reana_workflow_engine_yadage.metrics import (
+    MetricsFileWriter,
+    MetricsRegistry,
+    serve_metrics,
+)
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.counter("test_failures_total", "Failures:").increment(2)
+    registry.gauge("test_in_flight", "In flight:").set(3)
+    histogram = registry.histogram("test_seconds", "Calls:", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+    return registry
+
+
+def test_render_prometheus_text(registry):
+    assert registry.render().splitlines() == [
+        "# HELP test_failures_total Failures:",
+        "# TYPE test_failures_total counter",
+        "test_failures_total 2",
+        "# HELP test_in_flight In flight:",
+        "# TYPE test_in_flight gauge",
+        "test_in_flight 3",
+        "# HELP test_seconds Calls:",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1"} 2',
+        'test_seconds_bucket{le="+Inf"} 3',
+        "test_seconds_sum 5.55",
+        "test_seconds_count 3",
+    ]
+
+
+def test_summarize(registry):
+    assert registry.summarize().splitlines() == [
+        "Failures: 2",
+        "In flight: 3",
+        "Calls: 3, mean 1.85, max 5",
+    ]
+
+
+def test_metrics_file_writer(registry, tmp_path):
+    path = tmp_path / "metrics.prom"
+    writer = MetricsFileWriter(registry, str(path), interval=3600)
+    writer.close()
+    assert path.read_text() == registry.render()
+
+
+def test_metrics_file_writer_close_does_not_raise(registry, tmp_path):
+    writer = MetricsFileWriter(
+        registry, str(tmp_path / "missing" / "metrics.prom"), 3600
+    )
+    writer.close()
+
+
+def test_serve_metrics(registry):
+    server = serve_metrics(registry, 0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.read().decode() == registry.render()
+    finally:
+        server.shutdown()
+        server.server_close()
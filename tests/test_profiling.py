@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage profiling tests."""
+
+import json
+import pstats
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+from reana_workflow_engine_yadage.profiling import (
+    ProfiledBackend,
+    ProfiledTracker,
+    WorkflowProfiler,
+)
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profile_phases(tmp_path):
+    profiler = WorkflowProfiler(
+        str(tmp_path),
+        ["cprofile", "stacks", "tracemalloc", "unknown"],
+        sample_interval=0.001,
+    )
+    assert profiler.modes == {"cprofile", "stacks", "tracemalloc"}
+    backend = ProfiledBackend(MagicMock(ready=busy_wait, name="backend"), profiler)
+    tracker = ProfiledTracker(MagicMock(), profiler)
+
+    profiler.start("setup")
+    busy_wait(0.05)
+    profiler.switch_phase("adage")
+    for _ in range(3):
+        backend.ready(0.02)
+        tracker.track("adageobj")
+    profiler.stop()
+
+    assert not tracemalloc.is_tracing()
+    phases = json.loads((tmp_path / "phases.json").read_text())
+    assert set(phases) == {"setup", "adage", "backend", "tracker"}
+    assert phases["backend"]["calls"] == 3
+    assert phases["tracker"]["calls"] == 3
+    assert phases["adage"]["seconds"] >= phases["backend"]["seconds"]
+
+    backend_stats = pstats.Stats(str(tmp_path / "backend.pstats"))
+    assert any(name == "busy_wait" for _, _, name in backend_stats.stats)
+    adage_stats = pstats.Stats(str(tmp_path / "adage.pstats"))
+    assert not any(name == "busy_wait" for _, _, name in adage_stats.stats)
+
+    roots = {
+        line.split(";", 1)[0]
+        for line in (tmp_path / "stacks.folded").read_text().splitlines()
+    }
+    assert {"setup", "backend"} <= roots
+
+    assert (tmp_path / "setup.tracemalloc").exists()
+    assert (tmp_path / "adage.tracemalloc").exists()
+
+
+def test_profiled_backend_passes_attributes_through():
+    profiler = WorkflowProfiler("unused", [])
+    backend = ProfiledBackend(MagicMock(cache="cache"), profiler)
+    assert backend.cache == "cache"
+    backend.submit("spec")
+    backend._backend.submit.assert_called_once_with("spec")
+    assert profiler.phase_stats["backend"]["calls"] == 1
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage background publisher tests."""
+
+import threading
+from unittest.mock import MagicMock
+
+
+class TestCoalescingPublisher:
+    def test_burst_is_coalesced(self):
+        from reana_workflow_engine_yadage.publisher import CoalescingPublisher
+
+        published = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def publish():
+            calls.append(len(calls))
+            published.set()
+            release.wait()
+
+        publisher = CoalescingPublisher(publish, min_interval=0)
+        publisher.schedule()
+        published.wait()
+        # the first publication is in progress, the burst fills the single slot
+        for _ in range(10):
+            publisher.schedule()
+        release.set()
+        publisher.close()
+
+        assert calls == [0, 1]
+
+    def test_close_flushes_pending_publication(self):
+        from reana_workflow_engine_yadage.publisher import CoalescingPublisher
+
+        publish = MagicMock()
+        publisher = CoalescingPublisher(publish, min_interval=3600)
+        publisher.schedule()
+        publisher.schedule()
+        publisher.close()
+
+        publish.assert_called_once()
+
+    def test_publication_errors_do_not_stop_the_thread(self):
+        from reana_workflow_engine_yadage.publisher import CoalescingPublisher
+
+        failed = threading.Event()
+
+        def publish():
+            if not failed.is_set():
+                failed.set()
+                raise Exception("Broker unavailable")
+
+        publish = MagicMock(side_effect=publish)
+        publisher = CoalescingPublisher(publish, min_interval=0)
+        publisher.schedule()
+        failed.wait()
+        publisher.schedule()
+        publisher.close()
+
+        assert publish.call_count == 2
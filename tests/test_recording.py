@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage traffic recording and replay tests."""
+
+import gzip
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from reana_workflow_engine_yadage.recording import (
+    RecordingJobControllerClient,
+    RecordingPublisher,
+    TrafficRecorder,
+    load_recording,
+    record_workflow_dag,
+)
+
+
+def _write_recording(path, records):
+    with gzip.open(path, "wt") as recording:
+        for record in records:
+            recording.write(json.dumps(record) + "\n")
+
+
+def test_record_traffic(tmp_path, fake_job_controller):
+    path = str(tmp_path / "recording.jsonl.gz")
+    recorder = TrafficRecorder(path)
+    client = RecordingJobControllerClient(fake_job_controller, recorder)
+    publisher = RecordingPublisher(MagicMock(), recorder)
+
+    client.submit(image="alpine", cmd="echo 1", job_name="first")
+    client.submit(image="alpine", cmd="echo 2", job_name="second")
+    client.check_status("job-1")
+    for _ in range(2):
+        client._client.jobs.get_jobs().response(
+            fallback_result=None, exceptions_to_catch=(ValidationError,)
+        )
+    fake_job_controller.failures = [Exception("Controller down")]
+    with pytest.raises(Exception):
+        client.check_status("job-2")
+    publisher.publish_workflow_status("workflow", 1, message={"progress": {}})
+    record_workflow_dag(
+        recorder,
+        {
+            "dag": {
+                "edges": [["a", "b"]],
+                "nodes": [
+                    {"id": "a", "metadata": {"name": "first"}, "jobid": None},
+                    {
+                        "id": "b",
+                        "metadata": {"name": "second"},
+                        "jobid": {"job_id": "job-2"},
+                    },
+                ],
+            }
+        },
+    )
+    recorder.close()
+
+    records = list(load_recording(path))
+    assert [record["kind"] for record in records] == [
+        "start",
+        "submit",
+        "submit",
+        "check_status",
+        "get_jobs",
+        "get_jobs",
+        "check_status",
+        "publish",
+        "dag",
+    ]
+    assert records[1]["job_name"] == "first"
+    assert records[2]["job_id"] == "job-2"
+    assert records[3]["status"] == "running"
+    assert records[4]["statuses"] == {"job-1": "running", "job-2": "running"}
+    # unchanged statuses are not recorded again
+    assert records[5]["statuses"] == {}
+    assert "Controller down" in records[6]["error"]
+    assert records[7]["bytes"] == len('{"progress": {}}')
+    assert records[8]["nodes"] == [["a", "first", None], ["b", "second", "job-2"]]
+    assert all(record["d"] >= 0 for record in records[1:])
+
+
+def test_replay_workflow(tmp_path):
+    from reana_workflow_engine_yadage.replay import (
+        ReplayJobController,
+        ReplayWorkflow,
+        replay_workflow,
+    )
+
+    path = str(tmp_path / "recording.jsonl.gz")
+    records = [
+        {"kind": "start", "time": 0},
+        {"kind": "submit", "t": 0.0, "d": 0.5, "job_name": "a", "job_id": "1"},
+        {"kind": "get_jobs", "t": 1.5, "d": 0.1, "statuses": {"1": "running"}},
+        {"kind": "get_jobs", "t": 10.5, "d": 0.1, "statuses": {"1": "finished"}},
+        {"kind": "submit", "t": 11.0, "d": 0.5, "job_name": "b", "job_id": "2"},
+        {
+            "kind": "check_status",
+            "t": 15.5,
+            "d": 0.1,
+            "job_id": "2",
+            "status": "failed",
+        },
+        {"kind": "publish", "t": 16.0, "d": 0.2, "status": 1, "bytes": 100},
+        {
+            "kind": "dag",
+            "t": 16.5,
+            "d": 0.0,
+            "nodes": [
+                ["init", "init", None],
+                ["a", "a", "1"],
+                ["b", "b", "2"],
+                # served from the result cache, without submitting a job
+                ["c", "c", "0"],
+            ],
+            "edges": [["init", "a"], ["a", "b"], ["init", "c"]],
+        },
+    ]
+    _write_recording(path, records)
+
+    clock = MagicMock(return_value=0.0)
+    controller = ReplayJobController(records, speed=2, clock=clock, sleep=MagicMock())
+    assert controller.submit(job_name="a") == {"job_id": "1"}
+    assert controller.check_status("1") == {"status": "created"}
+    clock.return_value = 3.0
+    assert controller.check_status("1") == {"status": "running"}
+    clock.return_value = 5.0
+    assert controller.check_status("1") == {"status": "finished"}
+    assert controller.waited_seconds == pytest.approx(0.25 + 3 * 0.05)
+    with pytest.raises(ValueError):
+        controller.submit(job_name="unknown")
+
+    workflow = ReplayWorkflow(records[-1], controller.recorded_job_ids)
+    nodes = [workflow.dag.getNode(node_id) for node_id in workflow.dag.nodes()]
+    assert {
+        node.name: node.task.metadata["wflow_hints"]["is_purepub"] for node in nodes
+    } == {"init": True, "a": False, "b": False, "c": True}
+
+    summary = replay_workflow(path, speed=1000)
+    assert not summary["succeeded"]
+    assert summary["ticks"] > 0
+    assert summary["controller_seconds"] > 0
+    assert summary["publisher_seconds"] > 0
+
+
+def test_backend_and_tracker_record_traffic(tmp_path):
+    from reana_workflow_engine_yadage.externalbackend import ExternalBackend
+    from reana_workflow_engine_yadage.tracker import REANATracker
+
+    recorder = TrafficRecorder(str(tmp_path / "recording.jsonl.gz"))
+    backend = ExternalBackend(recorder=recorder, rjc_api_client=MagicMock())
+    assert isinstance(backend.rjc_api_client, RecordingJobControllerClient)
+
+    tracker = REANATracker("workflow", MagicMock(), recorder=recorder)
+    tracker.publish_workflow_running_status()
+    tracker.finalize(MagicMock(**{"dag.number_of_nodes.return_value": 0}))
+    recorder.close()
+    assert [record["kind"] for record in load_recording(recorder.path)] == [
+        "start",
+        "publish",
+        "dag",
+    ]
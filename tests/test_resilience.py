@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage job controller resilience tests."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from bravado.exception import BravadoTimeoutError, HTTPServiceUnavailable
+from reana_commons.errors import REANAJobControllerSubmissionError
+
+from reana_workflow_engine_yadage.config import JobStatus
+from reana_workflow_engine_yadage.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    is_transient_error,
+)
+
+JOB_REQUEST_BODY = {"image": "alpine ", "cmd": "echo hello", "job_name": "hello"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _build_proxy(job_id):
+    from reana_workflow_engine_yadage.externalbackend import ReanaExternalProxy
+
+    return ReanaExternalProxy(
+        jobproxy={"job_id": job_id}, spec={}, pardata=None, statedata=None
+    )
+
+
+def test_is_transient_error():
+    assert is_transient_error(BravadoTimeoutError())
+    assert not is_transient_error(ValueError())
+    try:
+        try:
+            raise HTTPServiceUnavailable(MagicMock(status_code=503))
+        except Exception:
+            raise REANAJobControllerSubmissionError("Service unavailable")
+    except REANAJobControllerSubmissionError as e:
+        assert is_transient_error(e)
+
+
+def test_retry_policy_backoff_is_bounded():
+    policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=8, jitter=lambda: 1)
+    assert [policy.get_delay(attempt) for attempt in range(5)] == [1, 2, 4, 8, 8]
+    policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=8, jitter=lambda: 0.5)
+    assert policy.get_delay(2) == 2
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.open
+    assert not breaker.allow_request()
+    clock.now = 10
+    assert breaker.retry_after() == 20
+    assert breaker.unavailable_for() == 10
+
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.half_open
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.open
+
+    clock.now = 60
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.closed
+    assert breaker.unavailable_for() == 0
+
+
+def test_call_with_retries_gives_up():
+    sleep = MagicMock()
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=4, sleep=sleep)
+    breaker = CircuitBreaker(failure_threshold=10, reset_timeout=30)
+    function = MagicMock(side_effect=BravadoTimeoutError())
+    with pytest.raises(BravadoTimeoutError):
+        call_with_retries(function, policy, breaker)
+    assert function.call_count == 3
+    assert sleep.call_count == 2
+
+    function = MagicMock(side_effect=ValueError())
+    with pytest.raises(ValueError):
+        call_with_retries(function, policy, breaker)
+    assert function.call_count == 1
+
+
+def test_call_with_retries_waits_for_open_circuit():
+    sleep = MagicMock()
+    policy = RetryPolicy(max_attempts=2, base_delay=1, max_delay=4, sleep=sleep)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    function = MagicMock()
+    with pytest.raises(CircuitOpenError):
+        call_with_retries(function, policy, breaker)
+    function.assert_not_called()
+    assert 29 < sleep.call_args.args[0] <= 30
+
+
+def test_submit_retries_transient_errors(resilient_backend, fake_job_controller):
+    fake_job_controller.failures = [BravadoTimeoutError(), None]
+    assert resilient_backend._submit_job(JOB_REQUEST_BODY) == {"job_id": "job-1"}
+    assert list(fake_job_controller.jobs) == ["job-1"]
+    assert resilient_backend.jobs_statuses["job-1"] == JobStatus.created
+
+
+def test_submit_retries_are_idempotent(resilient_backend, fake_job_controller):
+    fake_job_controller.lost_response_error = BravadoTimeoutError()
+    assert resilient_backend._submit_job(JOB_REQUEST_BODY) == {"job_id": "job-1"}
+    assert list(fake_job_controller.jobs) == ["job-1"]
+
+
+def test_submit_retries_do_not_claim_jobs_of_other_steps(
+    resilient_backend, fake_job_controller
+):
+    fake_job_controller._create_job("alpine", "echo hello", "other")
+    fake_job_controller.lost_response_error = BravadoTimeoutError()
+    assert resilient_backend._submit_job(JOB_REQUEST_BODY) == {"job_id": "job-2"}
+    assert list(fake_job_controller.jobs) == ["job-1", "job-2"]
+
+
+def test_submit_retries_do_not_claim_jobs_of_concurrent_submissions(
+    resilient_backend, fake_job_controller
+):
+    # an identical submission whose job is created but not registered yet
+    submission_key = resilient_backend._get_submission_key(JOB_REQUEST_BODY)
+    resilient_backend._submissions_in_flight[submission_key] = 1
+    fake_job_controller._create_job("alpine", "echo hello", "hello")
+    fake_job_controller.lost_response_error = BravadoTimeoutError()
+    with pytest.raises(BravadoTimeoutError):
+        resilient_backend._submit_job(JOB_REQUEST_BODY)
+    assert "job-1" not in resilient_backend.jobs_statuses
+    assert resilient_backend._submissions_in_flight == {submission_key: 1}
+
+
+def test_submit_is_not_retried_without_idempotency_check(
+    resilient_backend, fake_job_controller
+):
+    resilient_backend._bulk_status_supported = False
+    fake_job_controller.failures = [BravadoTimeoutError()]
+    with pytest.raises(BravadoTimeoutError):
+        resilient_backend._submit_job(JOB_REQUEST_BODY)
+    assert fake_job_controller.requests == 1
+
+
+def test_polling_pauses_while_controller_is_unavailable(
+    resilient_backend, fake_job_controller
+):
+    from reana_workflow_engine_yadage import externalbackend
+
+    resilient_backend._submit_job(JOB_REQUEST_BODY)
+    proxy = _build_proxy("job-1")
+    fake_job_controller.failures = [BravadoTimeoutError(), BravadoTimeoutError()]
+    requests = fake_job_controller.requests
+
+    # the last known status is kept while the controller is unavailable
+    for _ in range(5):
+        assert not resilient_backend.ready(proxy)
+    assert fake_job_controller.requests == requests + 2
+    assert resilient_backend.circuit_breaker.state == CircuitBreaker.open
+
+    resilient_backend.circuit_breaker.reset_timeout = 0
+    fake_job_controller.jobs["job-1"]["status"] = "finished"
+    assert resilient_backend.ready(proxy)
+    assert resilient_backend.circuit_breaker.state == CircuitBreaker.closed
+
+    resilient_backend.circuit_breaker.reset_timeout = 30
+    resilient_backend.circuit_breaker.record_failure()
+    resilient_backend.circuit_breaker.record_failure()
+    resilient_backend.jobs_statuses["job-2"] = JobStatus.running
+    externalbackend.JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS = -1
+    try:
+        with pytest.raises(CircuitOpenError):
+            resilient_backend.ready(_build_proxy("job-2"))
+    finally:
+        externalbackend.JOB_CONTROLLER_MAX_UNAVAILABLE_SECONDS = 1800
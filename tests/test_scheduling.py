@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage submission priority tests."""
+
+from unittest.mock import MagicMock
+
+import adage.nodestate as nodestate
+import pytest
+
+from reana_workflow_engine_yadage.scheduling import (
+    PrioritizingController,
+    get_step_name,
+)
+
+
+@pytest.fixture
+def controller(workflow):
+    controller = PrioritizingController(workflow)
+    controller.backend = MagicMock()
+    return controller
+
+
+def _submitted_names(controller):
+    return [
+        call.args[0].metadata["name"]
+        for call in controller.backend.submit.call_args_list
+    ]
+
+
+def test_get_step_name(workflow):
+    assert get_step_name(workflow.add_node("fit_12")) == "fit"
+    assert get_step_name(workflow.add_node("fit")) == "fit"
+
+
+def test_submits_longest_downstream_paths_first(workflow, controller):
+    leaves = [workflow.add_node(f"leaf_{i}") for i in range(3)]
+    chain = [workflow.add_node("chain_0")]
+    for i in range(1, 4):
+        chain.append(workflow.add_node(f"chain_{i}", depends_on=[chain[-1]]))
+
+    controller.submit_nodes(leaves + chain[:1])
+
+    assert _submitted_names(controller) == ["chain_0", "leaf_0", "leaf_1", "leaf_2"]
+    assert chain[0].task.metadata["wflow_hints"]["priority"] == 4
+    assert leaves[0].task.metadata["wflow_hints"]["priority"] == 1
+
+
+def test_estimates_durations_from_history(workflow, controller):
+    done = workflow.add_node("slow_0")
+    controller.submit_nodes([done])
+    done.submit_time -= 100
+    workflow.set_node_state(done, nodestate.SUCCESS)
+    slow = workflow.add_node("slow_1")
+    short_chain = workflow.add_node("quick")
+    workflow.add_node("quick_end", depends_on=[short_chain])
+
+    controller.submit_nodes([short_chain, slow])
+
+    assert _submitted_names(controller) == ["slow_0", "slow_1", "quick"]
+    assert slow.task.metadata["wflow_hints"]["priority"] >= 100
+
+
+def test_path_lengths_are_only_recomputed_when_outdated(workflow, controller):
+    first = workflow.add_node("fit_0")
+    second = workflow.add_node("fit_1")
+    workflow.add_node("merge", depends_on=[first, second])
+    ids = [first.identifier, second.identifier]
+    assert controller.get_remaining_path_lengths(ids) == {ids[0]: 2, ids[1]: 2}
+
+    controller._estimate_duration = MagicMock(side_effect=controller._estimate_duration)
+    controller.get_remaining_path_lengths(ids)
+    controller._estimate_duration.assert_not_called()
+
+    controller.submit_nodes([first, second])
+    first.submit_time -= 10
+    workflow.set_node_state(first, nodestate.SUCCESS)
+    controller._record_durations()
+    assert controller._untimed_nodes == [second]
+    assert controller.get_remaining_path_lengths([second.identifier]) == {
+        second.identifier: pytest.approx(11, abs=1)
+    }
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage job status table tests."""
+
+from reana_workflow_engine_yadage.config import JobStatus
+from reana_workflow_engine_yadage.statuses import JobStatusTable
+
+
+def test_job_status_table_shares_statuses():
+    table = JobStatusTable({"1": "".join(["fin", "ished"])})
+    table.update({"2": "running"})
+    table.setdefault("3", "created")
+    table["4"] = "".join(["unk", "nown"])
+    table["5"] = "".join(["unk", "nown"])
+
+    assert table["1"] is JobStatus.finished
+    assert table["2"] is JobStatus.running
+    assert table["3"] is JobStatus.created
+    assert table["4"] == "unknown"
+    assert table["4"] is table["5"]
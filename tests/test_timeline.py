@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage job timeline tests."""
+
+import csv
+
+import adage.nodestate as nodestate
+
+from reana_workflow_engine_yadage.timeline import (
+    build_timeline,
+    summarize_critical_path,
+    write_timeline,
+)
+
+
+def _run_node(workflow, nodeobj, job_id, submitted, running, terminal, published):
+    workflow.submit_node(nodeobj, job_id)
+    workflow.set_node_state(nodeobj, nodestate.SUCCESS)
+    nodeobj.define_time = 0.0
+    nodeobj.resultproxy.timestamps = {
+        "submitted": submitted,
+        "running": running,
+        "terminal": terminal,
+        "published": published,
+    }
+
+
+def test_build_timeline(workflow, tmp_path):
+    a = workflow.add_node("a")
+    b = workflow.add_node("b", depends_on=[a])
+    c = workflow.add_node("c", depends_on=[a])
+    d = workflow.add_node("d", depends_on=[b, c])
+    _run_node(workflow, a, "1", 1, 2, 5, 6)
+    _run_node(workflow, b, "2", 7, 8, 20, 21)
+    _run_node(workflow, c, "3", 7, 8, 10, 11)
+    _run_node(workflow, d, "4", 22, 23, 30, 31)
+
+    timeline = {row["name"]: row for row in build_timeline(workflow.dag)}
+
+    assert timeline["d"]["ready"] == 21
+    assert timeline["d"]["wait_seconds"] == 1
+    assert timeline["b"]["run_seconds"] == 12
+    assert {name: row["slack_seconds"] for name, row in timeline.items()} == {
+        "a": 0,
+        "b": 0,
+        "c": 10,
+        "d": 0,
+    }
+    assert [name for name, row in timeline.items() if row["critical"]] == [
+        "a",
+        "b",
+        "d",
+    ]
+    assert summarize_critical_path(list(timeline.values())) == (
+        "Critical path of 3 nodes over 31.000s: 3.000s waiting for submission, "
+        "3.000s until seen running, 22.000s until seen terminal, "
+        "3.000s until published."
+    )
+
+    path = tmp_path / "timeline.csv"
+    write_timeline(list(timeline.values()), str(path))
+    with open(path) as timeline_file:
+        rows = list(csv.DictReader(timeline_file))
+    assert sorted(row["job_id"] for row in rows) == ["1", "2", "3", "4"]
+    assert {row["name"]: float(row["slack_seconds"]) for row in rows}["c"] == 10
+
+
+def test_build_timeline_of_unfinished_workflow(workflow):
+    a = workflow.add_node("a")
+    workflow.add_node("b", depends_on=[a])
+    workflow.submit_node(a, "1")
+    a.define_time = 0.0
+    a.submit_time = 1.0
+
+    timeline = build_timeline(workflow.dag)
+
+    assert timeline[0]["status"] == "defined"
+    assert timeline[0]["submitted"] == 1
+    assert timeline[0]["slack_seconds"] is None
+    assert timeline[1]["ready"] is None
+    assert not timeline[1]["critical"]
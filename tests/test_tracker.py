@@ -15,6 +15,21 @@ from unittest.mock import MagicMock
 import pytest
 
 
+def _dump_workflow_dag_with_jq(adageobj):
+    """Extract the DAG view the way the tracker used to, with jq."""
+    import json
+
+    from yadage.utils import WithJsonRefEncoder
+
+    jq = pytest.importorskip("jq")
+    serialized = json.dumps(adageobj.json(), cls=WithJsonRefEncoder, sort_keys=True)
+    return jq.jq(
+        "{dag: {edges: .dag.edges, nodes: [.dag.nodes[]|"
+        "{metadata: {name: .task.metadata.name}, id: .id, "
+        "jobid: .proxy.proxydetails.jobproxy}]}}"
+    ).transform(json.loads(serialized))
+
+
 def _build_progress_state(total: int, failed: int, running: int, finished: int):
     return {
         "total": {"total": total},
@@ -78,3 +93,312 @@ class TestReanaTracker:
         tracker._update_progress_state(progress)
 
         assert tracker._workflow_failed() == is_failed
+
+    def test_update_workflow_dag_matches_full_dump(self, workflow):
+        import adage.nodestate as nodestate
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        tracker = REANATracker("", None)
+        init = workflow.add_node("init", is_purepub=True)
+        first = workflow.add_node("first", depends_on=[init])
+        workflow.set_node_state(init, nodestate.SUCCESS)
+        assert tracker._update_workflow_dag(workflow) == tracker._dump_workflow_dag(
+            workflow
+        )
+
+        workflow.submit_node(first, "job-1")
+        second = workflow.add_node("second", depends_on=[first])
+        assert tracker._update_workflow_dag(workflow) == tracker._dump_workflow_dag(
+            workflow
+        )
+
+        workflow.set_node_state(first, nodestate.SUCCESS)
+        workflow.submit_node(second, "job-2")
+        assert tracker._update_workflow_dag(workflow) == tracker._dump_workflow_dag(
+            workflow
+        )
+        assert tracker._dag_view_pending_nodes == set()
+
+    def test_finalize_exports_timeline(self, workflow, tmp_path):
+        import adage.nodestate as nodestate
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        timeline_path = tmp_path / "timeline.csv"
+        tracker = REANATracker("", MagicMock(), timeline_path=str(timeline_path))
+        tracker._publish_progress = MagicMock()
+        init = workflow.add_node("init", is_purepub=True)
+        first = workflow.add_node("first", depends_on=[init])
+        workflow.set_node_state(init, nodestate.SUCCESS)
+        workflow.submit_node(first, "job-1")
+        workflow.set_node_state(first, nodestate.SUCCESS)
+
+        tracker.finalize(workflow)
+
+        lines = timeline_path.read_text().splitlines()
+        assert lines[0].startswith("node_id,name,job_id,status,ready,submitted")
+        assert len(lines) == 3
+
+    def test_update_workflow_dag_after_node_removal(self, workflow):
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        tracker = REANATracker("", None)
+        first = workflow.add_node("first")
+        workflow.add_node("second", depends_on=[first])
+        tracker._update_workflow_dag(workflow)
+
+        workflow.dag.removeNode(first)
+        assert tracker._update_workflow_dag(workflow) == tracker._dump_workflow_dag(
+            workflow
+        )
+
+    def test_dump_workflow_dag_matches_jq(self, workflow):
+        import adage.nodestate as nodestate
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        init = workflow.add_node("init", is_purepub=True)
+        workflow.set_node_state(init, nodestate.SUCCESS)
+        parents = [init]
+        for stage in range(3):
+            nodes = [
+                workflow.add_node(f"stage{stage}_{i}", depends_on=parents)
+                for i in range(4)
+            ]
+            for i, nodeobj in enumerate(nodes[:2]):
+                workflow.submit_node(nodeobj, f"job-{stage}-{i}")
+            parents = nodes
+
+        assert REANATracker._dump_workflow_dag(workflow) == _dump_workflow_dag_with_jq(
+            workflow
+        )
+
+    def test_publish_progress_deltas(self, workflow):
+        from unittest.mock import MagicMock
+
+        import adage.nodestate as nodestate
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        publisher = MagicMock()
+        tracker = REANATracker("workflow", publisher, delta_messages=True)
+
+        first = workflow.add_node("first")
+        second = workflow.add_node("second", depends_on=[first])
+        tracker.track(workflow)
+        snapshot = publisher.publish_workflow_status.call_args.kwargs["message"]
+        assert snapshot["progress"]["snapshot"]
+        assert snapshot["progress"]["sequence"] == 1
+        assert snapshot["progress"]["total"]["total"] == 2
+        assert len(snapshot["progress"]["engine_specific"]["dag"]["nodes"]) == 2
+
+        workflow.submit_node(first, "job-1")
+        workflow.set_node_state(first, nodestate.RUNNING)
+        workflow.add_node("third", depends_on=[second])
+        tracker.track(workflow)
+        delta = publisher.publish_workflow_status.call_args.kwargs["message"]
+        assert not delta["progress"]["snapshot"]
+        assert delta["progress"]["sequence"] == 2
+        assert delta["progress"]["running"] == {"total": 1}
+        assert delta["progress"]["total"] == {"total": 2}
+        assert sorted(node["state"] for node in delta["progress"]["nodes"]) == [
+            "running",
+            "total",
+        ]
+        dag_delta = delta["progress"]["engine_specific"]["dag"]
+        assert sorted(node["metadata"]["name"] for node in dag_delta["nodes"]) == [
+            "first",
+            "third",
+        ]
+        assert dag_delta["edges"] == [
+            [second.identifier, workflow.dag.getNodeByName("third").identifier]
+        ]
+
+        tracker.request_progress_snapshot()
+        workflow.set_node_state(first, nodestate.SUCCESS)
+        tracker.track(workflow)
+        snapshot = publisher.publish_workflow_status.call_args.kwargs["message"]
+        assert snapshot["progress"]["snapshot"]
+        assert snapshot["progress"]["finished"]["job_ids"] == ["job-1"]
+
+    def test_full_messages_do_not_accumulate_changes(self, workflow):
+        from unittest.mock import MagicMock
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        tracker = REANATracker("workflow", MagicMock(), delta_messages=False)
+        for i in range(3):
+            workflow.add_node(f"node{i}")
+            tracker.track(workflow)
+
+        assert tracker._nodes_changed_since_publish == set()
+        assert tracker._dag_view_changed_nodes == set()
+
+    def test_background_publishing_precedes_final_status(self, workflow):
+        from unittest.mock import MagicMock
+
+        from reana_workflow_engine_yadage.config import RunStatus
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        publisher = MagicMock()
+        tracker = REANATracker("workflow", publisher, background_publishing=True)
+        tracker._background_publisher.min_interval = 3600
+
+        tracker.publish_workflow_running_status()
+        for i in range(5):
+            workflow.add_node(f"node{i}")
+            tracker.track(workflow)
+        tracker.publish_workflow_final_status()
+
+        calls = publisher.publish_workflow_status.call_args_list
+        assert calls[0].kwargs["status"] == int(RunStatus.running)
+        assert calls[-1].args[1] == int(RunStatus.finished)
+        progress_calls = calls[1:-1]
+        # the first track is published right away, the next ones are coalesced
+        assert 1 <= len(progress_calls) <= 2
+        assert progress_calls[-1].kwargs["message"]["progress"]["total"]["total"] == 5
+
+    def test_progress_state_accounts_changed_nodes_only(self, workflow):
+        from unittest.mock import patch
+
+        import adage.nodestate as nodestate
+
+        from reana_workflow_engine_yadage.tracker import REANATracker
+
+        tracker = REANATracker("", None)
+        init = workflow.add_node("init", is_purepub=True)
+        first = workflow.add_node("first", depends_on=[init])
+        second = workflow.add_node("second", depends_on=[first])
+        workflow.submit_node(first, "job-1")
+        workflow.set_node_state(first, nodestate.RUNNING)
+
+        progress = tracker._get_progress_state(workflow)
+        assert progress["running"] == {"total": 1, "job_ids": ["job-1"]}
+        assert progress["total"] == {"total": 1, "job_ids": []}
+
+        workflow.set_node_state(first, nodestate.SUCCESS)
+        workflow.submit_node(second, "job-2")
+        workflow.set_node_state(second, nodestate.FAILED)
+        progress = tracker._get_progress_state(workflow)
+        assert progress["running"] == {"total": 0, "job_ids": []}
+        assert progress["finished"] == {"total": 1, "job_ids": ["job-1"]}
+        assert progress["failed"] == {"total": 1, "job_ids": ["job-2"]}
+        assert progress["total"] == {"total": 0, "job_ids": []}
+
+        # terminal nodes are not classified again, nor is the order recomputed
+        with patch.object(
+            REANATracker, "_get_node_state", wraps=REANATracker._get_node_state
+        ) as get_node_state, patch("networkx.topological_sort") as topological_sort:
+            unchanged_progress = tracker._get_progress_state(workflow)
+        get_node_state.assert_not_called()
+        topological_sort.assert_not_called()
+        # nor are the job id lists rebuilt
+        for state in ["running", "finished", "failed", "total"]:
+            assert unchanged_progress[state]["job_ids"] is progress[state]["job_ids"]
+
+        third = workflow.add_node("third", depends_on=[second])
+        progress = tracker._get_progress_state(workflow)
+        assert progress["total"] == {"total": 1, "job_ids": []}
+        assert tracker._active_nodes == [third.identifier]
+
+
+class TestAdaptiveIntervalTracker:
+    def _build_tracker(self, min_interval=1, max_interval=8):
+        from reana_workflow_engine_yadage.tracker import (
+            AdaptiveIntervalTracker,
+            REANATracker,
+        )
+
+        progress_tracker = REANATracker("", None)
+        set_interval = MagicMock()
+        tracker = AdaptiveIntervalTracker(
+            progress_tracker, set_interval, min_interval, max_interval
+        )
+        tracker.initialize(None)
+        set_interval.assert_called_once_with(min_interval)
+        return progress_tracker, tracker, set_interval
+
+    def test_backs_off_when_nothing_changes(self):
+        _, tracker, set_interval = self._build_tracker()
+        intervals = []
+        for _ in range(8):
+            tracker.track(None)
+            intervals.append(tracker.interval)
+        assert intervals == [1.5, 2.25, 3.375, 5.0625, 7.59375, 8, 8, 8]
+        assert set_interval.call_args.args[0] == 8
+        # the interval is only set when it changes
+        assert set_interval.call_count == 7
+
+    def test_tightens_when_workflow_progresses(self):
+        progress_tracker, tracker, set_interval = self._build_tracker()
+        tracker.interval = 8
+        progress_tracker.progress_state = _build_progress_state(3, 0, 1, 0)
+        tracker.track(None)
+        assert tracker.interval == 4
+        progress_tracker.progress_state = _build_progress_state(2, 0, 1, 1)
+        tracker.track(None)
+        assert tracker.interval == 2
+        progress_tracker.progress_state = _build_progress_state(1, 0, 1, 2)
+        tracker.track(None)
+        assert tracker.interval == 1
+        set_interval.assert_called_with(1)
+        # nothing changed since, back off again
+        tracker.track(None)
+        assert tracker.interval == 1.5
+
+    def test_tightens_when_near_completion(self):
+        progress_tracker, tracker, _ = self._build_tracker()
+        progress_tracker.progress_state = _build_progress_state(0, 0, 1, 10)
+        tracker.interval = 8
+        tracker.track(None)
+        tracker.track(None)
+        assert tracker.interval == 2
+
+    def test_fixed_interval(self):
+        _, tracker, set_interval = self._build_tracker(min_interval=15, max_interval=5)
+        for _ in range(3):
+            tracker.track(None)
+        assert tracker.interval == 15
+        set_interval.assert_called_once_with(15)
+
+    def test_refreshes_are_skipped_between_ticks(
+        self, resilient_backend, fake_job_controller
+    ):
+        from unittest.mock import patch
+
+        from reana_workflow_engine_yadage import externalbackend
+        from reana_workflow_engine_yadage.tracker import (
+            AdaptiveIntervalTracker,
+            REANATracker,
+        )
+
+        tick = 2
+        tracker = AdaptiveIntervalTracker(
+            REANATracker("", None),
+            resilient_backend.set_jobs_statuses_refresh_interval,
+            min_interval=tick,
+            max_interval=10 * tick,
+        )
+        job_id = resilient_backend._submit_job({"job_name": "long"})["job_id"]
+        proxy = externalbackend.ReanaExternalProxy(
+            jobproxy={"job_id": job_id}, spec={}, pardata=None, statedata=None
+        )
+        requests = fake_job_controller.requests
+        clock = MagicMock(return_value=0.0)
+        with patch.object(externalbackend.time, "monotonic", clock):
+            tracker.initialize(None)
+            for tick_number in range(30):
+                clock.return_value = float(tick_number * tick)
+                assert not resilient_backend.ready(proxy)
+                tracker.track(None)
+
+        # the refresh interval backs off to 20s, so 2 of the 30 ticks refresh
+        assert fake_job_controller.requests - requests == 2
+
+    def test_refresh_interval_kept_with_pushed_statuses(self, external_backend):
+        external_backend.set_jobs_statuses_refresh_interval(30)
+        assert external_backend._jobs_statuses_refresh_interval == 30
+        external_backend.job_status_consumer = MagicMock()
+        external_backend.set_jobs_statuses_refresh_interval(60)
+        assert external_backend._jobs_statuses_refresh_interval == 30
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA-Workflow-Engine-Yadage visualization tests."""
+
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from reana_workflow_engine_yadage.visualization import visualize_workflow
+
+
+@pytest.fixture
+def provdotgraph():
+    with patch("yadage.visualize.provdotgraph") as provdotgraph:
+        provdotgraph.return_value.to_string.return_value = "digraph {}"
+        yield provdotgraph
+
+
+def test_visualize_workflow(workflow, provdotgraph, tmp_path):
+    workflow.add_node("node")
+    with patch("subprocess.run") as run:
+        assert visualize_workflow(workflow, str(tmp_path), max_nodes=1)
+    assert (tmp_path / "yadage_workflow_instance.dot").read_text() == "digraph {}"
+    assert [call.args[0][1] for call in run.call_args_list] == ["-Tpng", "-Tpdf"]
+
+
+def test_visualize_workflow_too_big(workflow, provdotgraph, tmp_path):
+    workflow.add_node("first")
+    workflow.add_node("second")
+    assert not visualize_workflow(workflow, str(tmp_path), max_nodes=1)
+    provdotgraph.assert_not_called()
+    assert not list(tmp_path.iterdir())
+
+
+def test_visualize_workflow_timeout(workflow, provdotgraph, tmp_path):
+    run = MagicMock(side_effect=[None, subprocess.TimeoutExpired("dot", 1)])
+    with patch("subprocess.run", run):
+        assert not visualize_workflow(workflow, str(tmp_path), timeout=1)
+    assert run.call_args.kwargs["timeout"] <= 1
+    assert (tmp_path / "yadage_workflow_instance.png").exists()
+    assert not (tmp_path / "yadage_workflow_instance.pdf").exists()
+
+
+def test_visualize_workflow_failure(workflow, provdotgraph, tmp_path):
+    provdotgraph.side_effect = Exception("cannot build graph")
+    assert not visualize_workflow(workflow, str(tmp_path))